@@ -0,0 +1,171 @@
+"""Batch rendering with deduplication of repeated structures."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Literal
+
+from rdkit import Chem
+from rdkit.Chem import Mol
+from rdkit.rdBase import BlockLogs
+
+from chemscii.layout import compute_layouts
+from chemscii.renderers.base import BaseRenderer
+from chemscii.renderers.unicode import UnicodeRenderer
+
+DedupKey = Literal["smiles", "inchikey"]
+
+DEDUP_KEYS: tuple[DedupKey, ...] = ("smiles", "inchikey")
+
+
+def canonical_key(mol: Mol, key: DedupKey = "smiles") -> str:
+    """Get the identity of a structure, however it was written.
+
+    Args:
+        mol: An RDKit Mol object.
+        key: "smiles" for RDKit canonical SMILES, or "inchikey" for the
+            standard InChIKey, which also merges tautomers. Structures
+            without an InChIKey fall back to canonical SMILES.
+
+    Returns:
+        A string equal for every spelling of the same structure.
+
+    Raises:
+        ValueError: If the key type is not recognized.
+    """
+    if key == "smiles":
+        return str(Chem.MolToSmiles(mol))
+    if key == "inchikey":
+        with BlockLogs():
+            inchikey = str(Chem.MolToInchiKey(mol))  # type: ignore[no-untyped-call]
+        # InChI cannot encode some structures, such as those with dummy atoms,
+        # and gives an empty key for all of them
+        return inchikey or str(Chem.MolToSmiles(mol))
+    raise ValueError(
+        f"Unknown dedup key: {key!r} (expected one of {', '.join(DEDUP_KEYS)})"
+    )
+
+
+class BatchResult:
+    """Rendered text for every record of a batch, in input order."""
+
+    __slots__ = ("texts", "keys", "unique")
+
+    def __init__(
+        self, texts: list[str | None], keys: list[str | None], unique: int
+    ) -> None:
+        """Initialize a batch result.
+
+        Args:
+            texts: Rendered text of each record (None if it did not parse).
+            keys: Canonical key of each record (None if it did not parse or
+                deduplication is off).
+            unique: Number of structures laid out and rendered.
+        """
+        self.texts = texts
+        self.keys = keys
+        self.unique = unique
+
+    def __len__(self) -> int:
+        """Get the number of records."""
+        return len(self.texts)
+
+
+class BatchRenderer:
+    """Renders many molecules, drawing each distinct structure once.
+
+    Records are preprocessed and reduced to a canonical key, so the same
+    structure written with different SMILES, or as different salt forms
+    when the preprocessor strips salts, is laid out and rendered a single
+    time. The text is then fanned back out to every record.
+    """
+
+    def __init__(
+        self,
+        renderer: BaseRenderer | None = None,
+        key: DedupKey | None = "smiles",
+        workers: int | None = None,
+    ) -> None:
+        """Initialize the batch renderer.
+
+        Args:
+            renderer: Renderer used for each structure, along with its
+                depiction settings and preprocessor (None for an
+                automatically sized Unicode renderer).
+            key: Canonical key used to find repeated structures (None to
+                render every record).
+            workers: Number of processes used to compute layouts (None for
+                one per CPU, 1 to compute them in this process).
+
+        Raises:
+            ValueError: If the key type is not recognized.
+        """
+        if key is not None and key not in DEDUP_KEYS:
+            raise ValueError(
+                f"Unknown dedup key: {key!r} "
+                f"(expected one of {', '.join(DEDUP_KEYS)})"
+            )
+        self.renderer = renderer if renderer is not None else UnicodeRenderer()
+        self.key = key
+        self.workers = workers
+
+    def render_smiles(self, smiles: Iterable[str]) -> BatchResult:
+        """Render molecules given as SMILES strings.
+
+        Args:
+            smiles: SMILES string of each record.
+
+        Returns:
+            Text of each record; unparsable SMILES give None.
+        """
+        mols = []
+        with BlockLogs():
+            for value in smiles:
+                mols.append(Chem.MolFromSmiles(value) if value else None)
+        return self.render_molecules(mols)
+
+    def render_molecules(self, mols: Sequence[Mol | None]) -> BatchResult:
+        """Render molecules, laying out each distinct structure once.
+
+        Args:
+            mols: RDKit Mol object of each record (None for records that
+                could not be parsed).
+
+        Returns:
+            Text of each record, in the same order as the molecules.
+        """
+        preprocessor = self.renderer.preprocessor
+        keys: list[str | None] = []
+        slots: list[int | None] = []
+        unique_mols: list[Mol] = []
+        seen: dict[str, int] = {}
+        for mol in mols:
+            if mol is None:
+                keys.append(None)
+                slots.append(None)
+                continue
+            if preprocessor is not None:
+                mol = preprocessor.process(mol)
+            key = canonical_key(mol, self.key) if self.key is not None else None
+            slot = seen.get(key) if key is not None else None
+            if slot is None:
+                slot = len(unique_mols)
+                unique_mols.append(mol)
+                if key is not None:
+                    seen[key] = slot
+            keys.append(key)
+            slots.append(slot)
+
+        layouts = compute_layouts(
+            unique_mols,
+            self.renderer.engine,
+            self.renderer.time_budget,
+            self.renderer.templates,
+            self.workers,
+        )
+        texts = [self.renderer.render_layout(layout) for layout in layouts]
+        return BatchResult(
+            [texts[slot] if slot is not None else None for slot in slots],
+            keys,
+            len(unique_mols),
+        )
@@ -2,19 +2,45 @@
 
 from __future__ import annotations
 
-import re
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Literal
 
 import typer
+from rdkit import Chem
+from rdkit.rdBase import BlockLogs
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 
-from chemscii.parsers.chembl import chembl_to_smiles
+from chemscii.batch import BatchRenderer
+from chemscii.layout import (
+    DEPICTION_ENGINES,
+    DepictionEngine,
+    Preprocessor,
+    ScaffoldTemplates,
+)
+from chemscii.parsers.identifiers import (
+    IDENTIFIER_TYPES,
+    classify_identifier,
+    looks_like_smiles,
+)
 from chemscii.parsers.molecule import parse_sdf, parse_smiles
-from chemscii.parsers.name import name_to_smiles
+from chemscii.parsers.remote import set_offline
+from chemscii.parsers.resolver import default_resolver
+from chemscii.parsers.smiles_file import SmilesFile, default_index_path
+from chemscii.parsers.table import is_table, read_table
 from chemscii.renderers.ascii import AsciiRenderer
+from chemscii.renderers.base import BaseRenderer
+from chemscii.renderers.braille import BrailleRenderer
+from chemscii.renderers.color import COLOR_MODES, ColorMode
+from chemscii.renderers.graphics import (
+    GRAPHICS_PROTOCOLS,
+    GraphicsProtocol,
+    GraphicsRenderer,
+)
 from chemscii.renderers.magic import AsciiMagicRenderer
+from chemscii.renderers.multi import RENDER_FORMATS, MultiRenderer
 from chemscii.renderers.unicode import UnicodeRenderer
 
 app = typer.Typer(
@@ -26,15 +52,18 @@ app = typer.Typer(
 console = Console()
 error_console = Console(stderr=True)
 
-# Pattern for ChEMBL IDs
-_CHEMBL_PATTERN = re.compile(r"^CHEMBL\d+$", re.IGNORECASE)
-
-InputType = Literal["file", "chembl", "smiles", "name"]
+InputType = Literal[
+    "file", "chembl", "cid", "inchi", "inchikey", "cas", "smiles", "name"
+]
 
 
 def detect_input_type(value: str) -> tuple[InputType, str]:
     """Detect the type of molecular input.
 
+    Registry identifiers are recognized from their syntax, and strings that
+    cannot be SMILES are sent to name lookup without parsing them, so RDKit
+    only sees plausible SMILES.
+
     Args:
         value: The input string to analyze.
 
@@ -43,30 +72,86 @@ def detect_input_type(value: str) -> tuple[InputType, str]:
     """
     stripped = value.strip()
 
-    # Check if it's a file path
-    path = Path(stripped)
-    if path.exists() and path.is_file():
-        return "file", stripped
+    # Check if it's a file path; strings too long to be one, such as large
+    # SMILES, make the check raise instead of returning False
+    try:
+        if Path(stripped).is_file():
+            return "file", stripped
+    except OSError:
+        pass
 
-    # Check if it's a ChEMBL ID
-    if _CHEMBL_PATTERN.match(stripped):
-        return "chembl", stripped.upper()
+    # Check if it's a ChEMBL ID, InChI, InChIKey or CAS number
+    identifier = classify_identifier(stripped)
+    if identifier is not None:
+        return identifier
 
     # Check if it's a valid SMILES
-    mol = parse_smiles(stripped)
-    if mol is not None:
-        return "smiles", stripped
+    if looks_like_smiles(stripped):
+        with BlockLogs():
+            mol = Chem.MolFromSmiles(stripped)
+        if mol is not None:
+            return "smiles", stripped
 
     # Default to name lookup
     return "name", stripped
 
 
-def parse_input(input_type: InputType, value: str) -> str | None:
+def open_smiles_file(path: str, save_index: bool = False) -> SmilesFile:
+    """Open a SMILES file for random access.
+
+    A line-offset index saved next to the file is reused, so it only has
+    to be built once.
+
+    Args:
+        path: Path of the SMILES file.
+        save_index: Whether to save the index next to the file if it is
+            not there yet.
+
+    Returns:
+        The reader.
+    """
+    index_path = default_index_path(path)
+    if save_index or index_path.exists():
+        return SmilesFile(path, index_path)
+    return SmilesFile(path)
+
+
+def parse_range(text: str) -> tuple[int | None, int | None]:
+    """Parse a "START:STOP" record range.
+
+    Args:
+        text: Range with slice semantics; either bound may be omitted, and
+            negative bounds count from the end.
+
+    Returns:
+        A tuple of (start, stop), with None for omitted bounds.
+
+    Raises:
+        ValueError: If the range is not two integers separated by a colon.
+    """
+    start, sep, stop = text.partition(":")
+    if not sep:
+        raise ValueError(f"Record range must be START:STOP, got {text!r}")
+    return (
+        int(start) if start.strip() else None,
+        int(stop) if stop.strip() else None,
+    )
+
+
+def parse_input(
+    input_type: InputType, value: str, record: int = 0, save_index: bool = False
+) -> str | None:
     """Parse input and return SMILES string.
 
+    Identifiers and names are resolved through the default resolver chain;
+    InChI strings are converted locally.
+
     Args:
         input_type: The detected input type.
         value: The input value.
+        record: Position of the record read from SMILES files and tables;
+            negative values count from the end of SMILES files.
+        save_index: Whether to save the line-offset index of SMILES files.
 
     Returns:
         SMILES string if parsing succeeds, None otherwise.
@@ -74,37 +159,65 @@ def parse_input(input_type: InputType, value: str) -> str | None:
     if input_type == "smiles":
         return value
 
-    if input_type == "chembl":
-        return chembl_to_smiles(value)
-
-    if input_type == "name":
-        return name_to_smiles(value)
+    if input_type in ("chembl", "cid", "name", "inchi", "inchikey", "cas"):
+        resolution = default_resolver().resolve(input_type, value)
+        return resolution.smiles if resolution is not None else None
 
     if input_type == "file":
         path = Path(value)
-        content = path.read_text()
         suffix = path.suffix.lower()
 
         if suffix in (".sdf", ".mol"):
-            mol = parse_sdf(content)
+            mol = parse_sdf(path.read_text())
             if mol is not None:
-                from rdkit import Chem
-
                 return str(Chem.MolToSmiles(mol))
         elif suffix == ".smi":
-            # SMILES file - take first line
-            first_line = content.strip().split("\n")[0]
-            smiles = first_line.split()[0] if first_line else None
-            return smiles
+            smiles_file = open_smiles_file(value, save_index)
+            try:
+                return smiles_file.record(record)[0] or None
+            except IndexError:
+                return None
+            finally:
+                smiles_file.close()
+        elif is_table(path):
+            try:
+                for chunk in read_table(path, start=record, stop=record + 1):
+                    return chunk[0][1] or None
+            except (ValueError, ImportError):
+                return None
 
     return None
 
 
+def render_records(
+    records: Sequence[tuple[str | None, str]], renderer: BaseRenderer
+) -> None:
+    """Render many records, each under a header line.
+
+    Repeated structures are laid out and rendered once.
+
+    Args:
+        records: A tuple of (smiles, header) for each record, with None
+            for identifiers that could not be resolved.
+        renderer: Character renderer used for each structure.
+    """
+    batch = BatchRenderer(renderer)
+    result = batch.render_smiles(smiles or "" for smiles, _ in records)
+    for (smiles, header), text in zip(records, result.texts):
+        console.print(f"[bold]{escape(header)}[/bold]", highlight=False)
+        if smiles is None:
+            console.print("[red]Could not resolve identifier[/red]\n")
+        elif text is None:
+            console.print(f"[red]Failed to parse SMILES:[/red] {escape(smiles)}\n")
+        else:
+            print(text)
+
+
 @app.command()
 def main(
     molecule: str | None = typer.Argument(
         None,
-        help="SMILES string, molecule name, ChEMBL ID, or file path.",
+        help="SMILES string, molecule name, ChEMBL ID, or file or table path.",
     ),
     mcp_mode: bool = typer.Option(
         False,
@@ -123,12 +236,35 @@ def main(
         "-u",
         help="Use Unicode box-drawing renderer.",
     ),
+    braille_mode: bool = typer.Option(
+        False,
+        "--braille",
+        "-b",
+        help="Use braille dot renderer.",
+    ),
     magic_mode: bool = typer.Option(
         False,
         "--magic",
         "-m",
         help="Use image-to-ASCII magic renderer (default).",
     ),
+    color_mode: str = typer.Option(
+        "ansi16",
+        "--color-mode",
+        help="Element colors for the ascii renderer: ansi16, ansi256, or truecolor.",
+    ),
+    graphics: str | None = typer.Option(
+        None,
+        "--graphics",
+        "-g",
+        help="Draw an inline image with terminal graphics: kitty or sixel.",
+    ),
+    formats: str | None = typer.Option(
+        None,
+        "--formats",
+        "-f",
+        help="Comma-separated formats rendered from one layout (ascii,unicode).",
+    ),
     columns: int = typer.Option(
         80,
         "--columns",
@@ -139,22 +275,112 @@ def main(
         60,
         "--width",
         "-w",
-        help="Canvas width for ascii/unicode renderers.",
+        help="Canvas width for ascii/unicode/braille renderers.",
     ),
     height: int = typer.Option(
         30,
         "--height",
         "-H",
-        help="Canvas height for ascii/unicode renderers.",
+        help="Canvas height for ascii/unicode/braille renderers.",
+    ),
+    engine: str = typer.Option(
+        "coordgen",
+        "--engine",
+        "-e",
+        help="Depiction engine: coordgen, rdkit, or projection.",
+    ),
+    time_budget: float | None = typer.Option(
+        None,
+        "--time-budget",
+        help="Seconds allowed for depiction before falling back to rdkit.",
+    ),
+    scaffold: str | None = typer.Option(
+        None,
+        "--scaffold",
+        "-s",
+        help="Scaffold SMILES to align the depiction to.",
+    ),
+    strip_salts: bool = typer.Option(
+        True,
+        "--strip-salts/--keep-salts",
+        help="Remove counter-ions and solvent fragments before layout "
+        "(default: on).",
+    ),
+    largest_fragment: bool = typer.Option(
+        False,
+        "--largest-fragment",
+        help="Keep only the largest fragment before layout.",
+    ),
+    abbreviate: bool = typer.Option(
+        False,
+        "--abbreviate",
+        help="Collapse residues, linkers and common groups into labels.",
+    ),
+    offline: bool = typer.Option(
+        False,
+        "--offline",
+        help="Resolve names and IDs from local data only, never the network.",
+    ),
+    record: int | None = typer.Option(
+        None,
+        "--record",
+        "-r",
+        help="Render record N of a SMILES file (from 0; negative counts back).",
+    ),
+    record_range: str | None = typer.Option(
+        None,
+        "--range",
+        help="Render records START:STOP of a SMILES file.",
+    ),
+    sample: int | None = typer.Option(
+        None,
+        "--sample",
+        help="Render N records of a SMILES file chosen at random.",
+    ),
+    seed: int | None = typer.Option(
+        None,
+        "--seed",
+        help="Random seed for --sample.",
+    ),
+    save_index: bool = typer.Option(
+        False,
+        "--save-index",
+        help="Save the line-offset index of a SMILES file next to it for reuse.",
+    ),
+    smiles_column: str | None = typer.Option(
+        None,
+        "--smiles-column",
+        help="SMILES column of a table (default: a column named smiles).",
+    ),
+    id_column: str | None = typer.Option(
+        None,
+        "--id-column",
+        help="ID column of a table, shown above each structure.",
+    ),
+    identifier_column: str | None = typer.Option(
+        None,
+        "--identifier-column",
+        help="Table column of ChEMBL IDs, InChIKeys, CAS numbers or names "
+        "to resolve in bulk instead of reading SMILES.",
+    ),
+    identifier_type: str | None = typer.Option(
+        None,
+        "--identifier-type",
+        help="Type of every value in the identifier column: chembl, cid, "
+        "inchi, inchikey, cas, or name (default: detect each value).",
     ),
 ) -> None:
     """Render a chemical structure as ASCII/Unicode art.
 
     Automatically detects input type: SMILES strings, molecule names,
-    ChEMBL IDs, or structure files (.sdf, .mol, .smi).
+    ChEMBL IDs, structure files (.sdf, .mol, .smi), or tables (.csv, .tsv,
+    .parquet).
 
     Use --mcp to start an MCP server for AI assistant integration.
     """
+    if offline:
+        set_offline(True)
+
     # Handle MCP mode
     if mcp_mode:
         from chemscii.mcp import run_server
@@ -176,6 +402,99 @@ def main(
         )
         return
 
+    if engine not in DEPICTION_ENGINES:
+        error_console.print(
+            Panel(
+                f"[red]Unknown depiction engine:[/red] {engine}\n"
+                f"Use one of: {', '.join(DEPICTION_ENGINES)}.",
+                title="Error",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(1)
+    depiction_engine: DepictionEngine = engine  # type: ignore[assignment]
+
+    if color_mode not in COLOR_MODES:
+        error_console.print(
+            Panel(
+                f"[red]Unknown color mode:[/red] {color_mode}\n"
+                f"Use one of: {', '.join(COLOR_MODES)}.",
+                title="Error",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(1)
+    colors: ColorMode = color_mode  # type: ignore[assignment]
+
+    if graphics is not None and graphics not in GRAPHICS_PROTOCOLS:
+        error_console.print(
+            Panel(
+                f"[red]Unknown graphics protocol:[/red] {graphics}\n"
+                f"Use one of: {', '.join(GRAPHICS_PROTOCOLS)}.",
+                title="Error",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(1)
+
+    format_list: list[str] = []
+    if formats is not None:
+        format_list = [fmt.strip().lower() for fmt in formats.split(",") if fmt.strip()]
+        unknown = [fmt for fmt in format_list if fmt not in RENDER_FORMATS]
+        if unknown or not format_list:
+            error_console.print(
+                Panel(
+                    f"[red]Unknown render format:[/red] {formats}\n"
+                    f"Use a comma-separated list of: {', '.join(RENDER_FORMATS)}.",
+                    title="Error",
+                    border_style="red",
+                )
+            )
+            raise typer.Exit(1)
+
+    templates: ScaffoldTemplates | None = None
+    if scaffold is not None:
+        try:
+            templates = ScaffoldTemplates([scaffold])
+        except ValueError:
+            error_console.print(
+                Panel(
+                    f"[red]Failed to parse scaffold SMILES:[/red] {scaffold}",
+                    title="Error",
+                    border_style="red",
+                )
+            )
+            raise typer.Exit(1) from None
+
+    preprocessor = Preprocessor(
+        strip_salts=strip_salts,
+        largest_fragment=largest_fragment,
+        abbreviate=abbreviate,
+    )
+
+    # Determine renderer
+    renderer_count = sum(
+        [
+            ascii_mode,
+            unicode_mode,
+            braille_mode,
+            magic_mode,
+            bool(format_list),
+            graphics is not None,
+        ]
+    )
+    if renderer_count > 1:
+        error_console.print(
+            Panel(
+                "[red]Only one renderer can be selected.[/red]\n"
+                "Use --ascii, --unicode, --braille, --magic, --graphics, "
+                "or --formats (not multiple).",
+                title="Error",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(1)
+
     # Require molecule argument when not in MCP mode
     if molecule is None:
         error_console.print(
@@ -195,8 +514,178 @@ def main(
     with BlockLogs():
         input_type, normalized = detect_input_type(molecule)
 
+    suffix = Path(normalized).suffix.lower() if input_type == "file" else ""
+    table_input = input_type == "file" and is_table(normalized)
+    selections = [record is not None, record_range is not None, sample is not None]
+    if any(selections):
+        if suffix != ".smi" and not table_input:
+            error_console.print(
+                Panel(
+                    "[red]--record, --range and --sample need a SMILES file "
+                    "(.smi) or table (.csv, .tsv, .parquet).[/red]",
+                    title="Error",
+                    border_style="red",
+                )
+            )
+            raise typer.Exit(1)
+        if sum(selections) > 1:
+            error_console.print(
+                Panel(
+                    "[red]Only one of --record, --range or --sample can be "
+                    "used.[/red]",
+                    title="Error",
+                    border_style="red",
+                )
+            )
+            raise typer.Exit(1)
+        if sample is not None and table_input:
+            error_console.print(
+                Panel(
+                    "[red]Tables are streamed, so --sample needs a SMILES file "
+                    "(.smi).[/red]\n"
+                    "Use --range to render part of a table.",
+                    title="Error",
+                    border_style="red",
+                )
+            )
+            raise typer.Exit(1)
+
+    # Render many records of a SMILES file, or the rows of a table
+    if table_input or record_range is not None or sample is not None:
+        if magic_mode or graphics is not None or format_list:
+            error_console.print(
+                Panel(
+                    "[red]Tables, record ranges and samples are drawn with the "
+                    "character renderers.[/red]\n"
+                    "Use --ascii, --unicode or --braille.",
+                    title="Error",
+                    border_style="red",
+                )
+            )
+            raise typer.Exit(1)
+
+        bounds: tuple[int | None, int | None] = (None, None)
+        if record_range is not None:
+            try:
+                bounds = parse_range(record_range)
+            except ValueError:
+                error_console.print(
+                    Panel(
+                        f"[red]Invalid record range:[/red] {record_range}\n"
+                        "Use START:STOP, e.g. 100:110, :10 or -10:.",
+                        title="Error",
+                        border_style="red",
+                    )
+                )
+                raise typer.Exit(1) from None
+        elif record is not None:
+            bounds = (record, record + 1)
+
+        cell_renderer: BaseRenderer
+        if ascii_mode:
+            cell_renderer = AsciiRenderer(
+                width=width,
+                height=height,
+                engine=depiction_engine,
+                time_budget=time_budget,
+                templates=templates,
+                preprocessor=preprocessor,
+                color_mode=colors,
+            )
+        elif braille_mode:
+            cell_renderer = BrailleRenderer(
+                width=width,
+                height=height,
+                engine=depiction_engine,
+                time_budget=time_budget,
+                templates=templates,
+                preprocessor=preprocessor,
+            )
+        else:
+            cell_renderer = UnicodeRenderer(
+                width=width,
+                height=height,
+                engine=depiction_engine,
+                time_budget=time_budget,
+                templates=templates,
+                preprocessor=preprocessor,
+            )
+
+        if table_input:
+            if identifier_column is not None and smiles_column is not None:
+                error_console.print(
+                    Panel(
+                        "[red]Use either --smiles-column or "
+                        "--identifier-column.[/red]",
+                        title="Error",
+                        border_style="red",
+                    )
+                )
+                raise typer.Exit(1)
+            if identifier_type is not None and identifier_type not in (
+                *IDENTIFIER_TYPES,
+                "name",
+            ):
+                error_console.print(
+                    Panel(
+                        f"[red]Unknown identifier type:[/red] {identifier_type}\n"
+                        f"Use one of: {', '.join((*IDENTIFIER_TYPES, 'name'))}.",
+                        title="Error",
+                        border_style="red",
+                    )
+                )
+                raise typer.Exit(1)
+            start, stop = bounds
+            try:
+                # An identifier column is read in place of SMILES, and each
+                # chunk is resolved with bulk queries
+                for chunk in read_table(
+                    normalized,
+                    identifier_column or smiles_column,
+                    id_column,
+                    start or 0,
+                    stop,
+                ):
+                    values = [value for _, value, _ in chunk]
+                    structures: list[str | None] = list(values)
+                    if identifier_column is not None:
+                        structures = default_resolver().resolve_identifiers(
+                            values, identifier_type
+                        )
+                    records: list[tuple[str | None, str]] = []
+                    for (row, value, row_id), row_smiles in zip(chunk, structures):
+                        if identifier_column is not None:
+                            row_id = row_id or value
+                        records.append((row_smiles, f"[{row}] {row_id}".rstrip()))
+                    render_records(records, cell_renderer)
+            except (ValueError, ImportError) as e:
+                error_console.print(
+                    Panel(
+                        f"[red]Could not read table:[/red] {escape(str(e))}",
+                        title="Error",
+                        border_style="red",
+                    )
+                )
+                raise typer.Exit(1) from None
+            return
+
+        smiles_file = open_smiles_file(normalized, save_index)
+        try:
+            if sample is not None:
+                indices: Sequence[int] = smiles_file.sample(sample, seed)
+            else:
+                indices = range(*slice(*bounds).indices(len(smiles_file)))
+            records = []
+            for index in indices:
+                record_smiles, title = smiles_file.record(index)
+                records.append((record_smiles, f"[{index}] {title}".rstrip()))
+        finally:
+            smiles_file.close()
+        render_records(records, cell_renderer)
+        return
+
     # Parse to SMILES
-    smiles = parse_input(input_type, normalized)
+    smiles = parse_input(input_type, normalized, record or 0, save_index)
     if smiles is None:
         error_console.print(
             Panel(
@@ -206,7 +695,9 @@ def main(
                 "  • SMILES: CCO, c1ccccc1, CC(=O)O\n"
                 "  • Names: aspirin, caffeine, benzene\n"
                 "  • ChEMBL: CHEMBL25, CHEMBL113\n"
-                "  • Files: molecule.sdf, compound.mol",
+                "  • PubChem: CID2244\n"
+                "  • Registry: 50-78-2, InChI=1S/..., InChIKeys\n"
+                "  • Files: molecule.sdf, compound.mol, library.smi, table.csv",
                 title="Error",
                 border_style="red",
             )
@@ -225,29 +716,69 @@ def main(
         )
         raise typer.Exit(1)
 
-    # Determine renderer
-    renderer_count = sum([ascii_mode, unicode_mode, magic_mode])
-    if renderer_count > 1:
-        error_console.print(
-            Panel(
-                "[red]Only one renderer can be selected.[/red]\n"
-                "Use --ascii, --unicode, or --magic (not multiple).",
-                title="Error",
-                border_style="red",
-            )
-        )
-        raise typer.Exit(1)
-
     # Render molecule
-    if ascii_mode:
-        ascii_renderer = AsciiRenderer(width=width, height=height)
+    if format_list:
+        multi_renderer = MultiRenderer(
+            formats=format_list,
+            width=width,
+            height=height,
+            engine=depiction_engine,
+            time_budget=time_budget,
+            templates=templates,
+            preprocessor=preprocessor,
+            color_mode=colors,
+        )
+        multi_renderer.render_molecule(mol)
+    elif ascii_mode:
+        ascii_renderer = AsciiRenderer(
+            width=width,
+            height=height,
+            engine=depiction_engine,
+            time_budget=time_budget,
+            templates=templates,
+            preprocessor=preprocessor,
+            color_mode=colors,
+        )
         ascii_renderer.render_molecule(mol)
     elif unicode_mode:
-        unicode_renderer = UnicodeRenderer(width=width, height=height)
+        unicode_renderer = UnicodeRenderer(
+            width=width,
+            height=height,
+            engine=depiction_engine,
+            time_budget=time_budget,
+            templates=templates,
+            preprocessor=preprocessor,
+        )
         unicode_renderer.render_molecule(mol)
+    elif graphics is not None:
+        protocol: GraphicsProtocol = graphics  # type: ignore[assignment]
+        graphics_renderer = GraphicsRenderer(
+            protocol=protocol,
+            engine=depiction_engine,
+            time_budget=time_budget,
+            templates=templates,
+            preprocessor=preprocessor,
+        )
+        graphics_renderer.render_molecule(mol)
+    elif braille_mode:
+        braille_renderer = BrailleRenderer(
+            width=width,
+            height=height,
+            engine=depiction_engine,
+            time_budget=time_budget,
+            templates=templates,
+            preprocessor=preprocessor,
+        )
+        braille_renderer.render_molecule(mol)
     else:
         # Default to magic
-        magic_renderer = AsciiMagicRenderer(columns=columns)
+        magic_renderer = AsciiMagicRenderer(
+            columns=columns,
+            engine=depiction_engine,
+            time_budget=time_budget,
+            templates=templates,
+            preprocessor=preprocessor,
+        )
         magic_renderer.render_molecule(mol)
 
 
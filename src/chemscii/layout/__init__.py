@@ -2,5 +2,24 @@
 
 from chemscii.layout.atoms import AtomLayout
 from chemscii.layout.bonds import BondLayout
+from chemscii.layout.depiction import (
+    DEPICTION_ENGINES,
+    DepictionEngine,
+    compute_2d_coords,
+)
+from chemscii.layout.preprocess import Preprocessor
+from chemscii.layout.result import LayoutResult, compute_layout, compute_layouts
+from chemscii.layout.templates import ScaffoldTemplates
 
-__all__ = ["AtomLayout", "BondLayout"]
+__all__ = [
+    "AtomLayout",
+    "BondLayout",
+    "DEPICTION_ENGINES",
+    "DepictionEngine",
+    "LayoutResult",
+    "Preprocessor",
+    "ScaffoldTemplates",
+    "compute_2d_coords",
+    "compute_layout",
+    "compute_layouts",
+]
@@ -2,64 +2,100 @@
 
 from __future__ import annotations
 
-from rdkit.Chem import Kekulize, Mol, rdDepictor
+import time
+
+import numpy as np
+import numpy.typing as npt
+from rdkit import Chem
+from rdkit.Chem import Mol
+
+from chemscii.layout.depiction import DepictionEngine, compute_2d_coords
+from chemscii.layout.templates import ScaffoldTemplates
 
 
 class AtomLayout:
     """Handles 2D positioning of atoms in a molecule."""
 
-    def __init__(self, molecule: Mol) -> None:
+    def __init__(
+        self,
+        molecule: Mol,
+        engine: DepictionEngine = "coordgen",
+        time_budget: float | None = None,
+        templates: ScaffoldTemplates | None = None,
+    ) -> None:
         """Initialize atom layout for a molecule.
 
+        The molecule is depicted and kekulized on a private copy, so the
+        caller's Mol is never modified and can be shared between layouts and
+        threads.
+
         Args:
-            molecule: An RDKit Mol object with 2D coordinates.
+            molecule: An RDKit Mol object, which is left unchanged.
+            engine: Depiction engine used to generate coordinates.
+            time_budget: Seconds allowed for the depiction before falling
+                back to a faster engine (None for no limit).
+            templates: Scaffold templates to align the molecule to.
         """
-        self.molecule = molecule
-        Kekulize(self.molecule)
-        rdDepictor.SetPreferCoordGen(True)
-        rdDepictor.Compute2DCoords(self.molecule, useRingTemplates=True)
+        self.molecule = Chem.Mol(molecule)
+        start = time.perf_counter()
+        self.engine = compute_2d_coords(self.molecule, engine, time_budget, templates)
+        self.depiction_time = time.perf_counter() - start
+        # Aromatic rings are drawn with alternating single and double bonds;
+        # kekulizing the copy once lets every bond layout read them directly
+        Chem.Kekulize(self.molecule)
+        self.coords: npt.NDArray[np.float64] = np.empty((0, 2))
         self.positions: list[tuple[float, float]] = []
         self._symbols: list[str] = []
 
+    def compute_coords(self) -> npt.NDArray[np.float64]:
+        """Compute 2D coordinates for all atoms as an array.
+
+        Reads all positions from the conformer in a single call.
+
+        Returns:
+            N x 2 array of (x, y) coordinates for each atom.
+        """
+        positions = self.molecule.GetConformer().GetPositions()
+        self.coords = np.ascontiguousarray(positions[:, :2])
+        # Superatoms from abbreviation carry their label
+        self._symbols = [
+            atom.GetProp("atomLabel") if atom.HasProp("atomLabel") else atom.GetSymbol()
+            for atom in self.molecule.GetAtoms()
+        ]
+        return self.coords
+
     def compute_positions(self) -> list[tuple[float, float]]:
         """Compute 2D coordinates for all atoms.
 
         Returns:
             List of (x, y) coordinate tuples for each atom.
         """
-        conformer = self.molecule.GetConformer()
-        self.positions = []
-        self._symbols = []
-
-        for atom in self.molecule.GetAtoms():
-            idx = atom.GetIdx()
-            pos = conformer.GetAtomPosition(idx)
-            self.positions.append((pos.x, pos.y))
-            self._symbols.append(atom.GetSymbol())
-
+        coords = self.compute_coords()
+        self.positions = [(x, y) for x, y in coords.tolist()]
         return self.positions
 
     def get_symbols(self) -> list[str]:
         """Get element symbols for all atoms.
 
-        Must be called after compute_positions().
+        Must be called after compute_positions() or compute_coords().
 
         Returns:
-            List of element symbols (e.g., ['C', 'C', 'O']).
+            List of element symbols (e.g., ['C', 'C', 'O']), with labels
+            such as 'Boc' for abbreviated superatoms.
         """
         return self._symbols
 
     def get_bounds(self) -> tuple[float, float, float, float]:
         """Get bounding box of atom positions.
 
-        Must be called after compute_positions().
+        Must be called after compute_positions() or compute_coords().
 
         Returns:
             Tuple of (min_x, min_y, max_x, max_y).
         """
-        if not self.positions:
+        if not len(self.coords):
             return (0.0, 0.0, 0.0, 0.0)
 
-        xs = [p[0] for p in self.positions]
-        ys = [p[1] for p in self.positions]
-        return (min(xs), min(ys), max(xs), max(ys))
+        min_x, min_y = self.coords.min(axis=0)
+        max_x, max_y = self.coords.max(axis=0)
+        return (float(min_x), float(min_y), float(max_x), float(max_y))
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import numpy as np
+import numpy.typing as npt
+from rdkit import Chem
 from rdkit.Chem import BondType, Mol
 
 # Map RDKit bond types to integer bond orders
@@ -17,16 +20,24 @@ class BondLayout:
     """Handles 2D positioning of bonds in a molecule."""
 
     def __init__(
-        self, molecule: Mol, atom_positions: list[tuple[float, float]]
+        self, molecule: Mol, atom_positions: list[tuple[float, float]] | None = None
     ) -> None:
         """Initialize bond layout for a molecule.
 
+        Aromatic rings are drawn with alternating single and double bonds.
+        Molecules from AtomLayout are already kekulized; others are
+        kekulized once, on a copy.
+
         Args:
-            molecule: An RDKit Mol object.
-            atom_positions: List of (x, y) coordinates for each atom.
+            molecule: An RDKit Mol object, which is left unchanged.
+            atom_positions: List of (x, y) coordinates for each atom. Only
+                needed for compute_bond_lines().
         """
+        if any(bond.GetBondType() == BondType.AROMATIC for bond in molecule.GetBonds()):
+            molecule = Chem.Mol(molecule)
+            Chem.Kekulize(molecule)
         self.molecule = molecule
-        self.atom_positions = atom_positions
+        self.atom_positions = atom_positions if atom_positions is not None else []
         self._bond_lines: list[tuple[tuple[float, float], tuple[float, float], int]] = (
             []
         )
@@ -41,7 +52,8 @@ class BondLayout:
         """
         self._bond_lines = []
 
-        for bond in self.molecule.GetBonds():
+        orders = self._bond_orders()
+        for bond, bond_order in zip(self.molecule.GetBonds(), orders):
             begin_idx = bond.GetBeginAtomIdx()
             end_idx = bond.GetEndAtomIdx()
 
@@ -53,13 +65,33 @@ class BondLayout:
             start_pos = self.atom_positions[begin_idx]
             end_pos = self.atom_positions[end_idx]
 
-            bond_type = bond.GetBondType()
-            bond_order = _BOND_ORDER_MAP.get(bond_type, 1)
-
             self._bond_lines.append((start_pos, end_pos, bond_order))
 
         return self._bond_lines
 
+    def compute_bond_array(self) -> npt.NDArray[np.int32]:
+        """Compute atom indices and orders for all bonds.
+
+        Returns:
+            M x 3 array of (begin_atom_idx, end_atom_idx, bond_order) rows.
+        """
+        rows = [
+            (bond.GetBeginAtomIdx(), bond.GetEndAtomIdx(), order)
+            for bond, order in zip(self.molecule.GetBonds(), self._bond_orders())
+        ]
+        return np.array(rows, dtype=np.int32).reshape(-1, 3)
+
+    def _bond_orders(self) -> list[int]:
+        """Get the drawn order of each bond.
+
+        Returns:
+            Bond order for each bond, in bond index order.
+        """
+        return [
+            _BOND_ORDER_MAP.get(bond.GetBondType(), 1)
+            for bond in self.molecule.GetBonds()
+        ]
+
     def get_aromatic_bonds(self) -> list[tuple[int, int]]:
         """Get indices of aromatic bonds.
 
@@ -0,0 +1,215 @@
+"""Depiction engines for 2D coordinate generation."""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING, Literal
+
+from rdkit import Chem
+from rdkit.Chem import Mol, rdCoordGen, rdDepictor
+from rdkit.Geometry import Point3D
+
+if TYPE_CHECKING:
+    from chemscii.layout.templates import ScaffoldTemplates
+
+DepictionEngine = Literal["coordgen", "rdkit", "projection"]
+
+DEPICTION_ENGINES: tuple[DepictionEngine, ...] = ("coordgen", "rdkit", "projection")
+
+# Faster engine to use when an engine exceeds its time budget
+_FALLBACK_ENGINE: dict[DepictionEngine, DepictionEngine] = {
+    "coordgen": "rdkit",
+}
+
+# Molecules at or below these limits depict in milliseconds with CoordGen,
+# so they skip the worker process even when a time budget is set
+_INLINE_MAX_ATOMS = 40
+_INLINE_MAX_RING_SIZE = 8
+
+
+def compute_2d_coords(
+    mol: Mol,
+    engine: DepictionEngine = "coordgen",
+    time_budget: float | None = None,
+    templates: ScaffoldTemplates | None = None,
+) -> str:
+    """Generate 2D coordinates for a molecule in place.
+
+    If the selected engine does not finish within the time budget, the
+    depiction is abandoned and the next faster engine is used instead.
+
+    Args:
+        mol: An RDKit Mol object.
+        engine: Depiction engine to try first.
+        time_budget: Maximum seconds to spend in a slow engine (None for no
+            limit).
+        templates: Scaffold templates to align the molecule to; used in
+            place of the engine when one matches.
+
+    Returns:
+        The name of the engine that produced the coordinates, or
+        "template" if a scaffold template was used.
+
+    Raises:
+        ValueError: If the engine name is not recognized.
+    """
+    if engine not in DEPICTION_ENGINES:
+        raise ValueError(
+            f"Unknown depiction engine: {engine!r} "
+            f"(expected one of {', '.join(DEPICTION_ENGINES)})"
+        )
+
+    if templates is not None and templates.align(mol):
+        return "template"
+
+    if engine == "projection":
+        if mol.GetNumConformers() > 0:
+            _project_to_plane(mol)
+            return "projection"
+        # Nothing to project, so depict from scratch
+        engine = "rdkit"
+
+    if engine == "coordgen":
+        if time_budget is None or _is_inline(mol):
+            # Called directly rather than through the process-wide
+            # SetPreferCoordGen switch, which other threads would also see
+            rdCoordGen.AddCoords(mol)
+            return "coordgen"
+        positions = _WORKER.depict(mol, time_budget)
+        if positions is not None:
+            _set_positions(mol, positions)
+            return "coordgen"
+        engine = _FALLBACK_ENGINE["coordgen"]
+
+    rdDepictor.Compute2DCoords(mol, useRingTemplates=True, forceRDKit=True)
+    return engine
+
+
+def _is_inline(mol: Mol) -> bool:
+    """Check whether a molecule is small enough to depict without a budget.
+
+    Args:
+        mol: An RDKit Mol object.
+
+    Returns:
+        True if the molecule has few atoms and no macrocycles.
+    """
+    if mol.GetNumAtoms() > _INLINE_MAX_ATOMS:
+        return False
+    rings = mol.GetRingInfo().AtomRings()
+    return all(len(ring) <= _INLINE_MAX_RING_SIZE for ring in rings)
+
+
+def _project_to_plane(mol: Mol) -> None:
+    """Flatten the first conformer of a molecule onto the xy plane.
+
+    Args:
+        mol: An RDKit Mol object with at least one conformer.
+    """
+    conformer = mol.GetConformer()
+    if not conformer.Is3D():
+        return
+    positions = [(p[0], p[1]) for p in conformer.GetPositions()]
+    _set_positions(mol, positions)
+
+
+def _set_positions(mol: Mol, positions: list[tuple[float, float]]) -> None:
+    """Replace the conformers of a molecule with a single 2D conformer.
+
+    Args:
+        mol: An RDKit Mol object.
+        positions: List of (x, y) coordinates for each atom.
+    """
+    conformer = Chem.Conformer(mol.GetNumAtoms())
+    for idx, (x, y) in enumerate(positions):
+        conformer.SetAtomPosition(idx, Point3D(x, y, 0.0))
+    conformer.Set3D(False)
+    mol.RemoveAllConformers()
+    mol.AddConformer(conformer, assignId=True)
+
+
+def _worker_main(conn: Connection) -> None:
+    """Serve CoordGen depiction requests from a parent process.
+
+    Args:
+        conn: Pipe end used to receive molecules and send back coordinates.
+    """
+    conn.send(None)
+    while True:
+        try:
+            payload = conn.recv()
+        except EOFError:
+            return
+        mol = Chem.Mol(payload)
+        rdCoordGen.AddCoords(mol)
+        conn.send([(p[0], p[1]) for p in mol.GetConformer().GetPositions()])
+
+
+class _DepictionWorker:
+    """Child process that runs CoordGen so slow depictions can be abandoned.
+
+    CoordGen holds the GIL and cannot be interrupted, so a depiction that
+    overruns its budget is stopped by terminating the worker, which is then
+    restarted on the next request.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the worker without starting a process."""
+        self._lock = threading.Lock()
+        self._process: BaseProcess | None = None
+        self._conn: Connection | None = None
+
+    def depict(self, mol: Mol, time_budget: float) -> list[tuple[float, float]] | None:
+        """Depict a molecule with CoordGen within a time budget.
+
+        Args:
+            mol: An RDKit Mol object.
+            time_budget: Maximum seconds to wait for the depiction.
+
+        Returns:
+            List of (x, y) coordinates, or None if the budget was exceeded.
+        """
+        with self._lock:
+            conn = self._ensure_started()
+            conn.send(mol.ToBinary())
+            if conn.poll(time_budget):
+                positions: list[tuple[float, float]] = conn.recv()
+                return positions
+            self._stop()
+            return None
+
+    def _ensure_started(self) -> Connection:
+        """Start the worker process if it is not running.
+
+        Returns:
+            The parent end of the pipe to the worker.
+        """
+        if self._process is not None and self._process.is_alive():
+            assert self._conn is not None
+            return self._conn
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        # Wait for the worker to finish importing RDKit before timing starts
+        parent_conn.recv()
+        self._process = process
+        self._conn = parent_conn
+        return parent_conn
+
+    def _stop(self) -> None:
+        """Terminate the worker process."""
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+
+_WORKER = _DepictionWorker()
@@ -0,0 +1,116 @@
+"""Molecule slimming ahead of 2D layout."""
+
+from __future__ import annotations
+
+from rdkit import Chem
+from rdkit.Chem import Mol, rdAbbreviations
+from rdkit.Chem.MolStandardize import rdMolStandardize
+from rdkit.Chem.SaltRemover import SaltRemover
+
+# Protecting groups common in synthesis intermediates, in "label SMARTS" form
+_GROUP_DEFINITIONS = """\
+Fmoc *C(=O)OCC1c2ccccc2-c2ccccc21
+Boc *C(=O)OC(C)(C)C
+Ts *S(=O)(=O)c1ccc(C)cc1
+TBS *[Si](C)(C)C(C)(C)C
+Bn *[C&D2]c1ccccc1
+"""
+
+# Backbone amino acid residues, matched as linkers between two attachments
+_RESIDUE_DEFINITIONS = """\
+Trp *[N&D2][C&D3]([C&D2]c1c[nH]c2ccccc12)C(=O)*
+Tyr *[N&D2][C&D3]([C&D2]c1ccc([O&D1])cc1)C(=O)*
+Phe *[N&D2][C&D3]([C&D2]c1ccccc1)C(=O)*
+His *[N&D2][C&D3]([C&D2]c1c[nH]cn1)C(=O)*
+Arg *[N&D2][C&D3]([C&D2][C&D2][C&D2][N&D2]C(=[N&D1])[N&D1])C(=O)*
+Lys *[N&D2][C&D3]([C&D2][C&D2][C&D2][C&D2][N&D1])C(=O)*
+Gln *[N&D2][C&D3]([C&D2][C&D2]C(=O)[N&D1])C(=O)*
+Glu *[N&D2][C&D3]([C&D2][C&D2]C(=O)[O&D1])C(=O)*
+Met *[N&D2][C&D3]([C&D2][C&D2][S&D2][C&D1])C(=O)*
+Asn *[N&D2][C&D3]([C&D2]C(=O)[N&D1])C(=O)*
+Asp *[N&D2][C&D3]([C&D2]C(=O)[O&D1])C(=O)*
+Leu *[N&D2][C&D3]([C&D2][C&D3]([C&D1])[C&D1])C(=O)*
+Ile *[N&D2][C&D3]([C&D3]([C&D1])[C&D2][C&D1])C(=O)*
+Val *[N&D2][C&D3]([C&D3]([C&D1])[C&D1])C(=O)*
+Thr *[N&D2][C&D3]([C&D3]([O&D1])[C&D1])C(=O)*
+Cys *[N&D2][C&D3]([C&D2][S&D1])C(=O)*
+Ser *[N&D2][C&D3]([C&D2][O&D1])C(=O)*
+Ala *[N&D2][C&D3]([C&D1])C(=O)*
+Gly *[N&D2][C&D2]C(=O)*
+"""
+
+# Linkers are condensed before groups so residue side chains stay intact
+_LINKERS = list(rdAbbreviations.ParseLinkers(_RESIDUE_DEFINITIONS)) + list(
+    rdAbbreviations.GetDefaultLinkers()
+)
+_GROUPS = list(
+    rdAbbreviations.ParseAbbreviations(
+        _GROUP_DEFINITIONS, allowConnectionToDummies=True
+    )
+) + list(rdAbbreviations.GetDefaultAbbreviations())
+
+
+class Preprocessor:
+    """Removes atoms that add layout work without changing the depiction.
+
+    Explicit hydrogens, counter-ions and solvent fragments all inflate the
+    atom count that depiction time and canvas size scale with. Large
+    molecules can also have residues and groups collapsed into labeled
+    superatoms, whose labels are reported by AtomLayout.get_symbols().
+    """
+
+    def __init__(
+        self,
+        remove_hs: bool = True,
+        strip_salts: bool = True,
+        largest_fragment: bool = False,
+        abbreviate: bool = False,
+        max_coverage: float = 0.5,
+    ) -> None:
+        """Initialize the preprocessor.
+
+        Args:
+            remove_hs: Whether to remove explicit hydrogen atoms.
+            strip_salts: Whether to remove common salt and solvent fragments.
+            largest_fragment: Whether to keep only the largest fragment.
+            abbreviate: Whether to collapse residues, linkers and common
+                groups into labeled superatoms.
+            max_coverage: Largest fraction of the molecule a single
+                abbreviation may replace.
+        """
+        self.remove_hs = remove_hs
+        self.strip_salts = strip_salts
+        self.largest_fragment = largest_fragment
+        self.abbreviate = abbreviate
+        self.max_coverage = max_coverage
+        self._salt_remover = (
+            SaltRemover() if strip_salts else None  # type: ignore[no-untyped-call]
+        )
+        self._fragment_chooser = (
+            rdMolStandardize.LargestFragmentChooser() if largest_fragment else None
+        )
+
+    def process(self, mol: Mol) -> Mol:
+        """Slim a molecule for layout.
+
+        Args:
+            mol: An RDKit Mol object, which is left unchanged.
+
+        Returns:
+            A new Mol object with the configured atoms removed.
+        """
+        result = Chem.RemoveHs(mol) if self.remove_hs else Chem.Mol(mol)
+        if self._salt_remover is not None:
+            result = self._salt_remover.StripMol(  # type: ignore[no-untyped-call]
+                result, dontRemoveEverything=True
+            )
+        if self._fragment_chooser is not None:
+            result = self._fragment_chooser.choose(result)
+        if self.abbreviate:
+            result = rdAbbreviations.CondenseMolAbbreviations(
+                result, _LINKERS, maxCoverage=self.max_coverage
+            )
+            result = rdAbbreviations.CondenseMolAbbreviations(
+                result, _GROUPS, maxCoverage=self.max_coverage
+            )
+        return result
@@ -0,0 +1,161 @@
+"""Compact array-based layout results."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cache, partial
+
+import numpy as np
+import numpy.typing as npt
+from rdkit.Chem import Mol
+
+from chemscii.layout.atoms import AtomLayout
+from chemscii.layout.bonds import BondLayout
+from chemscii.layout.depiction import DepictionEngine
+from chemscii.layout.templates import ScaffoldTemplates
+
+# Fewest molecules laid out in worker processes; smaller batches take less
+# time in this process than sending them to the workers
+_MIN_PROCESS_BATCH = 16
+
+
+class LayoutResult:
+    """2D layout of a molecule stored as flat arrays.
+
+    Holds everything the renderers need without a reference to the RDKit
+    molecule, so results are cheap to cache and pickle.
+    """
+
+    __slots__ = ("coords", "bonds", "symbols", "engine")
+
+    def __init__(
+        self,
+        coords: npt.NDArray[np.float64],
+        bonds: npt.NDArray[np.int32],
+        symbols: Sequence[str],
+        engine: str = "",
+    ) -> None:
+        """Initialize a layout result.
+
+        Args:
+            coords: N x 2 array of (x, y) atom coordinates.
+            bonds: M x 3 array of (begin_atom_idx, end_atom_idx, bond_order).
+            symbols: Element symbol or superatom label for each atom.
+            engine: Name of the engine that produced the coordinates.
+        """
+        self.coords = coords
+        self.bonds = bonds
+        self.symbols = tuple(symbols)
+        self.engine = engine
+
+    def __len__(self) -> int:
+        """Get the number of atoms.
+
+        Returns:
+            Number of atoms in the layout.
+        """
+        return len(self.coords)
+
+    def segments(self) -> npt.NDArray[np.float64]:
+        """Get bond line segments.
+
+        Returns:
+            M x 4 array of (x1, y1, x2, y2) coordinates for each bond.
+        """
+        return np.hstack((self.coords[self.bonds[:, 0]], self.coords[self.bonds[:, 1]]))
+
+    def get_bounds(self) -> tuple[float, float, float, float]:
+        """Get bounding box of atom positions.
+
+        Returns:
+            Tuple of (min_x, min_y, max_x, max_y).
+        """
+        if not len(self.coords):
+            return (0.0, 0.0, 0.0, 0.0)
+        min_x, min_y = self.coords.min(axis=0)
+        max_x, max_y = self.coords.max(axis=0)
+        return (float(min_x), float(min_y), float(max_x), float(max_y))
+
+
+def compute_layout(
+    mol: Mol,
+    engine: DepictionEngine = "coordgen",
+    time_budget: float | None = None,
+    templates: ScaffoldTemplates | None = None,
+) -> LayoutResult:
+    """Compute the 2D layout of a molecule.
+
+    Args:
+        mol: An RDKit Mol object, which is left unchanged.
+        engine: Depiction engine used to generate coordinates.
+        time_budget: Seconds allowed for the depiction before falling back
+            to a faster engine (None for no limit).
+        templates: Scaffold templates to align the molecule to.
+
+    Returns:
+        The layout as a LayoutResult.
+    """
+    atom_layout = AtomLayout(mol, engine, time_budget, templates)
+    coords = atom_layout.compute_coords()
+    bonds = BondLayout(atom_layout.molecule).compute_bond_array()
+    return LayoutResult(coords, bonds, atom_layout.get_symbols(), atom_layout.engine)
+
+
+@cache
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """Get a shared process pool for layout computation.
+
+    Args:
+        workers: Number of processes in the pool.
+
+    Workers are spawned rather than forked, so they do not inherit the
+    CoordGen worker process or the resolver threads of this process.
+
+    Returns:
+        The process pool, created on first use and kept for later batches.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def compute_layouts(
+    mols: Sequence[Mol],
+    engine: DepictionEngine = "coordgen",
+    time_budget: float | None = None,
+    templates: ScaffoldTemplates | None = None,
+    workers: int | None = None,
+) -> list[LayoutResult]:
+    """Compute the 2D layouts of many molecules in worker processes.
+
+    Args:
+        mols: RDKit Mol objects, which are left unchanged.
+        engine: Depiction engine used to generate coordinates.
+        time_budget: Seconds allowed for each depiction before falling back
+            to a faster engine (None for no limit).
+        templates: Scaffold templates to align the molecules to.
+        workers: Number of processes used (None for one per CPU, 1 to
+            compute the layouts in this process). Small batches are always
+            computed in this process, and the worker processes are kept for
+            later batches.
+
+    Returns:
+        Layout results in the same order as the molecules.
+    """
+    task = partial(
+        compute_layout, engine=engine, time_budget=time_budget, templates=templates
+    )
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(mols) < _MIN_PROCESS_BATCH:
+        return [task(mol) for mol in mols]
+    chunksize = max(1, len(mols) // (4 * workers))
+    try:
+        return list(_process_pool(workers).map(task, mols, chunksize=chunksize))
+    except BrokenProcessPool:
+        # A dead worker breaks the pool for good, so start a new one next time
+        _process_pool.cache_clear()
+        raise
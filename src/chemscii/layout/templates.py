@@ -0,0 +1,151 @@
+"""Scaffold template depictions for aligning analog series."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from rdkit import Chem
+from rdkit.Chem import Mol, rdDepictor, rdFMCS
+
+from chemscii.layout.depiction import compute_2d_coords
+
+# Scaffolds smaller than this carry too little shape to be worth aligning to
+_MIN_SCAFFOLD_ATOMS = 3
+
+
+class ScaffoldTemplates:
+    """Cache of depicted scaffolds used to lay out analogs consistently.
+
+    Each scaffold is depicted once. Molecules containing a cached scaffold
+    are then laid out with the scaffold atoms fixed at the template
+    coordinates, which keeps a series in the same orientation and skips
+    most of the depiction work for the shared core.
+    """
+
+    def __init__(self, scaffolds: Iterable[str | Mol] = ()) -> None:
+        """Initialize the template cache.
+
+        Args:
+            scaffolds: Scaffold SMILES strings or Mol objects to depict.
+        """
+        self._templates: dict[str, tuple[Mol, Mol | None]] = {}
+        for scaffold in scaffolds:
+            self.add(scaffold)
+
+    def __len__(self) -> int:
+        """Get the number of cached templates.
+
+        Returns:
+            Number of templates.
+        """
+        return len(self._templates)
+
+    @classmethod
+    def from_series(cls, mols: Sequence[Mol], timeout: int = 10) -> ScaffoldTemplates:
+        """Create a template cache from the common scaffold of a series.
+
+        Args:
+            mols: Molecules sharing a common core.
+            timeout: Maximum seconds to spend searching for the scaffold.
+
+        Returns:
+            A template cache, empty if no common scaffold was found.
+        """
+        templates = cls()
+        templates.add_series(mols, timeout=timeout)
+        return templates
+
+    def add(self, scaffold: str | Mol) -> None:
+        """Depict a scaffold and add it to the cache.
+
+        Args:
+            scaffold: Scaffold SMILES string or Mol object.
+
+        Raises:
+            ValueError: If the scaffold SMILES cannot be parsed.
+        """
+        if isinstance(scaffold, str):
+            mol = Chem.MolFromSmiles(scaffold)
+            if mol is None:
+                raise ValueError(f"Invalid scaffold SMILES: {scaffold}")
+        else:
+            mol = scaffold
+
+        key = Chem.MolToSmiles(mol)
+        if key in self._templates:
+            return
+
+        reference = Chem.Mol(mol)
+        compute_2d_coords(reference)
+        self._store(key, reference, None)
+
+    def add_series(self, mols: Sequence[Mol], timeout: int = 10) -> bool:
+        """Detect the maximum common scaffold of a series and cache it.
+
+        The first molecule is depicted as the reference for the scaffold.
+
+        Args:
+            mols: Molecules sharing a common core.
+            timeout: Maximum seconds to spend searching for the scaffold.
+
+        Returns:
+            True if a scaffold was found and cached.
+        """
+        if len(mols) < 2:
+            return False
+
+        result = rdFMCS.FindMCS(
+            list(mols),
+            timeout=timeout,
+            ringMatchesRingOnly=True,
+            completeRingsOnly=True,
+        )
+        if result.numAtoms < _MIN_SCAFFOLD_ATOMS or result.queryMol is None:
+            return False
+
+        key = result.smartsString
+        if key not in self._templates:
+            reference = Chem.Mol(mols[0])
+            compute_2d_coords(reference)
+            self._store(key, reference, result.queryMol)
+        return True
+
+    def align(self, mol: Mol) -> bool:
+        """Generate 2D coordinates for a molecule from a matching template.
+
+        Templates are tried from the largest scaffold to the smallest.
+
+        Args:
+            mol: An RDKit Mol object, modified in place on success.
+
+        Returns:
+            True if a template matched and coordinates were generated.
+        """
+        for reference, pattern in self._templates.values():
+            query = pattern if pattern is not None else reference
+            if not mol.HasSubstructMatch(query):
+                continue
+            rdDepictor.GenerateDepictionMatching2DStructure(
+                mol, reference, refPatt=pattern, forceRDKit=True
+            )
+            return True
+        return False
+
+    def _store(self, key: str, reference: Mol, pattern: Mol | None) -> None:
+        """Add a template, keeping the cache ordered by scaffold size.
+
+        Args:
+            key: Unique key for the scaffold.
+            reference: Depicted molecule containing the scaffold.
+            pattern: Substructure of the reference to align on, or None to
+                use the whole reference.
+        """
+
+        def scaffold_size(item: tuple[str, tuple[Mol, Mol | None]]) -> int:
+            ref, patt = item[1]
+            return int((ref if patt is None else patt).GetNumAtoms())
+
+        self._templates[key] = (reference, pattern)
+        self._templates = dict(
+            sorted(self._templates.items(), key=scaffold_size, reverse=True)
+        )
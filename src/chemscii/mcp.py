@@ -3,19 +3,31 @@
 from __future__ import annotations
 
 import io
+import math
 import sys
 from typing import Literal
 
+from ascii_magic import AsciiArt
 from mcp.server.fastmcp import FastMCP
+from PIL import Image
 
 from chemscii.cli import detect_input_type, parse_input
+from chemscii.layout import DepictionEngine, compute_layout
 from chemscii.parsers.molecule import parse_smiles
 from chemscii.renderers.ascii import AsciiRenderer
+from chemscii.renderers.compact import render_compact, strip_ansi, trim_margins
+from chemscii.renderers.drawing import draw_molecule_png
 from chemscii.renderers.magic import AsciiMagicRenderer
 from chemscii.renderers.unicode import UnicodeRenderer
 
 RendererType = Literal["ascii", "unicode", "magic"]
 
+# Default character budget of compact output
+_COMPACT_MAX_CHARS = 1200
+
+# Narrowest magic renderer output that still shows a structure
+_MIN_MAGIC_COLUMNS = 24
+
 mcp = FastMCP("chemscii")
 
 
@@ -48,12 +60,61 @@ def _resolve_smiles(molecule: str) -> str | None:
     return parse_input(input_type, normalized)
 
 
+def _render_compact(
+    smiles: str,
+    renderer: RendererType,
+    columns: int,
+    max_chars: int,
+    engine: DepictionEngine = "coordgen",
+    time_budget: float | None = None,
+) -> str:
+    """Render a molecule as plain text sized to a character budget.
+
+    Args:
+        smiles: SMILES string to render.
+        renderer: Renderer type to use.
+        columns: Largest output width for magic renderer.
+        max_chars: Largest number of characters wanted in the drawing.
+        engine: Depiction engine used to generate coordinates.
+        time_budget: Seconds allowed for the depiction before falling back
+            to a faster engine (None for no limit).
+
+    Returns:
+        The drawing followed by its character count.
+    """
+    mol = parse_smiles(smiles)
+    if mol is None:
+        raise ValueError(f"Failed to parse SMILES: {smiles}")
+
+    if renderer == "magic":
+        png = draw_molecule_png(mol, engine=engine, time_budget=time_budget)
+        art = AsciiArt.from_pillow_image(Image.open(io.BytesIO(png)))
+        # Character count grows with the square of the width, so shrink the
+        # width by the square root of the overshoot until the art fits
+        while True:
+            txt = trim_margins(strip_ansi(art.to_ascii(columns, monochrome=True)))
+            if len(txt) <= max_chars or columns <= _MIN_MAGIC_COLUMNS:
+                break
+            columns = max(
+                _MIN_MAGIC_COLUMNS,
+                min(columns - 1, int(columns * math.sqrt(max_chars / len(txt)))),
+            )
+    else:
+        layout = compute_layout(mol, engine, time_budget)
+        renderer_type = AsciiRenderer if renderer == "ascii" else UnicodeRenderer
+        txt = render_compact(layout, renderer_type, max_chars)
+
+    return f"{txt}\n\n({len(txt)} characters)"
+
+
 def _render(
     smiles: str,
     renderer: RendererType,
     width: int,
     height: int,
     columns: int,
+    engine: DepictionEngine = "coordgen",
+    time_budget: float | None = None,
 ) -> str:
     """Render a molecule using the specified renderer.
 
@@ -63,6 +124,9 @@ def _render(
         width: Canvas width for ascii/unicode renderers.
         height: Canvas height for ascii/unicode renderers.
         columns: Output width for magic renderer.
+        engine: Depiction engine used to generate coordinates.
+        time_budget: Seconds allowed for the depiction before falling back
+            to a faster engine (None for no limit).
 
     Returns:
         ASCII/Unicode art representation of the molecule.
@@ -78,11 +142,17 @@ def _render(
     try:
         r: AsciiRenderer | UnicodeRenderer | AsciiMagicRenderer
         if renderer == "ascii":
-            r = AsciiRenderer(width=width, height=height)
+            r = AsciiRenderer(
+                width=width, height=height, engine=engine, time_budget=time_budget
+            )
         elif renderer == "unicode":
-            r = UnicodeRenderer(width=width, height=height)
+            r = UnicodeRenderer(
+                width=width, height=height, engine=engine, time_budget=time_budget
+            )
         else:
-            r = AsciiMagicRenderer(columns=columns, codes=True)
+            r = AsciiMagicRenderer(
+                columns=columns, codes=True, engine=engine, time_budget=time_budget
+            )
         result: str = r.render_molecule(mol)
         # result: str = repr(sys.stdout.getvalue())
 
@@ -92,13 +162,17 @@ def _render(
         sys.stdout = old_stdout
 
 
-@mcp.tool()  # type: ignore[misc]
+@mcp.tool()
 def render_molecule(
     molecule: str,
     renderer: RendererType = "magic",
     width: int = 60,
     height: int = 30,
     columns: int = 80,
+    engine: DepictionEngine = "coordgen",
+    time_budget: float | None = None,
+    compact: bool = False,
+    max_chars: int = _COMPACT_MAX_CHARS,
 ) -> str:
     """Render a chemical structure as ASCII/Unicode art.
 
@@ -108,6 +182,15 @@ def render_molecule(
         width: Canvas width for ascii/unicode renderers.
         height: Canvas height for ascii/unicode renderers.
         columns: Output width for magic renderer.
+        engine: Depiction engine: "coordgen" (default), "rdkit", or
+            "projection".
+        time_budget: Seconds allowed for depiction before falling back to
+            the faster rdkit engine.
+        compact: Return plain text with no escape codes or blank margins,
+            drawn at the smallest legible size, followed by its character
+            count. Width and height are chosen automatically.
+        max_chars: Character budget of compact output; drawings over it
+            are shrunk further.
 
     Returns:
         ASCII/Unicode art representation of the molecule.
@@ -117,7 +200,11 @@ def render_molecule(
         return f"Error: Could not parse molecule input: {molecule}"
 
     try:
-        return _render(smiles, renderer, width, height, columns)
+        if compact:
+            return _render_compact(
+                smiles, renderer, columns, max_chars, engine, time_budget
+            )
+        return _render(smiles, renderer, width, height, columns, engine, time_budget)
     except Exception as e:
         return f"Error rendering molecule: {e}"
 
@@ -1,7 +1,23 @@
 """Parsers for chemical structure input formats."""
 
 from chemscii.parsers.chembl import chembl_to_smiles
+from chemscii.parsers.chembl_db import ChemblDatabase
 from chemscii.parsers.molecule import parse_sdf, parse_smiles
 from chemscii.parsers.name import name_to_smiles
+from chemscii.parsers.name_index import NameIndex, build_name_index
+from chemscii.parsers.pubchem import cids_to_smiles
+from chemscii.parsers.smiles_file import SmilesFile
+from chemscii.parsers.table import read_table
 
-__all__ = ["parse_smiles", "parse_sdf", "name_to_smiles", "chembl_to_smiles"]
+__all__ = [
+    "parse_smiles",
+    "parse_sdf",
+    "name_to_smiles",
+    "chembl_to_smiles",
+    "cids_to_smiles",
+    "ChemblDatabase",
+    "NameIndex",
+    "build_name_index",
+    "SmilesFile",
+    "read_table",
+]
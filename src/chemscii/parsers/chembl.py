@@ -4,10 +4,20 @@ from __future__ import annotations
 
 import json
 import re
-from urllib import error, request
+from collections.abc import Sequence
+from urllib import parse
+
+from chemscii.parsers.chembl_db import default_chembl_database
+from chemscii.parsers.remote import fetch
+
+# Base URL of the ChEMBL web services
+CHEMBL_URL = "https://www.ebi.ac.uk/chembl/api/data"
+
+# InChIKeys sent per batched ChEMBL query, keeping the URL short
+INCHIKEY_BATCH = 50
 
 # Common ChEMBL IDs for quick local lookup (useful for testing)
-_COMMON_CHEMBL: dict[str, str] = {
+COMMON_CHEMBL: dict[str, str] = {
     "CHEMBL25": "CC(=O)Oc1ccccc1C(=O)O",  # Aspirin
     "CHEMBL113": "CN1C=NC2=C1C(=O)N(C(=O)N2C)C",  # Caffeine
     "CHEMBL521": "CCO",  # Ethanol
@@ -23,8 +33,9 @@ _CHEMBL_PATTERN = re.compile(r"^CHEMBL\d+$", re.IGNORECASE)
 def chembl_to_smiles(chembl_id: str, use_api: bool = True) -> str | None:
     """Fetch SMILES string for a ChEMBL compound ID.
 
-    First checks a local cache of common compounds, then optionally
-    queries the ChEMBL API for unknown IDs.
+    First checks a local cache of common compounds, then the local ChEMBL
+    database named by the CHEMSCII_CHEMBL_DB environment variable (if set),
+    then optionally queries the ChEMBL API for unknown IDs.
 
     Args:
         chembl_id: A ChEMBL compound identifier (e.g., 'CHEMBL25').
@@ -43,17 +54,24 @@ def chembl_to_smiles(chembl_id: str, use_api: bool = True) -> str | None:
         return None
 
     # Check local cache first
-    if normalized in _COMMON_CHEMBL:
-        return _COMMON_CHEMBL[normalized]
+    if normalized in COMMON_CHEMBL:
+        return COMMON_CHEMBL[normalized]
+
+    # Check the local database
+    database = default_chembl_database()
+    if database is not None:
+        smiles = database.lookup(normalized)
+        if smiles is not None:
+            return smiles
 
     # Query ChEMBL API if enabled
     if use_api:
-        return _query_chembl(normalized)
+        return query_chembl(normalized)
 
     return None
 
 
-def _query_chembl(chembl_id: str) -> str | None:
+def query_chembl(chembl_id: str) -> str | None:
     """Query ChEMBL API for a compound's SMILES.
 
     Args:
@@ -62,17 +80,61 @@ def _query_chembl(chembl_id: str) -> str | None:
     Returns:
         The canonical SMILES if found, None otherwise.
     """
-    url = f"https://www.ebi.ac.uk/chembl/api/data/molecule/{chembl_id}.json"
+    url = f"{CHEMBL_URL}/molecule/{chembl_id}.json"
 
+    body = fetch(url, headers={"Accept": "application/json"})
+    if body is None:
+        return None
     try:
-        req = request.Request(url, headers={"Accept": "application/json"})
-        with request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            structures = data.get("molecule_structures")
-            if structures and isinstance(structures, dict):
-                smiles = structures.get("canonical_smiles")
-                if isinstance(smiles, str):
-                    return smiles
-            return None
-    except (error.URLError, error.HTTPError, TimeoutError, json.JSONDecodeError):
+        data = json.loads(body.decode("utf-8"))
+    except json.JSONDecodeError:
         return None
+    structures = data.get("molecule_structures")
+    if structures and isinstance(structures, dict):
+        smiles = structures.get("canonical_smiles")
+        if isinstance(smiles, str):
+            return smiles
+    return None
+
+
+def query_chembl_inchikeys(inchikeys: Sequence[str]) -> dict[str, str]:
+    """Query ChEMBL API for the SMILES of many InChIKeys.
+
+    Keys are sent in batches of up to 50 per request with an "__in"
+    filter, so a list of keys costs a few round trips.
+
+    Args:
+        inchikeys: Standard InChIKeys to look up (must be uppercase).
+
+    Returns:
+        Mapping of each InChIKey found to its canonical SMILES.
+    """
+    found: dict[str, str] = {}
+    for start in range(0, len(inchikeys), INCHIKEY_BATCH):
+        batch = inchikeys[start : start + INCHIKEY_BATCH]
+        query = parse.urlencode(
+            {
+                "molecule_structures__standard_inchi_key__in": ",".join(batch),
+                "only": "molecule_structures",
+                "limit": len(batch),
+            }
+        )
+        body = fetch(
+            f"{CHEMBL_URL}/molecule.json?{query}",
+            headers={"Accept": "application/json"},
+        )
+        if body is None:
+            continue
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except json.JSONDecodeError:
+            continue
+        for molecule in data.get("molecules") or []:
+            structures = molecule.get("molecule_structures")
+            if not isinstance(structures, dict):
+                continue
+            key = structures.get("standard_inchi_key")
+            smiles = structures.get("canonical_smiles")
+            if isinstance(key, str) and isinstance(smiles, str):
+                found.setdefault(key, smiles)
+    return found
@@ -0,0 +1,190 @@
+"""Local ChEMBL SQLite database backend."""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from chemscii.parsers.local_data import open_configured
+
+# Environment variable naming the default ChEMBL database file
+CHEMBL_DB_ENV = "CHEMSCII_CHEMBL_DB"
+
+# IDs bound per query by bulk lookups, below SQLite's default limit of 999
+# host parameters
+_BULK_CHUNK = 500
+
+# Joins ChEMBL IDs to structures; molecule_dictionary.chembl_id is indexed
+# in the ChEMBL dump
+_SELECT_SMILES = (
+    "SELECT md.chembl_id, cs.canonical_smiles "
+    "FROM molecule_dictionary AS md "
+    "JOIN compound_structures AS cs ON cs.molregno = md.molregno "
+    "WHERE md.chembl_id IN ({})"
+)
+
+# Finds structures by InChIKey; compound_structures.standard_inchi_key is
+# indexed in the ChEMBL dump
+_SELECT_BY_INCHIKEY = (
+    "SELECT standard_inchi_key, canonical_smiles FROM compound_structures "
+    "WHERE standard_inchi_key IN ({})"
+)
+
+
+class ChemblDatabase:
+    """Looks up structures in a local copy of the ChEMBL SQLite dump.
+
+    The database is opened read-only. Connections are created as needed,
+    up to pool_size, and reused between lookups, so one instance can be
+    shared between threads.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], pool_size: int = 4) -> None:
+        """Initialize the backend.
+
+        Args:
+            path: Path of the ChEMBL SQLite file.
+            pool_size: Largest number of open connections.
+        """
+        self.path = Path(path)
+        self.pool_size = pool_size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database.
+
+        Returns:
+            The connection.
+
+        Raises:
+            sqlite3.OperationalError: If the file cannot be opened.
+        """
+        uri = f"{self.path.resolve().as_uri()}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool.
+
+        Yields:
+            An open connection, returned to the pool afterwards.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._opened < self.pool_size
+                if create:
+                    self._opened += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except sqlite3.Error:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def lookup(self, chembl_id: str) -> str | None:
+        """Find the SMILES for a ChEMBL ID.
+
+        Args:
+            chembl_id: ChEMBL compound identifier (e.g., 'CHEMBL25').
+
+        Returns:
+            The canonical SMILES if the compound has a structure, None
+            otherwise.
+        """
+        return self.lookup_many([chembl_id]).get(chembl_id.strip().upper())
+
+    def lookup_many(self, chembl_ids: Iterable[str]) -> dict[str, str]:
+        """Find the SMILES for many ChEMBL IDs.
+
+        IDs are queried in chunks of up to 500 per statement.
+
+        Args:
+            chembl_ids: ChEMBL compound identifiers.
+
+        Returns:
+            Mapping of uppercase ChEMBL ID to canonical SMILES, for the IDs
+            found.
+        """
+        return self._select(_SELECT_SMILES, chembl_ids)
+
+    def lookup_inchikeys(self, inchikeys: Iterable[str]) -> dict[str, str]:
+        """Find the SMILES for many standard InChIKeys.
+
+        Keys are queried in chunks of up to 500 per statement.
+
+        Args:
+            inchikeys: Standard InChIKeys.
+
+        Returns:
+            Mapping of uppercase InChIKey to canonical SMILES, for the keys
+            found.
+        """
+        return self._select(_SELECT_BY_INCHIKEY, inchikeys)
+
+    def _select(self, sql: str, keys: Iterable[str]) -> dict[str, str]:
+        """Run a bulk key-to-SMILES query in chunks.
+
+        Args:
+            sql: Query selecting (key, SMILES) rows, with "{}" where the
+                placeholders of its IN clause go.
+            keys: Keys to look up, normalized to uppercase.
+
+        Returns:
+            Mapping of key to SMILES, for the keys found. Keys are missed
+            if the database cannot be read.
+        """
+        unique = list(dict.fromkeys(key.strip().upper() for key in keys))
+        found: dict[str, str] = {}
+        if not unique:
+            return found
+        try:
+            with self._connection() as conn:
+                for start in range(0, len(unique), _BULK_CHUNK):
+                    chunk = unique[start : start + _BULK_CHUNK]
+                    placeholders = ", ".join("?" * len(chunk))
+                    rows = conn.execute(sql.format(placeholders), chunk)
+                    for key, smiles in rows:
+                        if smiles:
+                            found.setdefault(key, smiles)
+        except sqlite3.Error:
+            # A database that cannot be opened or queried answers what it
+            # found so far
+            pass
+        return found
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+def default_chembl_database() -> ChemblDatabase | None:
+    """Get the database named by the CHEMSCII_CHEMBL_DB environment variable.
+
+    Returns:
+        The shared backend, or None if the variable is not set or names a
+        missing file.
+    """
+    return open_configured(CHEMBL_DB_ENV, ChemblDatabase)
@@ -0,0 +1,118 @@
+"""Lexical classification of molecule identifiers."""
+
+from __future__ import annotations
+
+import re
+from typing import Literal
+
+IdentifierType = Literal["chembl", "cid", "inchi", "inchikey", "cas"]
+
+IDENTIFIER_TYPES: tuple[IdentifierType, ...] = (
+    "chembl",
+    "cid",
+    "inchi",
+    "inchikey",
+    "cas",
+)
+
+# Pattern for valid ChEMBL IDs
+_CHEMBL_PATTERN = re.compile(r"CHEMBL\d+", re.IGNORECASE)
+
+# PubChem compound IDs with an optional "CID" prefix, which free text needs
+# to tell them from numbers
+_CID_PATTERN = re.compile(r"(CID[:\s]?)?(\d+)", re.IGNORECASE)
+
+# Standard and non-standard InChI strings
+_INCHI_PATTERN = re.compile(r"InChI=1S?/\S+")
+
+# 14-character skeleton hash, 8-character stereo hash with standard/version
+# flags, and protonation indicator
+_INCHIKEY_PATTERN = re.compile(r"[A-Z]{14}-[A-Z]{8}[SN]A-[A-Z]", re.IGNORECASE)
+
+# CAS registry numbers: 2-7 digits, 2 digits and a check digit
+_CAS_PATTERN = re.compile(r"(\d{2,7})-(\d{2})-(\d)")
+
+# One SMILES token: a bracket atom, an organic-subset atom (aliphatic or
+# aromatic), a wildcard, a bond, a branch or a ring closure
+_SMILES_TOKEN = (
+    r"(?:\[[^\[\]\s]+\]|Br?|Cl?|[NOSPFI]|[bcnops]|\*|[-=#$:/\\.~()]|%\d{2}|\d)"
+)
+
+# Strings made only of SMILES tokens
+_SMILES_PATTERN = re.compile(rf"{_SMILES_TOKEN}+")
+
+
+def _cas_checksum_ok(registry: str, pair: str, check: str) -> bool:
+    """Verify the check digit of a CAS registry number.
+
+    Args:
+        registry: Leading group of digits.
+        pair: Middle pair of digits.
+        check: Check digit.
+
+    Returns:
+        True if the check digit matches the other digits.
+    """
+    digits = (registry + pair)[::-1]
+    total = sum(i * int(d) for i, d in enumerate(digits, start=1))
+    return total % 10 == int(check)
+
+
+def parse_cid(value: str) -> int | None:
+    """Parse a PubChem compound ID.
+
+    Args:
+        value: A CID such as "2244", "CID2244" or "CID:2244".
+
+    Returns:
+        The CID as an integer, or None if the value is not a positive CID.
+    """
+    match = _CID_PATTERN.fullmatch(value.strip())
+    if match is None:
+        return None
+    cid = int(match.group(2))
+    return cid if cid > 0 else None
+
+
+def classify_identifier(value: str) -> tuple[IdentifierType, str] | None:
+    """Recognize registry identifiers by their syntax alone.
+
+    Args:
+        value: Stripped input string.
+
+    Returns:
+        A tuple of (identifier_type, normalized_value), or None if the
+        value is not a ChEMBL ID, PubChem CID, InChI, InChIKey or CAS
+        number.
+    """
+    if _CHEMBL_PATTERN.fullmatch(value):
+        return "chembl", value.upper()
+    match = _CID_PATTERN.fullmatch(value)
+    if match and match.group(1):
+        cid = parse_cid(value)
+        if cid is not None:
+            return "cid", str(cid)
+    if _INCHI_PATTERN.fullmatch(value):
+        return "inchi", value
+    if _INCHIKEY_PATTERN.fullmatch(value):
+        return "inchikey", value.upper()
+    match = _CAS_PATTERN.fullmatch(value)
+    if match and _cas_checksum_ok(*match.groups()):
+        return "cas", value
+    return None
+
+
+def looks_like_smiles(value: str) -> bool:
+    """Check whether a string could be SMILES before parsing it.
+
+    Only rules out strings that cannot be SMILES, such as anything with
+    whitespace or lowercase letters other than aromatic atoms outside
+    brackets. A string that passes may still be invalid SMILES.
+
+    Args:
+        value: Stripped input string.
+
+    Returns:
+        True if every character belongs to a SMILES token.
+    """
+    return _SMILES_PATTERN.fullmatch(value) is not None
@@ -0,0 +1,24 @@
+"""Convert InChI strings to SMILES locally."""
+
+from __future__ import annotations
+
+from rdkit import Chem
+from rdkit.rdBase import BlockLogs
+
+
+def inchi_to_smiles(inchi: str) -> str | None:
+    """Convert an InChI string to SMILES with RDKit's InChI library.
+
+    Args:
+        inchi: A standard or non-standard InChI string.
+
+    Returns:
+        The canonical SMILES, or None if the InChI cannot be parsed.
+    """
+    if not inchi or not inchi.strip():
+        return None
+    with BlockLogs():
+        mol = Chem.MolFromInchi(inchi.strip())  # type: ignore[no-untyped-call]
+    if mol is None:
+        return None
+    return str(Chem.MolToSmiles(mol))
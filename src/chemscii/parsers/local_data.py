@@ -0,0 +1,60 @@
+"""Local data files named by environment variables."""
+
+from __future__ import annotations
+
+import os
+import warnings
+from collections.abc import Callable
+from functools import cache
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def open_configured(env: str, opener: Callable[[str], T]) -> T | None:
+    """Open the local data file named by an environment variable.
+
+    Each file is opened once and shared by every later call. A variable
+    naming a missing file is ignored, with a warning the first time.
+
+    Args:
+        env: Name of the environment variable.
+        opener: Opens the file from its path, such as a backend class.
+
+    Returns:
+        The shared opened file, or None if the variable is not set or names
+        a missing file.
+    """
+    path = os.environ.get(env)
+    if not path:
+        return None
+    if not os.path.isfile(path):
+        _warn_missing(env, path)
+        return None
+    opened: T = _open(opener, path)
+    return opened
+
+
+@cache
+def _open(opener: Callable[[str], Any], path: str) -> Any:
+    """Open a file once per opener and path.
+
+    Args:
+        opener: Opens the file from its path.
+        path: Path of the file.
+
+    Returns:
+        The opened file.
+    """
+    return opener(path)
+
+
+@cache
+def _warn_missing(env: str, path: str) -> None:
+    """Warn once that a configured file does not exist.
+
+    Args:
+        env: Name of the environment variable.
+        path: Path named by the variable.
+    """
+    warnings.warn(f"{env} names a missing file, ignoring it: {path}", stacklevel=4)
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from urllib import error, parse, request
+from chemscii.parsers.name_index import default_name_index
+from chemscii.parsers.pubchem import query_pubchem
 
 # Common molecule names for quick local lookup
-_COMMON_MOLECULES: dict[str, str] = {
+COMMON_MOLECULES: dict[str, str] = {
     "water": "O",
     "methane": "C",
     "ethane": "CC",
@@ -32,8 +33,9 @@ _COMMON_MOLECULES: dict[str, str] = {
 def name_to_smiles(name: str, use_pubchem: bool = True) -> str | None:
     """Convert a molecule name to its SMILES representation.
 
-    First checks a local dictionary of common molecules, then optionally
-    queries PubChem for unknown names.
+    First checks a local dictionary of common molecules, then the offline
+    index named by the CHEMSCII_NAME_INDEX environment variable (if set),
+    then optionally queries PubChem for unknown names.
 
     Args:
         name: The common or IUPAC name of a molecule.
@@ -48,34 +50,18 @@ def name_to_smiles(name: str, use_pubchem: bool = True) -> str | None:
     normalized = name.lower().strip()
 
     # Check local dictionary first
-    if normalized in _COMMON_MOLECULES:
-        return _COMMON_MOLECULES[normalized]
+    if normalized in COMMON_MOLECULES:
+        return COMMON_MOLECULES[normalized]
+
+    # Check the offline index
+    index = default_name_index()
+    if index is not None:
+        smiles = index.lookup(normalized)
+        if smiles is not None:
+            return smiles
 
     # Query PubChem if enabled
     if use_pubchem:
-        return _query_pubchem(name)
+        return query_pubchem(name)
 
     return None
-
-
-def _query_pubchem(name: str) -> str | None:
-    """Query PubChem for a molecule's SMILES by name.
-
-    Args:
-        name: The molecule name to search for.
-
-    Returns:
-        The canonical SMILES if found, None otherwise.
-    """
-    encoded_name = parse.quote(name)
-    url = (
-        f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/"
-        f"{encoded_name}/property/CanonicalSMILES/TXT"
-    )
-
-    try:
-        with request.urlopen(url, timeout=10) as response:
-            smiles = response.read().decode("utf-8").strip()
-            return smiles if smiles else None
-    except (error.URLError, error.HTTPError, TimeoutError):
-        return None
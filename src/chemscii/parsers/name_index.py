@@ -0,0 +1,205 @@
+"""Offline name-to-SMILES lookup from a memory-mapped index file."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import mmap
+import os
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+from pathlib import Path
+
+from chemscii.parsers.local_data import open_configured
+
+# Environment variable naming the default index file
+NAME_INDEX_ENV = "CHEMSCII_NAME_INDEX"
+
+# Lines sorted in memory at a time while building an index
+_SORT_CHUNK_LINES = 1_000_000
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a molecule name for lookup.
+
+    Args:
+        name: Molecule name or synonym.
+
+    Returns:
+        The lowercase name with surrounding whitespace removed.
+    """
+    return name.strip().lower()
+
+
+class NameIndex:
+    """Sorted name-to-SMILES index searched in place through mmap.
+
+    The index file holds one "name<TAB>SMILES" line per name, with
+    normalized names in byte order, as written by build_name_index().
+    Lookups binary search the mapped file, so they take O(log n) reads of
+    the pages they touch and the file is never loaded into memory. The file
+    is opened on the first lookup.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Initialize the index.
+
+        Args:
+            path: Path of an index file written by build_name_index().
+        """
+        self.path = Path(path)
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+
+    def _mapped(self) -> mmap.mmap | None:
+        """Map the index file, on first use.
+
+        Returns:
+            The read-only mapping, or None for an empty index.
+
+        Raises:
+            OSError: If the file cannot be opened.
+        """
+        if self._map is None:
+            with self._lock:
+                if self._map is None and self.path.stat().st_size:
+                    with open(self.path, "rb") as f:
+                        self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def lookup(self, name: str) -> str | None:
+        """Find the SMILES for a molecule name.
+
+        Args:
+            name: Molecule name or synonym, in any case.
+
+        Returns:
+            The SMILES string if the name is in the index, None otherwise,
+            including when the index file cannot be read.
+        """
+        try:
+            data = self._mapped()
+        except OSError:
+            # An unreadable index finds nothing
+            return None
+        if data is None:
+            return None
+        key = normalize_name(name).encode("utf-8")
+
+        # Find the first line whose name sorts at or after the key
+        lo, hi = 0, len(data)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b"\n", 0, mid) + 1
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            tab = data.find(b"\t", start, end)
+            if data[start : tab if tab != -1 else end] < key:
+                lo = end + 1
+            else:
+                hi = start
+
+        end = data.find(b"\n", lo)
+        line = data[lo : end if end != -1 else len(data)]
+        found, _, smiles = line.partition(b"\t")
+        if found != key or not smiles:
+            return None
+        return smiles.decode("utf-8")
+
+    def close(self) -> None:
+        """Unmap the index file. It is mapped again by the next lookup."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[bytes]:
+    """Normalize "name<TAB>SMILES" lines into index lines.
+
+    Args:
+        lines: Text lines of a synonym table.
+
+    Yields:
+        Encoded index lines, without line endings.
+    """
+    for line in lines:
+        name, sep, smiles = line.rstrip("\r\n").partition("\t")
+        key = normalize_name(name)
+        smiles = smiles.strip()
+        if sep and key and smiles:
+            yield f"{key}\t{smiles}".encode()
+
+
+def _line_key(line: bytes) -> bytes:
+    """Get the name of an index line.
+
+    Args:
+        line: Encoded index line.
+
+    Returns:
+        The normalized name.
+    """
+    return line.partition(b"\t")[0]
+
+
+def build_name_index(
+    source: str | os.PathLike[str],
+    dest: str | os.PathLike[str],
+    chunk_lines: int = _SORT_CHUNK_LINES,
+) -> int:
+    """Build an index file from a synonym table.
+
+    The table is sorted in chunks of chunk_lines lines that are written to
+    temporary files and merged, so tables larger than memory can be
+    indexed. When a name appears more than once, its first SMILES is kept.
+
+    Args:
+        source: Tab-separated text file of "name<TAB>SMILES" lines.
+        dest: Path of the index file to write.
+        chunk_lines: Lines sorted in memory at a time.
+
+    Returns:
+        Number of names in the index.
+    """
+    count = 0
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        source_file = stack.enter_context(open(source, encoding="utf-8"))
+        lines = _parse_lines(source_file)
+
+        chunk_paths: list[Path] = []
+        while chunk := list(itertools.islice(lines, chunk_lines)):
+            # The sort is stable, so the first SMILES of a name stays first
+            chunk.sort(key=_line_key)
+            chunk_path = Path(tmp) / f"chunk{len(chunk_paths)}"
+            chunk_path.write_bytes(b"\n".join(chunk) + b"\n")
+            chunk_paths.append(chunk_path)
+
+        chunks = [
+            (line.rstrip(b"\n") for line in stack.enter_context(open(p, "rb")))
+            for p in chunk_paths
+        ]
+        with open(dest, "wb") as out:
+            previous = None
+            # Merging takes equal names from earlier chunks first
+            for line in heapq.merge(*chunks, key=_line_key):
+                key = _line_key(line)
+                if key == previous:
+                    continue
+                out.write(line + b"\n")
+                previous = key
+                count += 1
+    return count
+
+
+def default_name_index() -> NameIndex | None:
+    """Get the index named by the CHEMSCII_NAME_INDEX environment variable.
+
+    Returns:
+        The shared index, or None if the variable is not set or names a
+        missing file.
+    """
+    return open_configured(NAME_INDEX_ENV, NameIndex)
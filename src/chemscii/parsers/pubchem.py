@@ -0,0 +1,99 @@
+"""Fetch SMILES from PubChem by name or compound ID."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Sequence
+from urllib import parse
+
+from chemscii.parsers.identifiers import parse_cid
+from chemscii.parsers.remote import fetch
+
+# Base URL of the PubChem REST service
+PUBCHEM_URL = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
+
+# CIDs sent per property request; lists are POSTed, so this is bounded by
+# PubChem's per-request work limit rather than URL length
+CID_BATCH = 500
+
+# SMILES property keys in order of preference. PubChem renamed
+# IsomericSMILES to SMILES and CanonicalSMILES to ConnectivitySMILES, and
+# either spelling may come back.
+_SMILES_KEYS = ("SMILES", "IsomericSMILES", "ConnectivitySMILES", "CanonicalSMILES")
+
+
+def cids_to_smiles(cids: Iterable[int | str], use_api: bool = True) -> dict[int, str]:
+    """Fetch SMILES strings for many PubChem compound IDs.
+
+    CIDs are fetched in batches of up to 500 per request, so a list of
+    hundreds of compounds costs a few round trips.
+
+    Args:
+        cids: PubChem compound IDs, as integers or strings like "CID2244".
+        use_api: Whether to query PubChem.
+
+    Returns:
+        Mapping of each CID found to its SMILES.
+    """
+    parsed = (parse_cid(str(cid)) for cid in cids)
+    unique = list(dict.fromkeys(cid for cid in parsed if cid is not None))
+    if not unique or not use_api:
+        return {}
+    return query_pubchem_cids(unique)
+
+
+def query_pubchem(name: str) -> str | None:
+    """Query PubChem for a molecule's SMILES by name.
+
+    Args:
+        name: The molecule name to search for.
+
+    Returns:
+        The canonical SMILES if found, None otherwise.
+    """
+    encoded_name = parse.quote(name, safe="")
+    url = f"{PUBCHEM_URL}/compound/name/{encoded_name}/property/CanonicalSMILES/TXT"
+
+    body = fetch(url)
+    if body is None:
+        return None
+    # Names matching several compounds give one SMILES per line
+    lines = body.decode("utf-8").strip().splitlines()
+    return lines[0].strip() if lines else None
+
+
+def query_pubchem_cids(cids: Sequence[int]) -> dict[int, str]:
+    """Query PubChem for the SMILES of many compound IDs.
+
+    Args:
+        cids: PubChem compound IDs.
+
+    Returns:
+        Mapping of each CID found to its SMILES.
+    """
+    url = f"{PUBCHEM_URL}/compound/cid/property/SMILES/JSON"
+    found: dict[int, str] = {}
+    for start in range(0, len(cids), CID_BATCH):
+        batch = cids[start : start + CID_BATCH]
+        body = fetch(
+            url, data=parse.urlencode({"cid": ",".join(map(str, batch))}).encode()
+        )
+        if body is None:
+            continue
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except json.JSONDecodeError:
+            continue
+        for properties in data.get("PropertyTable", {}).get("Properties", []):
+            cid = properties.get("CID")
+            smiles = next(
+                (
+                    properties[k]
+                    for k in _SMILES_KEYS
+                    if isinstance(properties.get(k), str)
+                ),
+                None,
+            )
+            if isinstance(cid, int) and smiles is not None:
+                found[cid] = smiles
+    return found
@@ -0,0 +1,230 @@
+"""HTTP fetching with retries and per-host circuit breakers."""
+
+from __future__ import annotations
+
+import http.client
+import os
+import random
+import threading
+import time
+from urllib import error, parse, request
+
+# Environment variable that disables all remote lookups when set to 1
+OFFLINE_ENV = "CHEMSCII_OFFLINE"
+
+# Seconds to wait for a single HTTP response
+_REQUEST_TIMEOUT = 10.0
+
+# Extra attempts after a failed request
+_RETRIES = 2
+
+# Base delay in seconds before the first retry, doubled for each later one
+_BACKOFF = 0.25
+
+# Consecutive failed fetches that open a host's circuit
+_FAILURE_THRESHOLD = 3
+
+# Seconds an open circuit fails fast before letting a probe through
+_RESET_TIMEOUT = 30.0
+
+# HTTP statuses worth retrying: rate limiting and server-side failures
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_offline = False
+
+
+def set_offline(offline: bool) -> None:
+    """Enable or disable offline mode for this process.
+
+    Args:
+        offline: True to make every remote lookup fail immediately.
+    """
+    global _offline
+    _offline = offline
+
+
+def is_offline() -> bool:
+    """Check whether remote lookups are disabled.
+
+    Returns:
+        True if offline mode was set or CHEMSCII_OFFLINE is 1.
+    """
+    return _offline or os.environ.get(OFFLINE_ENV) == "1"
+
+
+class CircuitBreaker:
+    """Stops calling a failing host until it has had time to recover.
+
+    The circuit opens after failure_threshold consecutive failures, and
+    calls are refused without touching the network. Once reset_timeout has
+    passed, a single probe call is let through: if it succeeds the circuit
+    closes, otherwise it stays open for another reset_timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = _FAILURE_THRESHOLD,
+        reset_timeout: float = _RESET_TIMEOUT,
+    ) -> None:
+        """Initialize a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to fail fast before probing again.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being refused or probed."""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Check whether a call may go ahead.
+
+        Returns:
+            True if the circuit is closed, or if this call is the probe of
+            an open circuit whose reset timeout has passed.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self._opened_at is not None or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for the host of a URL.
+
+    Args:
+        url: Any URL on the host.
+
+    Returns:
+        The host's circuit breaker, created on first use.
+    """
+    host = parse.urlsplit(url).netloc
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+
+def reset_breakers() -> None:
+    """Forget the state of every host's circuit breaker."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def max_fetch_time(
+    timeout: float = _REQUEST_TIMEOUT,
+    retries: int = _RETRIES,
+    backoff: float = _BACKOFF,
+) -> float:
+    """Get the longest time fetch() waits on one URL.
+
+    Args:
+        timeout: Seconds to wait for each response.
+        retries: Extra attempts after a failed request.
+        backoff: Base delay in seconds before the first retry.
+
+    Returns:
+        Seconds for every attempt to time out, plus the longest delays
+        between them.
+    """
+    return (retries + 1) * timeout + backoff * ((1 << retries) - 1)
+
+
+def fetch(
+    url: str,
+    headers: dict[str, str] | None = None,
+    data: bytes | None = None,
+    timeout: float = _REQUEST_TIMEOUT,
+    retries: int = _RETRIES,
+    backoff: float = _BACKOFF,
+) -> bytes | None:
+    """Fetch a URL, retrying transient failures.
+
+    Connection errors, timeouts, rate limiting and server errors are
+    retried with exponential backoff and full jitter. Other HTTP errors,
+    such as 404 for an unknown compound, are answers rather than failures
+    and return None at once. Calls fail immediately in offline mode or
+    while the host's circuit is open, and the probe that tests whether the
+    host has recovered is not retried.
+
+    Args:
+        url: URL to fetch.
+        headers: Extra request headers.
+        data: Request body, sent as a POST (None for a GET).
+        timeout: Seconds to wait for each response.
+        retries: Extra attempts after a failed request.
+        backoff: Base delay in seconds before the first retry.
+
+    Returns:
+        The response body, or None if the request failed or was refused.
+    """
+    if is_offline():
+        return None
+    breaker = get_breaker(url)
+    if not breaker.allow():
+        return None
+    # The probe of an open circuit is a single attempt, so a host that is
+    # still down is not held for a full round of retries
+    if breaker.is_open:
+        retries = 0
+
+    req = request.Request(url, data=data, headers=headers or {})
+    succeeded = False
+    try:
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(random.uniform(0, backoff * 2 ** (attempt - 1)))
+            try:
+                with request.urlopen(req, timeout=timeout) as response:
+                    body: bytes = response.read()
+            except error.HTTPError as e:
+                if e.code not in _RETRY_STATUSES:
+                    succeeded = True
+                    return None
+            except (OSError, http.client.HTTPException):
+                # Connection failures, timeouts, TLS errors and truncated
+                # responses
+                pass
+            else:
+                succeeded = True
+                return body
+        return None
+    finally:
+        # Every admitted call records its outcome, even on an unexpected
+        # error, or the probe of an open circuit would never finish
+        if succeeded:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
@@ -0,0 +1,754 @@
+"""Resolver chain that turns molecule identifiers into SMILES."""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import cache
+from pathlib import Path
+
+from chemscii.parsers.chembl import (
+    COMMON_CHEMBL,
+    INCHIKEY_BATCH,
+    query_chembl,
+    query_chembl_inchikeys,
+)
+from chemscii.parsers.chembl_db import ChemblDatabase, default_chembl_database
+from chemscii.parsers.identifiers import classify_identifier, parse_cid
+from chemscii.parsers.inchi import inchi_to_smiles
+from chemscii.parsers.name import COMMON_MOLECULES
+from chemscii.parsers.name_index import NameIndex, default_name_index
+from chemscii.parsers.pubchem import (
+    CID_BATCH,
+    query_pubchem,
+    query_pubchem_cids,
+)
+from chemscii.parsers.remote import max_fetch_time
+
+# Environment variable naming the default on-disk resolution cache
+RESOLVER_CACHE_ENV = "CHEMSCII_RESOLVER_CACHE"
+
+# Results kept by the in-memory cache
+_MEMORY_CACHE_SIZE = 4096
+
+# Seconds allowed for a remote lookup before the chain gives up on it, long
+# enough for every retry of a request so retries are not cut short
+_REMOTE_TIMEOUT = max_fetch_time()
+
+# Threads running lookups that have a timeout or are hedged
+_MAX_WORKERS = 8
+
+# Input types that name lookups and synonym tables can answer
+_SYNONYM_TYPES = frozenset({"name", "cas", "inchikey"})
+
+
+def _cache_key(input_type: str, value: str) -> str:
+    """Normalize an identifier for caching.
+
+    Args:
+        input_type: Input type from detect_input_type().
+        value: Identifier of that type.
+
+    Returns:
+        The identifier in canonical case.
+    """
+    value = value.strip()
+    if input_type in ("chembl", "inchikey"):
+        return value.upper()
+    if input_type == "inchi":
+        return value
+    return value.lower()
+
+
+class Resolution:
+    """SMILES found by a resolver chain, with where and how fast."""
+
+    __slots__ = ("smiles", "backend", "elapsed")
+
+    def __init__(self, smiles: str, backend: str, elapsed: float) -> None:
+        """Initialize a resolution.
+
+        Args:
+            smiles: Resolved SMILES string.
+            backend: Name of the backend that answered.
+            elapsed: Seconds taken by the whole chain.
+        """
+        self.smiles = smiles
+        self.backend = backend
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        """Get a short description of the resolution."""
+        return (
+            f"Resolution({self.smiles!r}, backend={self.backend!r}, "
+            f"elapsed={self.elapsed:.4f})"
+        )
+
+
+class ResolverBackend(ABC):
+    """One source of identifier-to-SMILES lookups in a resolver chain."""
+
+    # Name reported for answers from this backend
+    name: str = ""
+
+    def __init__(
+        self, timeout: float | None = None, hedge_after: float | None = None
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            timeout: Seconds the chain waits for an answer before moving on
+                to the next backend (None to wait for it).
+            hedge_after: Seconds after which a second, identical lookup is
+                started if the first has not answered (None to never hedge).
+        """
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+
+    @abstractmethod
+    def resolve(self, input_type: str, value: str) -> str | None:
+        """Look up the SMILES for an identifier.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+
+        Returns:
+            The SMILES string if found, None otherwise.
+        """
+
+    def resolve_many(self, input_type: str, values: Sequence[str]) -> dict[str, str]:
+        """Look up the SMILES for many identifiers of one type.
+
+        Backends that can answer a batch in one query override this; by
+        default each identifier is looked up in turn.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            values: Identifiers of that type.
+
+        Returns:
+            Mapping of each identifier found, as given, to its SMILES.
+        """
+        found = {}
+        for value in values:
+            smiles = self.resolve(input_type, value)
+            if smiles is not None:
+                found[value] = smiles
+        return found
+
+    def batch_size(self, input_type: str) -> int:
+        """Get the number of identifiers resolve_many() answers per query.
+
+        The chain gives a batch one timeout per query it needs.
+
+        Args:
+            input_type: Input type from detect_input_type().
+
+        Returns:
+            Identifiers per query; 1 for backends without bulk queries.
+        """
+        return 1
+
+    def store(self, input_type: str, value: str, smiles: str) -> None:
+        """Remember an answer found by a later backend.
+
+        Backends that are not caches ignore it.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+            smiles: SMILES string found for it.
+        """
+
+
+class MemoryBackend(ResolverBackend):
+    """Built-in common compounds plus a bounded cache of recent answers."""
+
+    name = "memory"
+
+    def __init__(self, size: int = _MEMORY_CACHE_SIZE) -> None:
+        """Initialize the backend.
+
+        Args:
+            size: Number of recent answers to keep.
+        """
+        super().__init__()
+        self.size = size
+        self._recent: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, input_type: str, value: str) -> str | None:
+        """Look up the SMILES for an identifier.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+
+        Returns:
+            The SMILES string if found, None otherwise.
+        """
+        key = _cache_key(input_type, value)
+        if input_type == "name" and key in COMMON_MOLECULES:
+            return COMMON_MOLECULES[key]
+        if input_type == "chembl" and key in COMMON_CHEMBL:
+            return COMMON_CHEMBL[key]
+        with self._lock:
+            smiles = self._recent.get((input_type, key))
+            if smiles is not None:
+                self._recent.move_to_end((input_type, key))
+        return smiles
+
+    def store(self, input_type: str, value: str, smiles: str) -> None:
+        """Remember an answer found by a later backend.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+            smiles: SMILES string found for it.
+        """
+        key = (input_type, _cache_key(input_type, value))
+        with self._lock:
+            self._recent[key] = smiles
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.size:
+                self._recent.popitem(last=False)
+
+
+class DiskCacheBackend(ResolverBackend):
+    """Answers remembered across runs in a SQLite file."""
+
+    name = "disk"
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Initialize the backend.
+
+        Args:
+            path: Path of the cache file, created on first use.
+        """
+        super().__init__()
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache file, on first use.
+
+        Returns:
+            The connection. Callers must hold the lock.
+        """
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS resolved ("
+                "input_type TEXT, key TEXT, smiles TEXT, "
+                "PRIMARY KEY (input_type, key))"
+            )
+        return self._conn
+
+    def resolve(self, input_type: str, value: str) -> str | None:
+        """Look up the SMILES for an identifier.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+
+        Returns:
+            The SMILES string if found, None otherwise.
+        """
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT smiles FROM resolved WHERE input_type = ? AND key = ?",
+                    (input_type, _cache_key(input_type, value)),
+                )
+                .fetchone()
+            )
+        return str(row[0]) if row else None
+
+    def store(self, input_type: str, value: str, smiles: str) -> None:
+        """Remember an answer found by a later backend.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+            smiles: SMILES string found for it.
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resolved VALUES (?, ?, ?)",
+                    (input_type, _cache_key(input_type, value), smiles),
+                )
+
+
+class LocalDatabaseBackend(ResolverBackend):
+    """Offline lookups: InChI parsing, the name index and ChEMBL database."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        name_index: NameIndex | None = None,
+        chembl_database: ChemblDatabase | None = None,
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            name_index: Synonym index for names, CAS numbers and InChIKeys
+                (None for the index named by CHEMSCII_NAME_INDEX).
+            chembl_database: ChEMBL database for ChEMBL IDs and InChIKeys
+                (None for the database named by CHEMSCII_CHEMBL_DB).
+        """
+        super().__init__()
+        self.name_index = name_index
+        self.chembl_database = chembl_database
+
+    def resolve(self, input_type: str, value: str) -> str | None:
+        """Look up the SMILES for an identifier.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+
+        Returns:
+            The SMILES string if found, None otherwise.
+        """
+        if input_type == "inchi":
+            return inchi_to_smiles(value)
+        return self.resolve_many(input_type, [value]).get(value)
+
+    def resolve_many(self, input_type: str, values: Sequence[str]) -> dict[str, str]:
+        """Look up the SMILES for many identifiers of one type.
+
+        ChEMBL IDs and InChIKeys are looked up in the ChEMBL database with
+        bulk queries; InChIKeys it does not have, names and CAS numbers are
+        looked up in the name index.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            values: Identifiers of that type.
+
+        Returns:
+            Mapping of each identifier found, as given, to its SMILES.
+        """
+        if input_type == "inchi":
+            return super().resolve_many(input_type, values)
+
+        found: dict[str, str] = {}
+        database = self.chembl_database or default_chembl_database()
+        if database is not None and input_type in ("chembl", "inchikey"):
+            keys = {value: _cache_key(input_type, value) for value in values}
+            if input_type == "chembl":
+                answers = database.lookup_many(keys.values())
+            else:
+                answers = database.lookup_inchikeys(keys.values())
+            found = {v: answers[k] for v, k in keys.items() if k in answers}
+
+        index = self.name_index or default_name_index()
+        if index is not None and input_type in _SYNONYM_TYPES:
+            for value in values:
+                if value not in found:
+                    smiles = index.lookup(value)
+                    if smiles is not None:
+                        found[value] = smiles
+        return found
+
+
+class RemoteBackend(ResolverBackend):
+    """PubChem and ChEMBL web service lookups."""
+
+    name = "remote"
+
+    def __init__(
+        self,
+        timeout: float | None = _REMOTE_TIMEOUT,
+        hedge_after: float | None = None,
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            timeout: Seconds the chain waits for an answer (None to wait
+                for the request's own timeout).
+            hedge_after: Seconds after which a second request is sent if
+                the first has not answered (None to never hedge).
+        """
+        super().__init__(timeout, hedge_after)
+
+    def resolve(self, input_type: str, value: str) -> str | None:
+        """Look up the SMILES for an identifier.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+
+        Returns:
+            The SMILES string if found, None otherwise.
+        """
+        if input_type == "chembl":
+            return query_chembl(_cache_key(input_type, value))
+        if input_type in ("cid", "inchikey"):
+            return self.resolve_many(input_type, [value]).get(value)
+        return query_pubchem(value)
+
+    def batch_size(self, input_type: str) -> int:
+        """Get the number of identifiers resolve_many() answers per query.
+
+        Args:
+            input_type: Input type from detect_input_type().
+
+        Returns:
+            Identifiers per PubChem or ChEMBL request.
+        """
+        if input_type == "cid":
+            return CID_BATCH
+        if input_type == "inchikey":
+            return INCHIKEY_BATCH
+        return 1
+
+    def resolve_many(self, input_type: str, values: Sequence[str]) -> dict[str, str]:
+        """Look up the SMILES for many identifiers of one type.
+
+        PubChem CIDs are looked up together with batched PubChem property
+        requests and InChIKeys with batched ChEMBL queries, falling back to
+        PubChem for keys ChEMBL does not have; other identifiers are
+        looked up one at a time.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            values: Identifiers of that type.
+
+        Returns:
+            Mapping of each identifier found, as given, to its SMILES.
+        """
+        if input_type == "cid":
+            cids = {value: parse_cid(value) for value in values}
+            by_cid = query_pubchem_cids(
+                [cid for cid in dict.fromkeys(cids.values()) if cid is not None]
+            )
+            return {v: by_cid[c] for v, c in cids.items() if c in by_cid}
+        if input_type != "inchikey":
+            return super().resolve_many(input_type, values)
+        keys = {value: _cache_key(input_type, value) for value in values}
+        answers = query_chembl_inchikeys(list(dict.fromkeys(keys.values())))
+        found = {v: answers[k] for v, k in keys.items() if k in answers}
+        # Most PubChem compounds are not in ChEMBL, and PubChem takes one
+        # InChIKey per request
+        for value, key in keys.items():
+            if value not in found:
+                smiles = answers.get(key) or query_pubchem(key)
+                if smiles is not None:
+                    answers[key] = smiles
+                    found[value] = smiles
+        return found
+
+
+@cache
+def _executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool for timed and hedged lookups.
+
+    Returns:
+        The thread pool, created on first use.
+    """
+    return ThreadPoolExecutor(
+        max_workers=_MAX_WORKERS, thread_name_prefix="chemscii-resolver"
+    )
+
+
+def _first_answer(futures: list[Future[str | None]]) -> str | None:
+    """Get the first SMILES among finished lookups.
+
+    Args:
+        futures: Lookups, some of which may have finished.
+
+    Returns:
+        The SMILES of the first successful finished lookup, or None.
+    """
+    for future in futures:
+        if future.done() and future.exception() is None:
+            smiles = future.result()
+            if smiles is not None:
+                return smiles
+    return None
+
+
+class ResolverChain:
+    """Tries resolver backends in order until one finds the molecule.
+
+    Backends are ordered from fastest to slowest, typically memory, disk
+    cache, local databases and remote services. An answer from a later
+    backend is stored in the earlier ones, so repeated lookups stay local.
+    Backends with a timeout run on a shared thread pool and are abandoned
+    when it expires; hedged backends get a second, identical lookup when
+    the first is slow, and the first answer wins. A backend that raises
+    counts as a miss.
+    """
+
+    def __init__(self, backends: Sequence[ResolverBackend]) -> None:
+        """Initialize the chain.
+
+        Args:
+            backends: Backends in the order they are tried.
+        """
+        self.backends = tuple(backends)
+
+    def resolve(self, input_type: str, value: str) -> Resolution | None:
+        """Resolve an identifier to SMILES.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+
+        Returns:
+            The SMILES with the backend that answered and the time taken,
+            or None if no backend found it.
+        """
+        start = time.perf_counter()
+        for i, backend in enumerate(self.backends):
+            smiles = self._call(backend, input_type, value)
+            if smiles is not None:
+                for earlier in self.backends[:i]:
+                    earlier.store(input_type, value, smiles)
+                return Resolution(smiles, backend.name, time.perf_counter() - start)
+        return None
+
+    def resolve_many(
+        self, input_type: str, values: Sequence[str]
+    ) -> dict[str, Resolution]:
+        """Resolve many identifiers of one type to SMILES.
+
+        Each backend is asked once for every identifier still unresolved,
+        so backends with bulk queries answer a whole batch in a few round
+        trips.
+
+        Args:
+            input_type: Input type from detect_input_type().
+            values: Identifiers of that type.
+
+        Returns:
+            Mapping of each identifier resolved, as given, to its
+            resolution. The elapsed time is that of the batch so far.
+        """
+        start = time.perf_counter()
+        remaining = list(dict.fromkeys(values))
+        found: dict[str, Resolution] = {}
+        for i, backend in enumerate(self.backends):
+            if not remaining:
+                break
+            answers = self._call_many(backend, input_type, remaining)
+            elapsed = time.perf_counter() - start
+            for value, smiles in answers.items():
+                if value in found or value not in remaining:
+                    continue
+                for earlier in self.backends[:i]:
+                    earlier.store(input_type, value, smiles)
+                found[value] = Resolution(smiles, backend.name, elapsed)
+            remaining = [value for value in remaining if value not in found]
+        return found
+
+    def resolve_identifiers(
+        self, values: Sequence[str], input_type: str | None = None
+    ) -> list[str | None]:
+        """Resolve a list of identifiers, possibly of mixed types.
+
+        Identifiers are grouped by type and each group is resolved with
+        resolve_many(), so a column of IDs costs a few bulk queries.
+
+        Args:
+            values: Identifiers, such as a column of a table.
+            input_type: Type of every identifier (None to classify each
+                one, looking up anything unrecognized as a name).
+
+        Returns:
+            SMILES of each identifier, in order, with None for blank or
+            unresolved identifiers.
+        """
+        groups: dict[str, dict[str, str]] = {}
+        for value in values:
+            value = value.strip()
+            if not value:
+                continue
+            if input_type is not None:
+                groups.setdefault(input_type, {})[value] = value
+                continue
+            identifier = classify_identifier(value)
+            if identifier is None:
+                groups.setdefault("name", {})[value] = value
+            else:
+                groups.setdefault(identifier[0], {})[value] = identifier[1]
+
+        smiles: dict[str, str] = {}
+        for group_type, keys in groups.items():
+            found = self.resolve_many(group_type, list(keys.values()))
+            for value, key in keys.items():
+                if key in found:
+                    smiles[value] = found[key].smiles
+        return [smiles.get(value.strip()) for value in values]
+
+    def _call_many(
+        self, backend: ResolverBackend, input_type: str, values: list[str]
+    ) -> dict[str, str]:
+        """Run one backend on a batch within its timeout.
+
+        A timed backend is asked one chunk of batch_size() identifiers at a
+        time, and the batch gets the backend timeout once per chunk.
+        Answers from the chunks that finished in time are kept. Batches
+        are never hedged, as a duplicate bulk query costs as much as the
+        first.
+
+        Args:
+            backend: Backend to ask.
+            input_type: Input type from detect_input_type().
+            values: Identifiers of that type.
+
+        Returns:
+            Mapping of each identifier found in time to its SMILES, without
+            those of chunks that failed.
+        """
+        if backend.timeout is None:
+            try:
+                return backend.resolve_many(input_type, values)
+            except Exception:
+                return {}
+
+        size = max(backend.batch_size(input_type), 1)
+        chunks = [values[i : i + size] for i in range(0, len(values), size)]
+        deadline = time.monotonic() + backend.timeout * len(chunks)
+        found: dict[str, str] = {}
+        lock = threading.Lock()
+        future = _executor().submit(
+            self._run_chunks, backend, input_type, chunks, deadline, found, lock
+        )
+        wait([future], timeout=max(deadline - time.monotonic(), 0.0))
+        with lock:
+            return dict(found)
+
+    @staticmethod
+    def _run_chunks(
+        backend: ResolverBackend,
+        input_type: str,
+        chunks: list[list[str]],
+        deadline: float,
+        found: dict[str, str],
+        lock: threading.Lock,
+    ) -> None:
+        """Ask a backend for chunks of a batch until the deadline passes.
+
+        Args:
+            backend: Backend to ask.
+            input_type: Input type from detect_input_type().
+            chunks: Identifiers of that type, in chunks.
+            deadline: time.monotonic() after which no chunk is started.
+            found: Mapping the answers are added to.
+            lock: Lock held while adding answers.
+        """
+        for chunk in chunks:
+            if time.monotonic() >= deadline:
+                return
+            try:
+                answers = backend.resolve_many(input_type, chunk)
+            except Exception:
+                continue
+            with lock:
+                found.update(answers)
+
+    def _call(
+        self, backend: ResolverBackend, input_type: str, value: str
+    ) -> str | None:
+        """Run one backend within its latency budget.
+
+        Args:
+            backend: Backend to ask.
+            input_type: Input type from detect_input_type().
+            value: Identifier of that type.
+
+        Returns:
+            The SMILES string if the backend found it in time, None if it
+            missed, failed or ran out of time.
+        """
+        if backend.timeout is None and backend.hedge_after is None:
+            try:
+                return backend.resolve(input_type, value)
+            except Exception:
+                # A failing backend is a miss, so the next one gets a turn
+                return None
+
+        pool = _executor()
+        deadline = time.monotonic() + (
+            backend.timeout if backend.timeout is not None else math.inf
+        )
+        futures = [pool.submit(backend.resolve, input_type, value)]
+        hedge_after = backend.hedge_after
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            wait_for = remaining if hedge_after is None else min(remaining, hedge_after)
+            _, pending = wait(
+                futures,
+                timeout=None if math.isinf(wait_for) else wait_for,
+                return_when=FIRST_COMPLETED,
+            )
+            smiles = _first_answer(futures)
+            if smiles is not None:
+                return smiles
+            if not pending:
+                return None
+            if hedge_after is not None and time.monotonic() < deadline:
+                # The first lookup is slow rather than missing, so race a
+                # second one against it
+                futures.append(pool.submit(backend.resolve, input_type, value))
+                hedge_after = None
+
+
+def default_backends(cache_path: str | None = None) -> list[ResolverBackend]:
+    """Build the standard backends.
+
+    Args:
+        cache_path: Path of the on-disk cache (None for no disk cache).
+
+    Returns:
+        Memory, disk cache (if configured), local database and remote
+        backends, in that order.
+    """
+    backends: list[ResolverBackend] = [MemoryBackend()]
+    if cache_path:
+        backends.append(DiskCacheBackend(cache_path))
+    backends.append(LocalDatabaseBackend())
+    backends.append(RemoteBackend())
+    return backends
+
+
+@cache
+def _default_chain(cache_path: str | None) -> ResolverChain:
+    """Get the shared standard chain for a disk cache path.
+
+    Args:
+        cache_path: Path of the on-disk cache (None for no disk cache).
+
+    Returns:
+        The resolver chain.
+    """
+    return ResolverChain(default_backends(cache_path))
+
+
+def default_resolver() -> ResolverChain:
+    """Get the standard resolver chain.
+
+    The disk cache is the file named by the CHEMSCII_RESOLVER_CACHE
+    environment variable, and is left out if the variable is not set.
+
+    Returns:
+        The shared resolver chain.
+    """
+    return _default_chain(os.environ.get(RESOLVER_CACHE_ENV) or None)
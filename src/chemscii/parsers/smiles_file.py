@@ -0,0 +1,249 @@
+"""Random access to records of large SMILES files."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+import warnings
+from collections.abc import Iterator
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+# Suffix of the sidecar file a line-offset index is saved to
+INDEX_SUFFIX = ".idx.npy"
+
+# Bytes scanned for line breaks at a time while building an index
+_INDEX_CHUNK = 64 * 1024 * 1024
+
+# Byte values of line break characters
+_LF = ord("\n")
+_CR = ord("\r")
+
+
+def default_index_path(path: str | os.PathLike[str]) -> Path:
+    """Get the sidecar path of the line-offset index of a SMILES file.
+
+    Args:
+        path: Path of the SMILES file.
+
+    Returns:
+        The path of the index saved next to it.
+    """
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _scan_offsets(data: mmap.mmap) -> npt.NDArray[np.int64]:
+    """Find the start of every non-blank line.
+
+    Args:
+        data: Mapped file contents.
+
+    Returns:
+        Byte offsets of the records, followed by the file size.
+    """
+    size = len(data)
+    view = np.frombuffer(data, dtype=np.uint8)
+    try:
+        starts = [np.zeros(1, dtype=np.int64)]
+        for pos in range(0, size, _INDEX_CHUNK):
+            breaks = np.flatnonzero(view[pos : pos + _INDEX_CHUNK] == _LF)
+            starts.append(breaks.astype(np.int64) + pos + 1)
+        offsets = np.concatenate(starts)
+        offsets = offsets[offsets < size]
+        first = view[offsets]
+        offsets = offsets[(first != _LF) & (first != _CR)]
+    finally:
+        # The mapping cannot be closed while views of it exist
+        del view
+    return np.append(offsets, np.int64(size))
+
+
+class SmilesFile:
+    """Reads records of a SMILES file in place through mmap.
+
+    Each non-blank line is a record of a SMILES string, optionally
+    followed by whitespace and a title. The byte offset of every record is
+    found once, by a vectorized scan of the mapped file, after which any
+    record, range or random sample is read without touching the rest of
+    the file. The offsets can be saved to a sidecar file, which is reused
+    for as long as it is newer than the SMILES file.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        index_path: str | os.PathLike[str] | None = None,
+    ) -> None:
+        """Initialize the reader.
+
+        Args:
+            path: Path of the SMILES file.
+            index_path: File the line-offset index is loaded from, or saved
+                to when missing or stale (None to keep it in memory only).
+        """
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path is not None else None
+        self._map: mmap.mmap | None = None
+        self._offsets: npt.NDArray[np.int64] | None = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> tuple[mmap.mmap | None, npt.NDArray[np.int64]]:
+        """Map the file and load or build its index, on first use.
+
+        Returns:
+            The read-only mapping (None for an empty file) and the record
+            offsets followed by the file size.
+
+        Raises:
+            OSError: If the file cannot be opened.
+        """
+        with self._lock:
+            if self._offsets is None:
+                stat = self.path.stat()
+                if stat.st_size:
+                    with open(self.path, "rb") as f:
+                        self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    self._offsets = self._load_index(stat)
+                except BaseException:
+                    # Do not leave the file mapped when no index was built
+                    if self._map is not None:
+                        self._map.close()
+                        self._map = None
+                    raise
+            return self._map, self._offsets
+
+    def _load_index(self, stat: os.stat_result) -> npt.NDArray[np.int64]:
+        """Load the saved index if it is current, or build it.
+
+        Args:
+            stat: Status of the SMILES file.
+
+        Returns:
+            Record offsets followed by the file size.
+        """
+        if self._map is None:
+            return np.zeros(1, dtype=np.int64)
+        index_path = self.index_path
+        if index_path is not None and index_path.exists():
+            if index_path.stat().st_mtime >= stat.st_mtime:
+                try:
+                    saved = np.load(index_path, mmap_mode="r")
+                except (OSError, ValueError):
+                    # A damaged index is rebuilt and saved over
+                    saved = np.zeros(0, dtype=np.int64)
+                if len(saved) and saved[-1] == stat.st_size:
+                    return saved  # type: ignore[no-any-return]
+        offsets = _scan_offsets(self._map)
+        if index_path is not None:
+            self._save_index(index_path, offsets)
+        return offsets
+
+    @staticmethod
+    def _save_index(index_path: Path, offsets: npt.NDArray[np.int64]) -> None:
+        """Save an index, or warn and keep it in memory only if that fails.
+
+        Args:
+            index_path: File the index is saved to.
+            offsets: Record offsets followed by the file size.
+        """
+        try:
+            with open(index_path, "wb") as f:
+                np.save(f, offsets)
+        except OSError as e:
+            # Do not leave a partly written index to be loaded next time
+            with suppress(OSError):
+                index_path.unlink()
+            warnings.warn(
+                f"Could not save the SMILES index, keeping it in memory: {e}",
+                stacklevel=5,
+            )
+
+    def __len__(self) -> int:
+        """Get the number of records."""
+        return len(self._open()[1]) - 1
+
+    def line(self, index: int) -> str:
+        """Read one record as written in the file.
+
+        Args:
+            index: Position of the record; negative values count from the
+                end.
+
+        Returns:
+            The line, without its line break.
+
+        Raises:
+            IndexError: If there is no record at the position.
+        """
+        data, offsets = self._open()
+        count = len(offsets) - 1
+        if data is None or not -count <= index < count:
+            raise IndexError(f"Record {index} out of range for {count} records")
+        start = int(offsets[index % count])
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = len(data)
+        return data[start:end].rstrip(b"\r").decode("utf-8")
+
+    def record(self, index: int) -> tuple[str, str]:
+        """Read one record.
+
+        Args:
+            index: Position of the record; negative values count from the
+                end.
+
+        Returns:
+            A tuple of (smiles, title), with an empty title if the line has
+            none.
+
+        Raises:
+            IndexError: If there is no record at the position.
+        """
+        fields = self.line(index).split(maxsplit=1) or [""]
+        return fields[0], fields[1].strip() if len(fields) > 1 else ""
+
+    def records(
+        self, start: int | None = None, stop: int | None = None
+    ) -> Iterator[tuple[str, str]]:
+        """Read a range of records.
+
+        Args:
+            start: First position, as in a slice (None for the first record).
+            stop: Position after the last, as in a slice (None for the end).
+
+        Yields:
+            A tuple of (smiles, title) for each record in the range.
+        """
+        for index in range(*slice(start, stop).indices(len(self))):
+            yield self.record(index)
+
+    def sample(self, count: int, seed: int | None = None) -> list[int]:
+        """Choose positions of records at random, without replacement.
+
+        Args:
+            count: Number of records to choose; all are chosen if the file
+                has fewer.
+            seed: Seed of the random generator (None for a fresh sample on
+                every call).
+
+        Returns:
+            The chosen positions, in file order.
+        """
+        total = len(self)
+        rng = np.random.default_rng(seed)
+        chosen = rng.choice(total, size=min(max(count, 0), total), replace=False)
+        return sorted(int(index) for index in chosen)
+
+    def close(self) -> None:
+        """Unmap the file. It is mapped again by the next read."""
+        with self._lock:
+            self._offsets = None
+            if self._map is not None:
+                self._map.close()
+                self._map = None
@@ -0,0 +1,268 @@
+"""Chunked reading of compound tables in CSV, TSV and Parquet files."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import os
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+# Record of a table row: (row number from 0, SMILES, ID)
+TableRecord = tuple[int, str, str]
+
+# Delimiters of the text table formats, by file suffix
+_DELIMITERS = {".csv": ",", ".tsv": "\t", ".tab": "\t"}
+
+# File suffixes of the columnar table formats
+_PARQUET_SUFFIXES = (".parquet", ".pq")
+
+# Suffixes of all table files
+TABLE_SUFFIXES = (*_DELIMITERS, *_PARQUET_SUFFIXES)
+
+# Rows read and converted at a time
+_CHUNK_ROWS = 10_000
+
+# Column names tried, in order, when no SMILES column is given
+_SMILES_COLUMNS = ("smiles", "canonical_smiles", "isomeric_smiles", "smi")
+
+# Column names tried, in order, when no ID column is given
+_ID_COLUMNS = ("id", "name", "title", "compound_id", "molecule_chembl_id")
+
+
+def is_table(path: str | os.PathLike[str]) -> bool:
+    """Check whether a file is a table by its suffix.
+
+    Args:
+        path: Path of the file.
+
+    Returns:
+        True for CSV, TSV and Parquet files.
+    """
+    return Path(path).suffix.lower() in TABLE_SUFFIXES
+
+
+def _find_column(
+    names: Sequence[str], column: str | None, candidates: Sequence[str]
+) -> int | None:
+    """Find a column by name, or by common names when none is given.
+
+    Names match exactly first, then ignoring case.
+
+    Args:
+        names: Column names of the table.
+        column: Requested column name (None to try the candidates).
+        candidates: Common names of the column, in order of preference.
+
+    Returns:
+        Position of the column, or None if no name matches.
+    """
+    wanted = [column] if column is not None else list(candidates)
+    for name in wanted:
+        if name in names:
+            return names.index(name)
+    folded = [name.strip().lower() for name in names]
+    for name in wanted:
+        if name.lower() in folded:
+            return folded.index(name.lower())
+    return None
+
+
+def _select_columns(
+    names: Sequence[str], smiles_column: str | None, id_column: str | None
+) -> tuple[int, int | None]:
+    """Find the SMILES and ID columns of a table.
+
+    Args:
+        names: Column names of the table.
+        smiles_column: Name of the SMILES column (None to detect it).
+        id_column: Name of the ID column (None to detect it, if present).
+
+    Returns:
+        A tuple of (smiles_position, id_position), with None for a missing
+        optional ID column.
+
+    Raises:
+        ValueError: If a requested or required column is missing.
+    """
+    smiles_pos = _find_column(names, smiles_column, _SMILES_COLUMNS)
+    if smiles_pos is None:
+        wanted = smiles_column or " or ".join(_SMILES_COLUMNS)
+        raise ValueError(
+            f"No SMILES column {wanted!r} in table columns: {', '.join(names)}"
+        )
+    id_pos = _find_column(names, id_column, _ID_COLUMNS)
+    if id_pos is None and id_column is not None:
+        raise ValueError(
+            f"No ID column {id_column!r} in table columns: {', '.join(names)}"
+        )
+    return smiles_pos, id_pos
+
+
+def _read_text_table(
+    path: Path,
+    delimiter: str,
+    smiles_column: str | None,
+    id_column: str | None,
+    start: int,
+    stop: int | None,
+    chunk_rows: int,
+) -> Iterator[list[TableRecord]]:
+    """Read chunks of records from a delimited text table.
+
+    Args:
+        path: Path of the table, with a header row.
+        delimiter: Field delimiter.
+        smiles_column: Name of the SMILES column (None to detect it).
+        id_column: Name of the ID column (None to detect it, if present).
+        start: First row read.
+        stop: Row after the last one read (None for the end).
+        chunk_rows: Rows in each chunk.
+
+    Yields:
+        Lists of up to chunk_rows records.
+    """
+    # Spreadsheet programs often start UTF-8 exports with a byte order mark
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        smiles_pos, id_pos = _select_columns(header, smiles_column, id_column)
+        rows = itertools.islice(enumerate(reader), start, stop)
+        while chunk := list(itertools.islice(rows, chunk_rows)):
+            yield [
+                (
+                    index,
+                    row[smiles_pos].strip() if smiles_pos < len(row) else "",
+                    (
+                        row[id_pos].strip()
+                        if id_pos is not None and id_pos < len(row)
+                        else ""
+                    ),
+                )
+                for index, row in chunk
+            ]
+
+
+def _read_parquet(
+    path: Path,
+    smiles_column: str | None,
+    id_column: str | None,
+    start: int,
+    stop: int | None,
+    chunk_rows: int,
+) -> Iterator[list[TableRecord]]:
+    """Read chunks of records from a Parquet file.
+
+    Only the selected columns are read, one record batch at a time.
+
+    Args:
+        path: Path of the Parquet file.
+        smiles_column: Name of the SMILES column (None to detect it).
+        id_column: Name of the ID column (None to detect it, if present).
+        start: First row read.
+        stop: Row after the last one read (None for the end).
+        chunk_rows: Rows in each chunk.
+
+    Yields:
+        Lists of up to chunk_rows records.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet files requires pyarrow: pip install chemscii[parquet]"
+        ) from e
+
+    parquet_file = pq.ParquetFile(path)
+    names = parquet_file.schema_arrow.names
+    smiles_pos, id_pos = _select_columns(names, smiles_column, id_column)
+    columns = [names[smiles_pos]]
+    if id_pos is not None:
+        columns.append(names[id_pos])
+
+    offset = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        first = offset
+        offset += batch.num_rows
+        # Skip batches before the range without converting them
+        if offset <= start:
+            continue
+        if stop is not None and first >= stop:
+            return
+        lo = max(start - first, 0)
+        hi = batch.num_rows if stop is None else min(stop - first, batch.num_rows)
+        batch = batch.slice(lo, hi - lo)
+        smiles = batch.column(0).to_pylist()
+        ids = batch.column(1).to_pylist() if id_pos is not None else []
+        yield [
+            (
+                first + lo + i,
+                str(value).strip() if value is not None else "",
+                str(ids[i]).strip() if ids and ids[i] is not None else "",
+            )
+            for i, value in enumerate(smiles)
+        ]
+
+
+def read_table(
+    path: str | os.PathLike[str],
+    smiles_column: str | None = None,
+    id_column: str | None = None,
+    start: int = 0,
+    stop: int | None = None,
+    chunk_rows: int = _CHUNK_ROWS,
+) -> Iterator[list[TableRecord]]:
+    """Stream the SMILES and IDs of a table in chunks.
+
+    Only one chunk of rows is held in memory at a time, so tables of any
+    size can be rendered. Text tables are read by the csv module; Parquet
+    files require pyarrow.
+
+    Args:
+        path: Path of a CSV, TSV or Parquet file. Text tables need a header
+            row.
+        smiles_column: Name of the SMILES column (None to use a column
+            named "smiles", "canonical_smiles", "isomeric_smiles" or "smi").
+        id_column: Name of the ID column (None to use a column named "id",
+            "name", "title", "compound_id" or "molecule_chembl_id", if
+            there is one).
+        start: First row read, counting from 0.
+        stop: Row after the last one read (None for the end).
+        chunk_rows: Rows in each chunk.
+
+    Yields:
+        Lists of up to chunk_rows records of (row, smiles, id), with empty
+        strings for missing values.
+
+    Raises:
+        ValueError: If the file is not a table, a requested column is
+            missing, or the range bounds are negative.
+        ImportError: If the file is Parquet and pyarrow is not installed.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if start < 0 or (stop is not None and stop < 0):
+        raise ValueError("Table rows are streamed, so the range cannot be negative")
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+    if suffix in _DELIMITERS:
+        return _read_text_table(
+            path,
+            _DELIMITERS[suffix],
+            smiles_column,
+            id_column,
+            start,
+            stop,
+            chunk_rows,
+        )
+    if suffix in _PARQUET_SUFFIXES:
+        return _read_parquet(path, smiles_column, id_column, start, stop, chunk_rows)
+    raise ValueError(
+        f"Unknown table format: {path.name} "
+        f"(expected one of {', '.join(TABLE_SUFFIXES)})"
+    )
@@ -2,7 +2,21 @@
 
 from chemscii.renderers.ascii import AsciiRenderer
 from chemscii.renderers.base import BaseRenderer
+from chemscii.renderers.braille import BrailleRenderer
+from chemscii.renderers.graphics import GraphicsRenderer
+from chemscii.renderers.grid import GridRenderer
 from chemscii.renderers.magic import AsciiMagicRenderer
+from chemscii.renderers.multi import RENDER_FORMATS, MultiRenderer
 from chemscii.renderers.unicode import UnicodeRenderer
 
-__all__ = ["AsciiRenderer", "BaseRenderer", "UnicodeRenderer", "AsciiMagicRenderer"]
+__all__ = [
+    "AsciiRenderer",
+    "BaseRenderer",
+    "UnicodeRenderer",
+    "AsciiMagicRenderer",
+    "MultiRenderer",
+    "GridRenderer",
+    "BrailleRenderer",
+    "GraphicsRenderer",
+    "RENDER_FORMATS",
+]
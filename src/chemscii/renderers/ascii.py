@@ -2,27 +2,9 @@
 
 from __future__ import annotations
 
-from chemscii.renderers.base import BaseRenderer
-
-# ANSI color codes
-_COLORS: dict[str, str] = {
-    "red": "\033[91m",
-    "blue": "\033[94m",
-    "yellow": "\033[93m",
-    "cyan": "\033[96m",
-    "reset": "\033[0m",
-}
-
-# Element to color mapping
-_ELEMENT_COLORS: dict[str, str] = {
-    "O": "red",
-    "N": "blue",
-    "S": "yellow",
-    "F": "cyan",
-    "Cl": "cyan",
-    "Br": "cyan",
-    "I": "cyan",
-}
+from chemscii.layout import DepictionEngine, Preprocessor, ScaffoldTemplates
+from chemscii.renderers.base import AUTO_BOND_CELLS, BaseRenderer
+from chemscii.renderers.color import ColorEngine, ColorMode, get_color_engine
 
 
 class AsciiRenderer(BaseRenderer):
@@ -33,6 +15,7 @@ class AsciiRenderer(BaseRenderer):
     _DIAG_UP = "/"
     _DIAG_DOWN = "\\"
     _DOUBLE = "="
+    _DOUBLE_VERTICAL = "="
     _TRIPLE = "#"
 
     def __init__(
@@ -41,6 +24,12 @@ class AsciiRenderer(BaseRenderer):
         height: int = -1,
         padding: int = 2,
         color: bool = True,
+        engine: DepictionEngine = "coordgen",
+        time_budget: float | None = None,
+        templates: ScaffoldTemplates | None = None,
+        preprocessor: Preprocessor | None = None,
+        color_mode: ColorMode = "ansi16",
+        bond_cells: int = AUTO_BOND_CELLS,
     ) -> None:
         """Initialize the ASCII renderer.
 
@@ -49,31 +38,38 @@ class AsciiRenderer(BaseRenderer):
             height: Canvas height in characters (-1 for auto).
             padding: Padding around the molecule in characters.
             color: Whether to colorize element symbols.
+            engine: Depiction engine used to generate coordinates.
+            time_budget: Seconds allowed for the depiction before falling
+                back to a faster engine (None for no limit).
+            templates: Scaffold templates to align molecules to.
+            preprocessor: Slims molecules before layout (None to lay out
+                molecules as given).
+            color_mode: "ansi16" for bright 16-color codes, or "ansi256" or
+                "truecolor" for the CPK theme.
+            bond_cells: Cells spanned by a median-length bond when the
+                canvas is sized automatically.
+
+        Raises:
+            ValueError: If the color mode is not recognized.
         """
-        super().__init__(width=width, height=height, padding=padding)
+        super().__init__(
+            width=width,
+            height=height,
+            padding=padding,
+            engine=engine,
+            time_budget=time_budget,
+            templates=templates,
+            preprocessor=preprocessor,
+            bond_cells=bond_cells,
+        )
         self.color = color
+        self.color_mode = color_mode
+        self._colors = get_color_engine(color_mode)
 
-    def _draw_atom(self, canvas: list[list[str]], x: int, y: int, symbol: str) -> None:
-        """Draw an atom symbol on the canvas with optional color.
+    def _color_engine(self) -> ColorEngine | None:
+        """Get the engine used to color labels.
 
-        Args:
-            canvas: The character canvas.
-            x: Canvas x coordinate.
-            y: Canvas y coordinate.
-            symbol: Element symbol to draw.
+        Returns:
+            The color engine, or None when color is disabled.
         """
-        if self.color and symbol in _ELEMENT_COLORS:
-            color_name = _ELEMENT_COLORS[symbol]
-            color_code = _COLORS[color_name]
-            reset_code = _COLORS["reset"]
-            # Apply color to the entire symbol
-            for i, char in enumerate(symbol[:2]):
-                px = x + i
-                if 0 <= y < self.height and 0 <= px < self.width:
-                    canvas[y][px] = f"{color_code}{char}{reset_code}"
-        else:
-            # Default behavior without color
-            for i, char in enumerate(symbol[:2]):
-                px = x + i
-                if 0 <= y < self.height and 0 <= px < self.width:
-                    canvas[y][px] = char
+        return self._colors if self.color else None
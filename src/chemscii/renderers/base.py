@@ -3,15 +3,43 @@
 from __future__ import annotations
 
 import math
+import shutil
+import sys
 from abc import ABC
+from collections.abc import Sequence
 
+import numpy as np
+import numpy.typing as npt
 from rdkit.Chem import Mol
 
-from chemscii.layout import AtomLayout, BondLayout
+from chemscii.layout import (
+    DepictionEngine,
+    LayoutResult,
+    Preprocessor,
+    ScaffoldTemplates,
+    compute_layout,
+)
+from chemscii.renderers.canvas import Canvas
+from chemscii.renderers.color import ColorEngine
+from chemscii.renderers.glyphs import BLANK, bond_glyphs
+
+# Canvas cells spanned by a typical bond when sizing the canvas automatically
+AUTO_BOND_CELLS = 6
+
+# Bond length used by RDKit depictions, for molecules without bonds
+_DEFAULT_BOND_LENGTH = 1.5
+
+# Smallest automatically sized canvas dimension
+_MIN_AUTO_SIZE = 10
 
 
 class BaseRenderer(ABC):
-    """Abstract base class for chemical structure renderers."""
+    """Abstract base class for chemical structure renderers.
+
+    A renderer only holds configuration. Canvas dimensions and drawing
+    state are worked out per call, so one instance can render many
+    molecules, including concurrently from several threads.
+    """
 
     # Bond characters - subclasses must define these
     _HORIZONTAL: str
@@ -19,21 +47,43 @@ class BaseRenderer(ABC):
     _DIAG_UP: str
     _DIAG_DOWN: str
     _DOUBLE: str
+    _DOUBLE_VERTICAL: str
     _TRIPLE: str
 
-    def __init__(self, width: int = -1, height: int = -1, padding: int = 2) -> None:
+    def __init__(
+        self,
+        width: int = -1,
+        height: int = -1,
+        padding: int = 2,
+        engine: DepictionEngine = "coordgen",
+        time_budget: float | None = None,
+        templates: ScaffoldTemplates | None = None,
+        preprocessor: Preprocessor | None = None,
+        bond_cells: int = AUTO_BOND_CELLS,
+    ) -> None:
         """Initialize the renderer.
 
         Args:
             width: Canvas width in characters (-1 for auto).
             height: Canvas height in characters (-1 for auto).
             padding: Padding around the molecule in characters.
+            engine: Depiction engine used to generate coordinates.
+            time_budget: Seconds allowed for the depiction before falling
+                back to a faster engine (None for no limit).
+            templates: Scaffold templates to align molecules to.
+            preprocessor: Slims molecules before layout (None to lay out
+                molecules as given).
+            bond_cells: Cells spanned by a median-length bond when the
+                canvas is sized automatically.
         """
-        self._auto_width = width == -1
         self.width = width
-        self._auto_height = height == -1
         self.height = height
         self.padding = padding
+        self.engine = engine
+        self.time_budget = time_budget
+        self.templates = templates
+        self.preprocessor = preprocessor
+        self.bond_cells = bond_cells
 
     def render_molecule(self, mol: Mol) -> str:
         """Render a molecule as text art.
@@ -44,15 +94,77 @@ class BaseRenderer(ABC):
         Returns:
             Text art representation of the molecule.
         """
-        atom_layout = AtomLayout(mol)
-        atom_positions = atom_layout.compute_positions()
-        bond_layout = BondLayout(mol, atom_positions)
-        bond_lines = bond_layout.compute_bond_lines()
-        atom_symbols = atom_layout.get_symbols()
-        txt = self.render(atom_positions, bond_lines, atom_symbols)
+        if self.preprocessor is not None:
+            mol = self.preprocessor.process(mol)
+        layout = compute_layout(mol, self.engine, self.time_budget, self.templates)
+        txt = self.render_layout(layout)
         print(txt)
         return txt
 
+    def render_layout(self, layout: LayoutResult) -> str:
+        """Render a precomputed layout as text art.
+
+        Args:
+            layout: Layout result from compute_layout().
+
+        Returns:
+            Text art representation of the molecule.
+        """
+        return self.render_canvas(self.rasterize(layout))
+
+    def rasterize(self, layout: LayoutResult, canvas: Canvas | None = None) -> Canvas:
+        """Rasterize a precomputed layout into glyph classes.
+
+        The canvas depends only on the renderer geometry (width, height and
+        padding), so it can be written out by any character renderer.
+
+        Args:
+            layout: Layout result from compute_layout().
+            canvas: Canvas or canvas view to draw into, replacing the
+                configured size (None to create a new canvas).
+
+        Returns:
+            The rasterized canvas.
+        """
+        return self._rasterize_arrays(
+            layout.coords,
+            layout.segments(),
+            layout.bonds[:, 2],
+            layout.symbols,
+            canvas,
+        )
+
+    def render_canvas(self, canvas: Canvas) -> str:
+        """Write out a rasterized canvas in this renderer's character set.
+
+        Args:
+            canvas: Canvas from rasterize().
+
+        Returns:
+            Text art representation of the canvas.
+        """
+        rows: list[list[str]] = np.array(self._charset())[canvas.glyphs].tolist()
+        for x, y, symbol in canvas.labels:
+            self._draw_atom(rows, x, y, symbol)
+
+        colors = self._color_engine()
+        if colors is None:
+            return "\n".join("".join(row).rstrip() for row in rows).rstrip()
+
+        # Color each label's cells in the attribute plane
+        attributes = np.zeros(canvas.glyphs.shape, dtype=np.uint8)
+        for x, y, symbol in canvas.labels:
+            attributes[y, x : x + len(symbol)] = colors.attribute(symbol)
+        return colors.render(rows, attributes)
+
+    def _color_engine(self) -> ColorEngine | None:
+        """Get the engine used to color labels.
+
+        Returns:
+            The color engine, or None for plain output.
+        """
+        return None
+
     def render(
         self,
         atom_positions: list[tuple[float, float]],
@@ -69,60 +181,179 @@ class BaseRenderer(ABC):
         Returns:
             Text art representation of the molecule.
         """
-        if not atom_positions:
-            return ""
+        coords = np.asarray(atom_positions, dtype=np.float64).reshape(-1, 2)
+        segments = np.array(
+            [(*start, *end) for start, end, _ in bond_lines], dtype=np.float64
+        ).reshape(-1, 4)
+        orders = np.array([order for _, _, order in bond_lines], dtype=np.int32)
+        return self._render_arrays(coords, segments, orders, atom_symbols)
+
+    def _render_arrays(
+        self,
+        coords: npt.NDArray[np.float64],
+        segments: npt.NDArray[np.float64],
+        orders: npt.NDArray[np.int32],
+        atom_symbols: Sequence[str],
+    ) -> str:
+        """Render atom coordinates and bond segments as text art.
+
+        Args:
+            coords: N x 2 array of atom coordinates.
+            segments: M x 4 array of (x1, y1, x2, y2) bond coordinates.
+            orders: Length M array of bond orders.
+            atom_symbols: Element symbol for each atom.
+
+        Returns:
+            Text art representation of the molecule.
+        """
+        return self.render_canvas(
+            self._rasterize_arrays(coords, segments, orders, atom_symbols)
+        )
 
-        if self._auto_width:
-            self.width = max(len(atom_positions) * 4, 10)
-        if self._auto_height:
-            self.height = max(len(atom_positions) * 4, 10)
+    def _rasterize_arrays(
+        self,
+        coords: npt.NDArray[np.float64],
+        segments: npt.NDArray[np.float64],
+        orders: npt.NDArray[np.int32],
+        atom_symbols: Sequence[str],
+        canvas: Canvas | None = None,
+    ) -> Canvas:
+        """Rasterize atom coordinates and bond segments into glyph classes.
 
-        # Create canvas
-        canvas = [[" " for _ in range(self.width)] for _ in range(self.height)]
+        Args:
+            coords: N x 2 array of atom coordinates.
+            segments: M x 4 array of (x1, y1, x2, y2) bond coordinates.
+            orders: Length M array of bond orders.
+            atom_symbols: Element symbol for each atom.
+            canvas: Canvas to draw into (None to create one).
+
+        Returns:
+            The rasterized canvas.
+        """
+        if canvas is None:
+            if not len(coords):
+                return Canvas(0, 0)
+            # Create canvas
+            canvas = Canvas(*self._canvas_size(coords, segments, atom_symbols))
+        elif not len(coords):
+            return canvas
 
         # Calculate transformation from molecular coords to canvas coords
-        transform = self._compute_transform(atom_positions)
+        transform = self._compute_transform(coords, canvas.width, canvas.height)
 
         # Draw bonds first (so atoms overlay them)
-        for start, end, order in bond_lines:
-            self._draw_bond(canvas, start, end, order, transform)
+        self._draw_bonds(canvas, segments, orders, transform)
 
-        # Draw atoms
-        for i, (x, y) in enumerate(atom_positions):
-            cx, cy = self._transform_point(x, y, transform)
-            if 0 <= cy < self.height and 0 <= cx < self.width:
+        # Place atom labels
+        xs, ys = self._transform_points(canvas, coords, transform)
+        for i, (cx, cy) in enumerate(zip(xs.tolist(), ys.tolist())):
+            if canvas.contains(cx, cy):
                 symbol = atom_symbols[i] if i < len(atom_symbols) else "?"
-                self._draw_atom(canvas, cx, cy, symbol)
+                canvas.add_label(cx, cy, symbol)
+
+        return canvas
+
+    def _canvas_size(
+        self,
+        coords: npt.NDArray[np.float64],
+        segments: npt.NDArray[np.float64],
+        atom_symbols: Sequence[str],
+    ) -> tuple[int, int]:
+        """Get the canvas dimensions for a molecule.
 
-        # Convert canvas to string
-        return "\n".join("".join(row).rstrip() for row in canvas).rstrip()
+        Args:
+            coords: N x 2 array of atom coordinates.
+            segments: M x 4 array of (x1, y1, x2, y2) bond coordinates.
+            atom_symbols: Element symbol for each atom.
+
+        Returns:
+            Tuple of (width, height) in characters, using the configured
+            size where set and the automatic size otherwise.
+        """
+        width, height = self.width, self.height
+        if width == -1 or height == -1:
+            auto_width, auto_height = self._auto_size(coords, segments, atom_symbols)
+            if width == -1:
+                width = auto_width
+            if height == -1:
+                height = auto_height
+        return (width, height)
+
+    def _auto_size(
+        self,
+        coords: npt.NDArray[np.float64],
+        segments: npt.NDArray[np.float64],
+        atom_symbols: Sequence[str],
+    ) -> tuple[int, int]:
+        """Compute canvas dimensions from the molecule geometry.
+
+        The canvas is sized so that a median-length bond spans bond_cells
+        cells, so its area scales with the drawn structure rather
+        than with the atom count. When writing to a terminal, the width is
+        capped at the terminal width.
+
+        Args:
+            coords: N x 2 array of atom coordinates.
+            segments: M x 4 array of (x1, y1, x2, y2) bond coordinates.
+            atom_symbols: Element symbol for each atom.
+
+        Returns:
+            Tuple of (width, height) in characters.
+        """
+        lengths = np.hypot(
+            segments[:, 2] - segments[:, 0], segments[:, 3] - segments[:, 1]
+        )
+        lengths = lengths[lengths > 0]
+        bond_length = (
+            float(np.median(lengths)) if len(lengths) else _DEFAULT_BOND_LENGTH
+        )
+        scale = self.bond_cells / bond_length
+
+        mol_width, mol_height = np.ptp(coords, axis=0).tolist()
+        label_overhang = max((len(s) for s in atom_symbols), default=1) - 1
+
+        width = math.ceil(mol_width * scale) + 2 * self.padding + 3 + label_overhang
+        height = math.ceil(mol_height * scale) + 2 * self.padding + 1
+
+        if sys.stdout.isatty():
+            width = min(width, shutil.get_terminal_size().columns)
+
+        return (max(width, _MIN_AUTO_SIZE), max(height, _MIN_AUTO_SIZE))
 
     def _compute_transform(
-        self, positions: list[tuple[float, float]]
+        self,
+        positions: npt.ArrayLike,
+        width: int | None = None,
+        height: int | None = None,
     ) -> tuple[float, float, float, float]:
         """Compute transformation parameters from molecular to canvas coords.
 
         Args:
-            positions: List of (x, y) molecular coordinates.
+            positions: N x 2 array or list of (x, y) molecular coordinates.
+            width: Canvas width in characters (None for the configured width).
+            height: Canvas height in characters (None for the configured
+                height).
 
         Returns:
             Tuple of (scale, offset_x, offset_y, reserved).
         """
-        if not positions:
+        coords = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if not len(coords):
             return (1.0, 0.0, 0.0, 1.0)
 
-        xs = [p[0] for p in positions]
-        ys = [p[1] for p in positions]
-
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
+        min_x, min_y = coords.min(axis=0).tolist()
+        max_x, max_y = coords.max(axis=0).tolist()
 
         mol_width = max_x - min_x
         mol_height = max_y - min_y
 
         # Available canvas space (accounting for padding and atom labels)
-        avail_width = self.width - 2 * self.padding - 2
-        avail_height = self.height - 2 * self.padding
+        if width is None:
+            width = self.width
+        if height is None:
+            height = self.height
+        avail_width = width - 2 * self.padding - 2
+        avail_height = height - 2 * self.padding
 
         # Calculate scale to fit molecule in canvas
         if mol_width > 0 and mol_height > 0:
@@ -144,82 +375,119 @@ class BaseRenderer(ABC):
 
         return (scale, offset_x, offset_y, 1.0)
 
-    def _transform_point(
-        self, x: float, y: float, transform: tuple[float, float, float, float]
-    ) -> tuple[int, int]:
+    def _transform_points(
+        self,
+        canvas: Canvas,
+        points: npt.NDArray[np.float64],
+        transform: tuple[float, float, float, float],
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
         """Transform molecular coordinates to canvas coordinates.
 
         Args:
-            x: Molecular x coordinate.
-            y: Molecular y coordinate.
+            canvas: The canvas being drawn.
+            points: N x 2 array of molecular (x, y) coordinates.
             transform: Transformation parameters.
 
         Returns:
-            Canvas (x, y) coordinates as integers.
+            Tuple of canvas x and y coordinate arrays.
         """
         scale, offset_x, offset_y, _ = transform
-        cx = int(round(x * scale + offset_x))
+        cx = np.rint(points[:, 0] * scale + offset_x).astype(np.intp)
         # Flip y-axis (canvas y increases downward)
-        cy = int(round(self.height - 1 - (y * scale + offset_y)))
+        cy = np.rint(canvas.height - 1 - (points[:, 1] * scale + offset_y)).astype(
+            np.intp
+        )
         return (cx, cy)
 
-    def _draw_atom(self, canvas: list[list[str]], x: int, y: int, symbol: str) -> None:
-        """Draw an atom symbol on the canvas.
+    def _draw_atom(self, rows: list[list[str]], x: int, y: int, symbol: str) -> None:
+        """Draw an atom symbol into the output characters.
 
         Args:
-            canvas: The character canvas.
+            rows: Output characters, one list per canvas row.
             x: Canvas x coordinate.
             y: Canvas y coordinate.
-            symbol: Element symbol to draw.
+            symbol: Element symbol or superatom label to draw.
         """
-        # Draw the symbol (up to 2 characters)
-        for i, char in enumerate(symbol[:2]):
+        # Draw the symbol, including multi-character superatom labels
+        for i, char in enumerate(symbol):
             px = x + i
-            if 0 <= y < self.height and 0 <= px < self.width:
-                canvas[y][px] = char
+            if 0 <= y < len(rows) and 0 <= px < len(rows[y]):
+                rows[y][px] = char
 
-    def _draw_bond(
+    def _draw_bonds(
         self,
-        canvas: list[list[str]],
-        start: tuple[float, float],
-        end: tuple[float, float],
-        order: int,
+        canvas: Canvas,
+        segments: npt.NDArray[np.float64],
+        orders: npt.NDArray[np.int32],
         transform: tuple[float, float, float, float],
     ) -> None:
-        """Draw a bond line on the canvas.
+        """Draw bond lines on the canvas.
+
+        All bonds are rasterized in one pass: the cells along every line are
+        computed together, and a cell keeps the glyph of the first bond that
+        reaches it.
 
         Args:
-            canvas: The character canvas.
-            start: Starting molecular coordinates.
-            end: Ending molecular coordinates.
-            order: Bond order (1, 2, or 3).
+            canvas: The canvas being drawn.
+            segments: M x 4 array of (x1, y1, x2, y2) molecular coordinates.
+            orders: Length M array of bond orders (1, 2, or 3).
             transform: Transformation parameters.
         """
-        x1, y1 = self._transform_point(start[0], start[1], transform)
-        x2, y2 = self._transform_point(end[0], end[1], transform)
+        if not len(segments):
+            return
+
+        x1, y1 = self._transform_points(canvas, segments[:, 0:2], transform)
+        x2, y2 = self._transform_points(canvas, segments[:, 2:4], transform)
 
         # Use Bresenham-like line drawing
         dx = x2 - x1
         dy = y2 - y1
-        steps = max(abs(dx), abs(dy))
-
-        if steps == 0:
+        steps = np.maximum(np.abs(dx), np.abs(dy))
+        drawn = np.flatnonzero(steps > 0)
+        if not len(drawn):
             return
 
-        # Determine bond character based on angle
-        angle = math.atan2(dy, dx)
-        bond_char = self._get_bond_char(angle, order)
+        # Determine bond glyph based on angle
+        classes = bond_glyphs(
+            np.arctan2(dy[drawn], dx[drawn]), np.asarray(orders)[drawn]
+        )
+
+        # Sample every bond at each step along its longest axis
+        counts = steps[drawn] + 1
+        bond_idx = np.repeat(np.arange(len(drawn)), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        t = (np.arange(len(bond_idx)) - starts) / steps[drawn][bond_idx]
+        src = drawn[bond_idx]
+        xs = np.rint(x1[src] + dx[src] * t).astype(np.intp)
+        ys = np.rint(y1[src] + dy[src] * t).astype(np.intp)
+
+        inside = (xs >= 0) & (xs < canvas.width) & (ys >= 0) & (ys < canvas.height)
+        xs, ys, bond_idx = xs[inside], ys[inside], bond_idx[inside]
+
+        # Earlier bonds win where lines cross
+        _, first = np.unique(ys * canvas.width + xs, return_index=True)
+        xs, ys, cell_classes = xs[first], ys[first], classes[bond_idx[first]]
+        # Don't overwrite existing atom labels
+        blank = canvas.glyphs[ys, xs] == BLANK
+        canvas.glyphs[ys[blank], xs[blank]] = cell_classes[blank]
+
+    def _charset(self) -> tuple[str, ...]:
+        """Get the character drawn for each glyph class.
 
-        # Draw line
-        for i in range(steps + 1):
-            t = i / steps if steps > 0 else 0
-            x = int(round(x1 + dx * t))
-            y = int(round(y1 + dy * t))
-
-            if 0 <= y < self.height and 0 <= x < self.width:
-                # Don't overwrite existing atom symbols
-                if canvas[y][x] == " ":
-                    canvas[y][x] = bond_char
+        Returns:
+            Characters indexed by glyph class.
+        """
+        return (
+            " ",
+            self._HORIZONTAL,
+            self._VERTICAL,
+            self._DIAG_UP,
+            self._DIAG_DOWN,
+            self._DOUBLE,
+            self._DOUBLE_VERTICAL,
+            self._TRIPLE,
+            " ",
+        )
 
     def _get_bond_char(self, angle: float, order: int) -> str:
         """Get the appropriate bond character for an angle.
@@ -231,20 +499,5 @@ class BaseRenderer(ABC):
         Returns:
             Character to use for the bond.
         """
-        if order == 2:
-            return self._DOUBLE
-        elif order == 3:
-            return self._TRIPLE
-
-        # Normalize angle to [0, pi)
-        angle = angle % math.pi
-
-        # Determine character based on angle
-        if angle < math.pi / 8 or angle >= 7 * math.pi / 8:
-            return self._HORIZONTAL
-        elif angle < 3 * math.pi / 8:
-            return self._DIAG_DOWN
-        elif angle < 5 * math.pi / 8:
-            return self._VERTICAL
-        else:
-            return self._DIAG_UP
+        glyph = bond_glyphs(np.array([angle]), np.array([order], dtype=np.int32))
+        return self._charset()[int(glyph[0])]
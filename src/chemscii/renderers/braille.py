@@ -0,0 +1,215 @@
+"""Braille subpixel renderer for chemical structures."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from chemscii.layout import LayoutResult
+from chemscii.renderers.base import _MIN_AUTO_SIZE, BaseRenderer
+
+# Dots per character cell
+_DOTS_X = 2
+_DOTS_Y = 4
+
+# Bit of each dot in a braille code point, indexed by [row, column]
+_DOT_BITS = np.array(
+    [[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]], dtype=np.uint8
+)
+
+# Character for every 8-dot pattern, with the empty pattern as a space
+_BRAILLE = np.array([" "] + [chr(0x2800 + code) for code in range(1, 256)])
+
+# Perpendicular offsets of the parallel strokes of each bond order, in dots
+_BOND_OFFSETS: dict[int, tuple[float, ...]] = {
+    1: (0.0,),
+    2: (-1.0, 1.0),
+    3: (-2.0, 0.0, 2.0),
+}
+
+
+class BrailleRenderer(BaseRenderer):
+    """Renders chemical structures as lines of braille dots.
+
+    Each character cell holds a 2 x 4 grid of dots, so bonds are drawn at
+    eight times the resolution of the character renderers. Bond segments
+    are rasterized straight from the layout onto a dot bitmap, and atom
+    labels are written over it. Carbon atoms with bonds are left unlabeled,
+    as in skeletal formulas.
+    """
+
+    # Single-cell patterns used when drawing from a glyph canvas
+    _HORIZONTAL = "⠒"
+    _VERTICAL = "⡇"
+    _DIAG_UP = "⠔"
+    _DIAG_DOWN = "⠑"
+    _DOUBLE = "⠶"
+    _DOUBLE_VERTICAL = "⣿"
+    _TRIPLE = "⠿"
+
+    def render_layout(self, layout: LayoutResult) -> str:
+        """Render a precomputed layout as braille art.
+
+        Args:
+            layout: Layout result from compute_layout().
+
+        Returns:
+            Braille art representation of the molecule.
+        """
+        return self._render_arrays(
+            layout.coords, layout.segments(), layout.bonds[:, 2], layout.symbols
+        )
+
+    def _render_arrays(
+        self,
+        coords: npt.NDArray[np.float64],
+        segments: npt.NDArray[np.float64],
+        orders: npt.NDArray[np.int32],
+        atom_symbols: Sequence[str],
+    ) -> str:
+        """Render atom coordinates and bond segments as braille art.
+
+        Args:
+            coords: N x 2 array of atom coordinates.
+            segments: M x 4 array of (x1, y1, x2, y2) bond coordinates.
+            orders: Length M array of bond orders.
+            atom_symbols: Element symbol for each atom.
+
+        Returns:
+            Braille art representation of the molecule.
+        """
+        if not len(coords):
+            return ""
+
+        width, height = self._canvas_size(coords, segments, atom_symbols)
+
+        # Dots are square while cells are twice as tall as wide, so halving
+        # y before fitting the cell transform keeps the molecule undistorted
+        squash = np.array([1.0, 0.5])
+        transform = self._compute_transform(coords * squash, width, height)
+
+        dots = np.zeros((height * _DOTS_Y, width * _DOTS_X), dtype=bool)
+        start = self._to_dots(segments[:, 0:2] * squash, transform, height)
+        end = self._to_dots(segments[:, 2:4] * squash, transform, height)
+        self._draw_segments(dots, start, end, np.asarray(orders))
+
+        # Pack each 4 x 2 block of dots into one braille code point
+        blocks = dots.reshape(height, _DOTS_Y, width, _DOTS_X)
+        codes = np.einsum("iyjx,yx->ij", blocks.astype(np.uint8), _DOT_BITS)
+        rows: list[list[str]] = _BRAILLE[codes].tolist()
+
+        # Overlay atom labels
+        endpoints = {tuple(p) for p in segments.reshape(-1, 2).tolist()}
+        centers = self._to_dots(coords * squash, transform, height)
+        cells = np.floor(centers / (_DOTS_X, _DOTS_Y)).astype(np.intp)
+        for i, ((cx, cy), point) in enumerate(zip(cells.tolist(), coords.tolist())):
+            symbol = atom_symbols[i] if i < len(atom_symbols) else "?"
+            if symbol == "C" and tuple(point) in endpoints:
+                continue
+            self._draw_atom(rows, cx, cy, symbol)
+
+        return "\n".join("".join(row).rstrip() for row in rows).rstrip()
+
+    def _auto_size(
+        self,
+        coords: npt.NDArray[np.float64],
+        segments: npt.NDArray[np.float64],
+        atom_symbols: Sequence[str],
+    ) -> tuple[int, int]:
+        """Compute canvas dimensions from the molecule geometry.
+
+        Args:
+            coords: N x 2 array of atom coordinates.
+            segments: M x 4 array of (x1, y1, x2, y2) bond coordinates.
+            atom_symbols: Element symbol for each atom.
+
+        Returns:
+            Tuple of (width, height) in characters.
+        """
+        width, height = super()._auto_size(coords, segments, atom_symbols)
+        # Square dots make the molecule span half as many rows
+        margin = 2 * self.padding + 1
+        return (width, max(math.ceil((height - margin) / 2) + margin, _MIN_AUTO_SIZE))
+
+    def _to_dots(
+        self,
+        points: npt.NDArray[np.float64],
+        transform: tuple[float, float, float, float],
+        height: int,
+    ) -> npt.NDArray[np.float64]:
+        """Transform coordinates to dot positions.
+
+        Args:
+            points: N x 2 array of (x, y) coordinates, already squashed.
+            transform: Transformation parameters for the character canvas.
+            height: Canvas height in characters.
+
+        Returns:
+            N x 2 array of (x, y) dot positions, with cell centers where the
+            character renderers would place each point.
+        """
+        scale, offset_x, offset_y, _ = transform
+        cell_x = points[:, 0] * scale + offset_x
+        # Flip y-axis (canvas y increases downward)
+        cell_y = height - 1 - (points[:, 1] * scale + offset_y)
+        return np.column_stack(
+            (
+                (cell_x + 0.5) * _DOTS_X,
+                (cell_y + 0.5) * _DOTS_Y,
+            )
+        )
+
+    def _draw_segments(
+        self,
+        dots: npt.NDArray[np.bool_],
+        start: npt.NDArray[np.float64],
+        end: npt.NDArray[np.float64],
+        orders: npt.NDArray[np.int32],
+    ) -> None:
+        """Rasterize bond segments onto the dot bitmap.
+
+        Multiple bonds are drawn as parallel strokes. All strokes are
+        sampled together, one sample per dot along their longest axis.
+
+        Args:
+            dots: Dot bitmap to draw into.
+            start: M x 2 array of bond start positions in dots.
+            end: M x 2 array of bond end positions in dots.
+            orders: Length M array of bond orders.
+        """
+        if not len(start):
+            return
+
+        # Expand every bond into its parallel strokes
+        delta = end - start
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        normal = np.zeros_like(delta)
+        drawn = length > 0
+        normal[drawn] = delta[drawn][:, ::-1] * (-1.0, 1.0) / length[drawn, None]
+        stroke_starts, stroke_ends = [], []
+        for order, offsets in _BOND_OFFSETS.items():
+            selected = np.flatnonzero(np.clip(orders, 1, 3) == order)
+            for offset in offsets:
+                shift = normal[selected] * offset
+                stroke_starts.append(start[selected] + shift)
+                stroke_ends.append(end[selected] + shift)
+        p0 = np.concatenate(stroke_starts) - 0.5
+        p1 = np.concatenate(stroke_ends) - 0.5
+
+        steps = np.ceil(np.abs(p1 - p0).max(axis=1)).astype(np.intp)
+        counts = steps + 1
+        stroke_idx = np.repeat(np.arange(len(p0)), counts)
+        offsets_in = np.arange(len(stroke_idx)) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        t = offsets_in / np.maximum(steps, 1)[stroke_idx]
+        points = p0[stroke_idx] + (p1 - p0)[stroke_idx] * t[:, None]
+        xs = np.rint(points[:, 0]).astype(np.intp)
+        ys = np.rint(points[:, 1]).astype(np.intp)
+
+        rows, cols = dots.shape
+        inside = (xs >= 0) & (xs < cols) & (ys >= 0) & (ys < rows)
+        dots[ys[inside], xs[inside]] = True
@@ -0,0 +1,91 @@
+"""Glyph canvas used for a single render."""
+
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+from chemscii.renderers.glyphs import BLANK, LABEL
+
+
+class Canvas:
+    """Grid of glyph classes drawn by one render call.
+
+    The canvas records what is drawn in each cell (a bond direction, a
+    label, or nothing) rather than the character itself, so the same
+    raster can be written out in any character set. Atom labels are kept
+    alongside the grid in drawing order.
+
+    Renderers create a fresh canvas for every molecule and keep no drawing
+    state of their own, so a single renderer can be shared between threads.
+    """
+
+    __slots__ = ("width", "height", "glyphs", "labels", "origin")
+
+    def __init__(self, width: int, height: int) -> None:
+        """Initialize a blank canvas.
+
+        Args:
+            width: Canvas width in characters.
+            height: Canvas height in characters.
+        """
+        self.width = width
+        self.height = height
+        self.glyphs: npt.NDArray[np.uint8] = np.full(
+            (height, width), BLANK, dtype=np.uint8
+        )
+        self.labels: list[tuple[int, int, str]] = []
+        # Position of this canvas within the canvas that owns the labels
+        self.origin = (0, 0)
+
+    def view(self, x: int, y: int, width: int, height: int) -> Canvas:
+        """Get a rectangular region of the canvas to draw into.
+
+        The view shares glyphs and labels with this canvas, so drawing into
+        it draws directly onto this canvas without any copying.
+
+        Args:
+            x: Left column of the region.
+            y: Top row of the region.
+            width: Region width in characters.
+            height: Region height in characters.
+
+        Returns:
+            A canvas backed by the region.
+        """
+        view = Canvas(0, 0)
+        view.glyphs = self.glyphs[y : y + height, x : x + width]
+        view.height, view.width = view.glyphs.shape
+        view.labels = self.labels
+        view.origin = (self.origin[0] + x, self.origin[1] + y)
+        return view
+
+    def contains(self, x: int, y: int) -> bool:
+        """Check whether a cell lies on the canvas.
+
+        Args:
+            x: Canvas x coordinate.
+            y: Canvas y coordinate.
+
+        Returns:
+            True if the cell is inside the canvas.
+        """
+        return 0 <= y < self.height and 0 <= x < self.width
+
+    def add_label(self, x: int, y: int, symbol: str) -> None:
+        """Place a label starting at a cell.
+
+        Labels running past the right edge are cut off there, so they do
+        not spill into neighbouring views.
+
+        Args:
+            x: Canvas x coordinate of the first character.
+            y: Canvas y coordinate.
+            symbol: Element symbol, superatom label or other text.
+        """
+        if not self.contains(x, y):
+            return
+        if x + len(symbol) > self.width:
+            symbol = symbol[: self.width - x]
+        self.glyphs[y, x : x + len(symbol)] = LABEL
+        self.labels.append((self.origin[0] + x, self.origin[1] + y, symbol))
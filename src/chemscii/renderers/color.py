@@ -0,0 +1,158 @@
+"""ANSI color output for element labels."""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+ColorMode = Literal["ansi16", "ansi256", "truecolor"]
+
+COLOR_MODES: tuple[ColorMode, ...] = ("ansi16", "ansi256", "truecolor")
+
+_RESET = "\033[0m"
+
+# Bright 16-color codes for the most common heteroatoms
+_ANSI16_COLORS: dict[str, int] = {
+    "O": 91,
+    "N": 94,
+    "S": 93,
+    "F": 96,
+    "Cl": 96,
+    "Br": 96,
+    "I": 96,
+}
+
+# CPK (Jmol) element colors. Carbon and hydrogen are left in the terminal's
+# default foreground, which is what they are drawn against in dark mode.
+_CPK_COLORS: dict[str, tuple[int, int, int]] = {
+    "N": (48, 80, 248),
+    "O": (255, 13, 13),
+    "F": (144, 224, 80),
+    "Cl": (31, 240, 31),
+    "Br": (166, 41, 41),
+    "I": (148, 0, 148),
+    "S": (255, 255, 48),
+    "P": (255, 128, 0),
+    "B": (255, 181, 181),
+    "Si": (240, 200, 160),
+    "Se": (255, 161, 0),
+    "Li": (204, 128, 255),
+    "Na": (171, 92, 242),
+    "K": (143, 64, 212),
+    "Mg": (138, 255, 0),
+    "Ca": (61, 255, 0),
+    "Fe": (224, 102, 51),
+    "Cu": (200, 128, 51),
+    "Zn": (125, 128, 176),
+}
+
+# Channel levels of the xterm 256-color cube
+_XTERM_LEVELS = np.array([0, 95, 135, 175, 215, 255])
+
+
+def _xterm_index(rgb: tuple[int, int, int]) -> int:
+    """Find the nearest xterm 256-color cube entry.
+
+    Args:
+        rgb: Red, green and blue channel values (0-255).
+
+    Returns:
+        Color index in the 6 x 6 x 6 cube (16-231).
+    """
+    r, g, b = (int(np.abs(_XTERM_LEVELS - c).argmin()) for c in rgb)
+    return 16 + 36 * r + 6 * g + b
+
+
+class ColorEngine:
+    """Writes text with colored runs from a per-cell attribute plane.
+
+    Each distinct color is an attribute index (0 for the default color).
+    Renderers fill an attribute plane alongside their characters, and the
+    engine emits one escape sequence per run of same-colored cells instead
+    of one per character.
+    """
+
+    def __init__(self, mode: ColorMode = "ansi16") -> None:
+        """Initialize the engine.
+
+        Args:
+            mode: "ansi16" for bright 16-color codes, or "ansi256" or
+                "truecolor" for the CPK theme.
+
+        Raises:
+            ValueError: If the mode is not recognized.
+        """
+        if mode == "ansi16":
+            colors = {el: f"\033[{code}m" for el, code in _ANSI16_COLORS.items()}
+        elif mode == "ansi256":
+            colors = {
+                el: f"\033[38;5;{_xterm_index(rgb)}m" for el, rgb in _CPK_COLORS.items()
+            }
+        elif mode == "truecolor":
+            colors = {
+                el: f"\033[38;2;{r};{g};{b}m" for el, (r, g, b) in _CPK_COLORS.items()
+            }
+        else:
+            raise ValueError(
+                f"Unknown color mode: {mode!r} "
+                f"(expected one of {', '.join(COLOR_MODES)})"
+            )
+
+        self.mode = mode
+        self._escapes = [""] + sorted(set(colors.values()))
+        self._attributes = {
+            el: self._escapes.index(escape) for el, escape in colors.items()
+        }
+
+    def attribute(self, symbol: str) -> int:
+        """Get the attribute index for a label.
+
+        Args:
+            symbol: Element symbol or superatom label.
+
+        Returns:
+            Attribute index, 0 for labels drawn in the default color.
+        """
+        return self._attributes.get(symbol, 0)
+
+    def render(self, rows: list[list[str]], attributes: npt.NDArray[np.uint8]) -> str:
+        """Join characters into text, coloring runs of equal attributes.
+
+        Args:
+            rows: Output characters, one list per row.
+            attributes: Attribute index of every cell, same shape as rows.
+
+        Returns:
+            The text with trailing whitespace removed.
+        """
+        lines = []
+        for row, attrs in zip(rows, attributes):
+            length = len("".join(row).rstrip())
+            attrs = attrs[:length]
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(attrs)) + 1))
+            ends = np.concatenate((starts[1:], [length]))
+            parts = []
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                if start >= end:
+                    continue
+                text = "".join(row[start:end])
+                escape = self._escapes[attrs[start]]
+                parts.append(f"{escape}{text}{_RESET}" if escape else text)
+            lines.append("".join(parts))
+        return "\n".join(lines).rstrip()
+
+
+@cache
+def get_color_engine(mode: ColorMode) -> ColorEngine:
+    """Get the shared color engine for a color mode.
+
+    Args:
+        mode: Color mode.
+
+    Returns:
+        The color engine, created on first use.
+    """
+    return ColorEngine(mode)
@@ -0,0 +1,103 @@
+"""Compact text output sized to a character budget."""
+
+from __future__ import annotations
+
+import re
+
+from chemscii.layout import LayoutResult
+from chemscii.renderers.ascii import AsciiRenderer
+from chemscii.renderers.base import BaseRenderer
+
+# Matches CSI escape sequences such as ANSI color codes
+_ANSI_ESCAPE = re.compile(r"\033\[[0-9;?]*[A-Za-z]")
+
+# Cells spanned by a median bond in compact output, the smallest scale at
+# which double bonds and ring diagonals stay distinct
+_COMPACT_BOND_CELLS = 3
+
+# Cells spanned by a median bond when the compact scale is over budget.
+# Below two cells, diagonal bonds can no longer be told apart from labels.
+_MIN_BOND_CELLS = 2
+
+# Padding that keeps labels at the edge of the molecule on the canvas; the
+# blank margin is trimmed from the output afterwards
+_PADDING = 1
+
+
+def strip_ansi(text: str) -> str:
+    """Remove ANSI escape sequences from text.
+
+    Args:
+        text: Text that may contain escape sequences.
+
+    Returns:
+        The text without escape sequences.
+    """
+    return _ANSI_ESCAPE.sub("", text)
+
+
+def trim_margins(text: str) -> str:
+    """Remove blank rows and columns around text art.
+
+    Args:
+        text: Text art, one row per line.
+
+    Returns:
+        The text with leading and trailing blank lines, trailing spaces and
+        the common leading indentation removed.
+    """
+    lines = [line.rstrip() for line in text.splitlines()]
+    while lines and not lines[0]:
+        lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+    indent = min((len(line) - len(line.lstrip()) for line in lines if line), default=0)
+    return "\n".join(line[indent:] for line in lines)
+
+
+def _plain_renderer(renderer_type: type[BaseRenderer], bond_cells: int) -> BaseRenderer:
+    """Create an auto-sized renderer that writes no escape codes.
+
+    Args:
+        renderer_type: Character renderer class.
+        bond_cells: Cells spanned by a median-length bond.
+
+    Returns:
+        The renderer, with color turned off where it is supported.
+    """
+    if issubclass(renderer_type, AsciiRenderer):
+        return renderer_type(padding=_PADDING, color=False, bond_cells=bond_cells)
+    return renderer_type(padding=_PADDING, bond_cells=bond_cells)
+
+
+def render_compact(
+    layout: LayoutResult,
+    renderer_type: type[BaseRenderer],
+    max_chars: int,
+) -> str:
+    """Render a layout as plain text that fits a character budget.
+
+    The molecule is drawn at the smallest bond scale that keeps it
+    legible, and at a still smaller one if that does not fit the budget.
+    Labels are not colored and blank margins are removed, so every
+    character of the result is part of the drawing.
+
+    Args:
+        layout: Layout result from compute_layout().
+        renderer_type: Character renderer class used to draw the layout.
+        max_chars: Largest number of characters wanted in the output.
+
+    Returns:
+        Text art of the molecule. It is longer than max_chars only when the
+        smallest scale does not fit the budget.
+    """
+    if not len(layout):
+        return ""
+
+    txt = ""
+    for bond_cells in (_COMPACT_BOND_CELLS, _MIN_BOND_CELLS):
+        renderer = _plain_renderer(renderer_type, bond_cells)
+        txt = trim_margins(renderer.render_layout(layout))
+        if len(txt) <= max_chars:
+            break
+    return txt
@@ -0,0 +1,49 @@
+"""RDKit raster drawing shared by the image-based renderers."""
+
+from __future__ import annotations
+
+from rdkit import Chem
+from rdkit.Chem import Mol
+from rdkit.Chem.Draw import rdMolDraw2D
+
+from chemscii.layout import DepictionEngine, ScaffoldTemplates, compute_2d_coords
+
+
+def draw_molecule_png(
+    mol: Mol,
+    size: tuple[int, int] = (300, 300),
+    engine: DepictionEngine = "coordgen",
+    time_budget: float | None = None,
+    templates: ScaffoldTemplates | None = None,
+) -> bytes:
+    """Draw a molecule as a dark-mode PNG image.
+
+    Args:
+        mol: An RDKit Mol object, which is left unchanged.
+        size: Width and height of the image in pixels.
+        engine: Depiction engine used to generate coordinates.
+        time_budget: Seconds allowed for the depiction before falling back
+            to a faster engine (None for no limit).
+        templates: Scaffold templates to align the molecule to.
+
+    Returns:
+        PNG image data.
+    """
+    # Standardize a copy of the molecule
+    mol = Chem.Mol(mol)
+    compute_2d_coords(mol, engine, time_budget, templates)
+    Chem.Kekulize(mol)
+
+    # Generate image. Drawers are not pooled: constructing and configuring
+    # one takes tens of microseconds against milliseconds of drawing, and a
+    # drawer reused after ClearDrawing() keeps the scale fitted to the first
+    # molecule it drew, so later molecules come out clipped or shrunken.
+    drawer = rdMolDraw2D.MolDraw2DCairo(*size)
+    rdMolDraw2D.SetDarkMode(drawer)
+    drawer.drawOptions().padding = 0.0
+    drawer.drawOptions().bondLineWidth = 5
+    drawer.drawOptions().minFontSize = 20
+    drawer.DrawMolecule(mol)
+    drawer.FinishDrawing()
+    png: bytes = drawer.GetDrawingText()
+    return png
@@ -0,0 +1,48 @@
+"""Glyph classes shared by the character renderers."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import numpy.typing as npt
+
+# Glyph classes stored in a Canvas; each renderer maps them to characters
+BLANK = 0
+HORIZONTAL = 1
+VERTICAL = 2
+DIAG_UP = 3
+DIAG_DOWN = 4
+DOUBLE = 5
+DOUBLE_VERTICAL = 6
+TRIPLE = 7
+LABEL = 8
+
+# Number of glyph classes, i.e. the length of a renderer charset
+GLYPH_COUNT = 9
+
+
+def bond_glyphs(
+    angles: npt.NDArray[np.float64], orders: npt.NDArray[np.int32]
+) -> npt.NDArray[np.uint8]:
+    """Classify bonds by the glyph used to draw them.
+
+    Args:
+        angles: Bond angles in radians, in canvas orientation.
+        orders: Bond orders (1, 2, or 3).
+
+    Returns:
+        Glyph class for each bond.
+    """
+    # Normalize angles to [0, pi)
+    norm = np.mod(angles, math.pi)
+    horizontal = (norm < math.pi / 8) | (norm >= 7 * math.pi / 8)
+    vertical = (norm >= 3 * math.pi / 8) & (norm < 5 * math.pi / 8)
+    single = np.select(
+        [horizontal, norm < 3 * math.pi / 8, vertical],
+        [HORIZONTAL, DIAG_DOWN, VERTICAL],
+        default=DIAG_UP,
+    )
+    double = np.where(vertical, DOUBLE_VERTICAL, DOUBLE)
+    glyphs = np.select([orders == 3, orders == 2], [TRIPLE, double], default=single)
+    return glyphs.astype(np.uint8)
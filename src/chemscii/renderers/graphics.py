@@ -0,0 +1,244 @@
+"""Inline terminal graphics renderer for chemical structures."""
+
+from __future__ import annotations
+
+import base64
+import io
+from functools import cache
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+from rdkit.Chem import Mol
+
+from chemscii.layout import DepictionEngine, Preprocessor, ScaffoldTemplates
+from chemscii.renderers.drawing import draw_molecule_png
+
+GraphicsProtocol = Literal["kitty", "sixel"]
+
+GRAPHICS_PROTOCOLS: tuple[GraphicsProtocol, ...] = ("kitty", "sixel")
+
+# Largest base64 payload the Kitty protocol accepts in one escape sequence
+_KITTY_CHUNK = 4096
+
+# Rows of pixels encoded by one line of sixel characters
+_SIXEL_BAND = 6
+
+# Shortest run of a repeated sixel written with a repeat introducer
+_SIXEL_MIN_REPEAT = 4
+
+# Palette register of the black drawing background, left transparent
+_SIXEL_BACKGROUND = 0
+
+
+def _sixel_palette() -> list[tuple[int, int, int]]:
+    """Build the fixed sixel palette.
+
+    Returns:
+        A 6 x 6 x 6 color cube followed by a 24-step gray ramp, starting
+        with black.
+    """
+    levels = [0, 51, 102, 153, 204, 255]
+    cube = [(r, g, b) for r in levels for g in levels for b in levels]
+    grays = [(v, v, v) for v in range(8, 248, 10)]
+    return cube + grays
+
+
+class KittyEncoder:
+    """Encodes PNG images with the Kitty terminal graphics protocol."""
+
+    def encode_png(self, png: bytes) -> str:
+        """Encode a PNG image for display.
+
+        Args:
+            png: PNG image data.
+
+        Returns:
+            Escape sequences that display the image at the cursor.
+        """
+        payload = base64.standard_b64encode(png).decode("ascii")
+        chunks = [
+            payload[i : i + _KITTY_CHUNK] for i in range(0, len(payload), _KITTY_CHUNK)
+        ] or [""]
+        parts = []
+        for i, chunk in enumerate(chunks):
+            more = int(i < len(chunks) - 1)
+            control = f"a=T,f=100,m={more}" if i == 0 else f"m={more}"
+            parts.append(f"\033_G{control};{chunk}\033\\")
+        return "".join(parts)
+
+
+class SixelEncoder:
+    """Encodes images as Sixel graphics with a fixed palette.
+
+    The palette and its color register definitions are built once and
+    shared, so encoding an image only quantizes and packs its pixels.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the encoder and its palette."""
+        colors = _sixel_palette()
+        self._palette = Image.new("P", (1, 1))
+        self._palette.putpalette([c for rgb in colors for c in rgb])
+        self._color_defs = [
+            f"#{i};2;{round(r * 100 / 255)};{round(g * 100 / 255)};"
+            f"{round(b * 100 / 255)}"
+            for i, (r, g, b) in enumerate(colors)
+        ]
+        self._weights = (1 << np.arange(_SIXEL_BAND)).reshape(-1, 1)
+
+    def encode_png(self, png: bytes) -> str:
+        """Encode a PNG image for display.
+
+        Args:
+            png: PNG image data.
+
+        Returns:
+            Sixel escape sequence that displays the image at the cursor.
+        """
+        return self.encode(Image.open(io.BytesIO(png)))
+
+    def encode(self, image: Image.Image) -> str:
+        """Encode an image for display.
+
+        Args:
+            image: PIL image in any mode.
+
+        Returns:
+            Sixel escape sequence that displays the image at the cursor.
+        """
+        indexed = image.convert("RGB").quantize(
+            palette=self._palette, dither=Image.Dither.NONE
+        )
+        pixels = np.asarray(indexed, dtype=np.uint8)
+        height, width = pixels.shape
+        pad = -height % _SIXEL_BAND
+        if pad:
+            pixels = np.vstack(
+                (pixels, np.full((pad, width), _SIXEL_BACKGROUND, dtype=np.uint8))
+            )
+
+        used = np.unique(pixels)
+        used = used[used != _SIXEL_BACKGROUND]
+        parts = [
+            # P2=1 leaves unset pixels showing the terminal background
+            "\033P0;1;0q",
+            f'"1;1;{width};{height}',
+            "".join(self._color_defs[i] for i in used.tolist()),
+        ]
+
+        bands = []
+        for band in pixels.reshape(-1, _SIXEL_BAND, width):
+            colors = np.unique(band)
+            rows = []
+            for color in colors[colors != _SIXEL_BACKGROUND].tolist():
+                bits = ((band == color) * self._weights).sum(axis=0)
+                last = int(np.flatnonzero(bits)[-1])
+                rows.append(f"#{color}{_run_length(bits[: last + 1] + 63)}")
+            bands.append("$".join(rows))
+        parts.append("-".join(bands))
+        parts.append("\033\\")
+        return "".join(parts)
+
+
+def _run_length(codes: npt.NDArray[np.int64]) -> str:
+    """Write sixel codes with repeated runs compressed.
+
+    Args:
+        codes: Sixel character codes for one color of one band.
+
+    Returns:
+        Sixel data for the codes.
+    """
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+    lengths = np.diff(np.concatenate((starts, [len(codes)])))
+    parts = []
+    for start, length in zip(starts.tolist(), lengths.tolist()):
+        char = chr(int(codes[start]))
+        if length >= _SIXEL_MIN_REPEAT:
+            parts.append(f"!{length}{char}")
+        else:
+            parts.append(char * length)
+    return "".join(parts)
+
+
+@cache
+def get_encoder(protocol: GraphicsProtocol) -> KittyEncoder | SixelEncoder:
+    """Get the shared encoder for a graphics protocol.
+
+    Args:
+        protocol: Terminal graphics protocol.
+
+    Returns:
+        The encoder, created on first use.
+
+    Raises:
+        ValueError: If the protocol is not recognized.
+    """
+    if protocol == "kitty":
+        return KittyEncoder()
+    if protocol == "sixel":
+        return SixelEncoder()
+    raise ValueError(
+        f"Unknown graphics protocol: {protocol!r} "
+        f"(expected one of {', '.join(GRAPHICS_PROTOCOLS)})"
+    )
+
+
+class GraphicsRenderer:
+    """Renders chemical structures as inline terminal graphics.
+
+    The RDKit drawing is encoded directly for terminals that support the
+    Kitty graphics protocol or Sixel, with no conversion to characters.
+    """
+
+    def __init__(
+        self,
+        protocol: GraphicsProtocol = "kitty",
+        size: tuple[int, int] = (300, 300),
+        engine: DepictionEngine = "coordgen",
+        time_budget: float | None = None,
+        templates: ScaffoldTemplates | None = None,
+        preprocessor: Preprocessor | None = None,
+    ) -> None:
+        """Initialize the renderer.
+
+        Args:
+            protocol: Terminal graphics protocol: "kitty" or "sixel".
+            size: Width and height of the image in pixels.
+            engine: Depiction engine used to generate coordinates.
+            time_budget: Seconds allowed for the depiction before falling
+                back to a faster engine (None for no limit).
+            templates: Scaffold templates to align molecules to.
+            preprocessor: Slims molecules before layout (None to lay out
+                molecules as given).
+
+        Raises:
+            ValueError: If the protocol is not recognized.
+        """
+        self.protocol = protocol
+        self.size = size
+        self.engine = engine
+        self.time_budget = time_budget
+        self.templates = templates
+        self.preprocessor = preprocessor
+        self._encoder = get_encoder(protocol)
+
+    def render_molecule(self, mol: Mol) -> str:
+        """Render a molecule as terminal graphics.
+
+        Args:
+            mol: An RDKit Mol object.
+
+        Returns:
+            Escape sequences that display the molecule image.
+        """
+        if self.preprocessor is not None:
+            mol = self.preprocessor.process(mol)
+        png = draw_molecule_png(
+            mol, self.size, self.engine, self.time_budget, self.templates
+        )
+        txt = self._encoder.encode_png(png)
+        print(txt)
+        return txt
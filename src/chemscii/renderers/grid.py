@@ -0,0 +1,117 @@
+"""Grid renderer for many molecules in one canvas."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+from rdkit.Chem import Mol
+
+from chemscii.layout import LayoutResult, compute_layouts
+from chemscii.renderers.base import BaseRenderer
+from chemscii.renderers.braille import BrailleRenderer
+from chemscii.renderers.canvas import Canvas
+from chemscii.renderers.unicode import UnicodeRenderer
+
+
+class GridRenderer:
+    """Renders molecules side by side in fixed-size cells of one canvas.
+
+    Layouts are computed in worker processes, then every molecule is
+    rasterized into its own view of a single shared canvas, which is
+    written out once. The cell renderer provides the cell size, character
+    set and depiction settings.
+    """
+
+    def __init__(
+        self,
+        renderer: BaseRenderer | None = None,
+        mols_per_row: int = 4,
+        workers: int | None = None,
+    ) -> None:
+        """Initialize the grid renderer.
+
+        Args:
+            renderer: Renderer used for each cell; its width and height set
+                the cell size (None for a 30 x 12 Unicode renderer).
+            mols_per_row: Number of molecules in each row of the grid.
+            workers: Number of processes used to compute layouts (None for
+                one per CPU, 1 to compute them in this process).
+
+        Raises:
+            TypeError: If the cell renderer draws braille, which does not
+                share the glyph canvas of the grid.
+            ValueError: If the cell renderer uses automatic sizing or
+                mols_per_row is not positive.
+        """
+        if renderer is None:
+            renderer = UnicodeRenderer(width=30, height=12)
+        if isinstance(renderer, BrailleRenderer):
+            raise TypeError("Grid cells cannot be drawn by a BrailleRenderer")
+        if renderer.width == -1 or renderer.height == -1:
+            raise ValueError("Grid cells need a fixed renderer width and height")
+        if mols_per_row < 1:
+            raise ValueError(f"mols_per_row must be positive, got {mols_per_row}")
+        self.renderer = renderer
+        self.mols_per_row = mols_per_row
+        self.workers = workers
+
+    def render_molecules(
+        self, mols: Sequence[Mol], legends: Sequence[str] | None = None
+    ) -> str:
+        """Render molecules as a grid.
+
+        Args:
+            mols: RDKit Mol objects, drawn left to right, top to bottom.
+            legends: Text drawn under each cell (None for no legends).
+
+        Returns:
+            Text art of the grid.
+        """
+        preprocessor = self.renderer.preprocessor
+        if preprocessor is not None:
+            mols = [preprocessor.process(mol) for mol in mols]
+        layouts = compute_layouts(
+            mols,
+            self.renderer.engine,
+            self.renderer.time_budget,
+            self.renderer.templates,
+            self.workers,
+        )
+        txt = self.render_layouts(layouts, legends)
+        print(txt)
+        return txt
+
+    def render_layouts(
+        self, layouts: Sequence[LayoutResult], legends: Sequence[str] | None = None
+    ) -> str:
+        """Render precomputed layouts as a grid.
+
+        Args:
+            layouts: Layout results from compute_layout().
+            legends: Text drawn under each cell (None for no legends).
+
+        Returns:
+            Text art of the grid.
+        """
+        if not layouts:
+            return ""
+
+        cell_width = self.renderer.width
+        cell_height = self.renderer.height
+        row_height = cell_height + (1 if legends is not None else 0)
+        columns = min(len(layouts), self.mols_per_row)
+        rows = math.ceil(len(layouts) / self.mols_per_row)
+
+        canvas = Canvas(columns * cell_width, rows * row_height)
+        for i, layout in enumerate(layouts):
+            x = (i % self.mols_per_row) * cell_width
+            y = (i // self.mols_per_row) * row_height
+            self.renderer.rasterize(layout, canvas.view(x, y, cell_width, cell_height))
+            if legends is not None and i < len(legends):
+                legend = legends[i][:cell_width]
+                canvas.add_label(
+                    x + (cell_width - len(legend)) // 2, y + cell_height, legend
+                )
+
+        return self.renderer.render_canvas(canvas)
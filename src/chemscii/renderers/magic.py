@@ -6,8 +6,10 @@ import io
 
 from ascii_magic import AsciiArt
 from PIL import Image
-from rdkit.Chem import Kekulize, Mol, rdDepictor
-from rdkit.Chem.Draw import rdMolDraw2D
+from rdkit.Chem import Mol
+
+from chemscii.layout import DepictionEngine, Preprocessor, ScaffoldTemplates
+from chemscii.renderers.drawing import draw_molecule_png
 
 
 class AsciiMagicRenderer:
@@ -17,15 +19,33 @@ class AsciiMagicRenderer:
     the image to ASCII art using the ascii_magic library.
     """
 
-    def __init__(self, columns: int = 120, codes: bool = True) -> None:
+    def __init__(
+        self,
+        columns: int = 120,
+        codes: bool = True,
+        engine: DepictionEngine = "coordgen",
+        time_budget: float | None = None,
+        templates: ScaffoldTemplates | None = None,
+        preprocessor: Preprocessor | None = None,
+    ) -> None:
         """Initialize the renderer.
 
         Args:
             columns: Width of the ASCII art output in characters.
             codes: Include escape codes.
+            engine: Depiction engine used to generate coordinates.
+            time_budget: Seconds allowed for the depiction before falling
+                back to a faster engine (None for no limit).
+            templates: Scaffold templates to align molecules to.
+            preprocessor: Slims molecules before layout (None to lay out
+                molecules as given).
         """
         self.columns = columns
         self.codes = codes
+        self.engine = engine
+        self.time_budget = time_budget
+        self.templates = templates
+        self.preprocessor = preprocessor
 
     def render_molecule(self, mol: Mol) -> str:
         """Render a molecule as ASCII art.
@@ -36,6 +56,8 @@ class AsciiMagicRenderer:
         Returns:
             ASCII art representation of the molecule.
         """
+        if self.preprocessor is not None:
+            mol = self.preprocessor.process(mol)
         img = self._mol_to_image(mol)
         art = AsciiArt.from_pillow_image(img)
         if self.codes:
@@ -51,24 +73,13 @@ class AsciiMagicRenderer:
         """Convert a molecule to a PIL Image.
 
         Args:
-            mol: An RDKit Mol object.
+            mol: An RDKit Mol object, which is left unchanged.
             mol_size: Width and height of the output image in pixels.
 
         Returns:
             PIL Image of the rendered molecule.
         """
-        # Standardize molecule
-        Kekulize(mol)
-        rdDepictor.SetPreferCoordGen(True)
-        rdDepictor.Compute2DCoords(mol, useRingTemplates=True)
-
-        # Geneate image
-        drawer = rdMolDraw2D.MolDraw2DCairo(*mol_size)
-        rdMolDraw2D.SetDarkMode(drawer)
-        drawer.drawOptions().padding = 0.0
-        drawer.drawOptions().bondLineWidth = 5
-        drawer.drawOptions().minFontSize = 20
-        drawer.DrawMolecule(mol)
-        drawer.FinishDrawing()
-        bio = io.BytesIO(drawer.GetDrawingText())
-        return Image.open(bio)
+        png = draw_molecule_png(
+            mol, mol_size, self.engine, self.time_budget, self.templates
+        )
+        return Image.open(io.BytesIO(png))
@@ -0,0 +1,124 @@
+"""Renderer producing several character sets from one layout."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from rdkit.Chem import Mol
+
+from chemscii.layout import (
+    DepictionEngine,
+    LayoutResult,
+    Preprocessor,
+    ScaffoldTemplates,
+    compute_layout,
+)
+from chemscii.renderers.ascii import AsciiRenderer
+from chemscii.renderers.base import BaseRenderer
+from chemscii.renderers.color import ColorMode
+from chemscii.renderers.unicode import UnicodeRenderer
+
+# Character renderers that can share a rasterized canvas, by format name
+RENDER_FORMATS: dict[str, type[BaseRenderer]] = {
+    "ascii": AsciiRenderer,
+    "unicode": UnicodeRenderer,
+}
+
+
+class MultiRenderer:
+    """Renders a molecule to several character sets in a single pass.
+
+    The layout, canvas transform and bond rasterization are computed once;
+    each format then only maps the shared glyph grid to its own characters.
+    """
+
+    def __init__(
+        self,
+        formats: Sequence[str] = ("ascii", "unicode"),
+        width: int = -1,
+        height: int = -1,
+        padding: int = 2,
+        color: bool = True,
+        engine: DepictionEngine = "coordgen",
+        time_budget: float | None = None,
+        templates: ScaffoldTemplates | None = None,
+        preprocessor: Preprocessor | None = None,
+        color_mode: ColorMode = "ansi16",
+    ) -> None:
+        """Initialize the renderer.
+
+        Args:
+            formats: Output formats to produce, from RENDER_FORMATS.
+            width: Canvas width in characters (-1 for auto).
+            height: Canvas height in characters (-1 for auto).
+            padding: Padding around the molecule in characters.
+            color: Whether to colorize element symbols in ASCII output.
+            engine: Depiction engine used to generate coordinates.
+            time_budget: Seconds allowed for the depiction before falling
+                back to a faster engine (None for no limit).
+            templates: Scaffold templates to align molecules to.
+            preprocessor: Slims molecules before layout (None to lay out
+                molecules as given).
+            color_mode: "ansi16" for bright 16-color codes, or "ansi256" or
+                "truecolor" for the CPK theme, in ASCII output.
+
+        Raises:
+            ValueError: If no formats are given, or a format or the color
+                mode of ASCII output is not recognized.
+        """
+        if not formats:
+            raise ValueError("At least one render format is required")
+        unknown = [fmt for fmt in formats if fmt not in RENDER_FORMATS]
+        if unknown:
+            raise ValueError(
+                f"Unknown render format: {', '.join(unknown)} "
+                f"(expected one of {', '.join(RENDER_FORMATS)})"
+            )
+
+        self.engine = engine
+        self.time_budget = time_budget
+        self.templates = templates
+        self.preprocessor = preprocessor
+        self.renderers: dict[str, BaseRenderer] = {}
+        for fmt in formats:
+            if fmt == "ascii":
+                self.renderers[fmt] = AsciiRenderer(
+                    width=width,
+                    height=height,
+                    padding=padding,
+                    color=color,
+                    color_mode=color_mode,
+                )
+            else:
+                self.renderers[fmt] = RENDER_FORMATS[fmt](
+                    width=width, height=height, padding=padding
+                )
+
+    def render_molecule(self, mol: Mol) -> dict[str, str]:
+        """Render a molecule in every configured format.
+
+        Args:
+            mol: An RDKit Mol object.
+
+        Returns:
+            Text art for each format, keyed by format name.
+        """
+        if self.preprocessor is not None:
+            mol = self.preprocessor.process(mol)
+        layout = compute_layout(mol, self.engine, self.time_budget, self.templates)
+        results = self.render_layout(layout)
+        print("\n\n".join(results.values()))
+        return results
+
+    def render_layout(self, layout: LayoutResult) -> dict[str, str]:
+        """Render a precomputed layout in every configured format.
+
+        Args:
+            layout: Layout result from compute_layout().
+
+        Returns:
+            Text art for each format, keyed by format name.
+        """
+        # All renderers share the same geometry, so any can rasterize
+        canvas = next(iter(self.renderers.values())).rasterize(layout)
+        return {fmt: r.render_canvas(canvas) for fmt, r in self.renderers.items()}
@@ -17,6 +17,16 @@ ETHENE = "C=C"  # Double bond
 ETHYNE = "C#C"  # Triple bond
 CYCLOHEXANE = "C1CCCCC1"  # Ring
 
+# Molecules with salt and solvent fragments
+AMINE_SALT = "CCN.Cl"  # Ethylamine hydrochloride
+SODIUM_ACETATE_HYDRATE = "CC(=O)[O-].[Na+].O"
+MIXTURE = "c1ccccc1.CCO"  # Largest fragment is benzene
+
+# Boc-protected peptide with a PEG linker, for abbreviation
+BOC_PEPTIDE = (
+    "CC(C)(C)OC(=O)NCC(=O)NC(C)C(=O)NC(Cc1ccccc1)C(=O)NC(CO)C(=O)NCCOCCOCCOCCOCCN"
+)
+
 # Test cases dict for parametrized testing
 SMILES_TEST_CASES = {
     "ethanol": ETHANOL,
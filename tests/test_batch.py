@@ -0,0 +1,111 @@
+"""Tests for deduplicated batch rendering."""
+
+from __future__ import annotations
+
+import pytest
+from rdkit import Chem
+
+from chemscii.batch import BatchRenderer, canonical_key
+from chemscii.layout import compute_layout
+from chemscii.layout.preprocess import Preprocessor
+from chemscii.renderers.ascii import AsciiRenderer
+
+
+class TestCanonicalKey:
+    """Tests for structure identity keys."""
+
+    def test_smiles_spellings_match(self) -> None:
+        """Test that different SMILES of one structure share a key."""
+        a = canonical_key(Chem.MolFromSmiles("OCC"))
+        b = canonical_key(Chem.MolFromSmiles("C(O)C"))
+        assert a == b == "CCO"
+
+    def test_inchikey(self) -> None:
+        """Test that the InChIKey key gives the standard InChIKey."""
+        key = canonical_key(Chem.MolFromSmiles("CCO"), "inchikey")
+        assert key == "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"
+
+    def test_inchikey_fallback(self) -> None:
+        """Test that structures InChI cannot encode get distinct keys."""
+        a = canonical_key(Chem.MolFromSmiles("*CC"), "inchikey")
+        b = canonical_key(Chem.MolFromSmiles("*c1ccccc1CCCCN"), "inchikey")
+        assert a and b and a != b
+
+    def test_unknown_key(self) -> None:
+        """Test that an unknown key type raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown dedup key"):
+            canonical_key(Chem.MolFromSmiles("C"), "name")  # type: ignore[arg-type]
+
+
+class TestBatchRenderer:
+    """Tests for rendering with result fan-out."""
+
+    def test_duplicates_rendered_once(self) -> None:
+        """Test that repeated structures are laid out a single time."""
+        batch = BatchRenderer(AsciiRenderer(), workers=1)
+        result = batch.render_smiles(["CCO", "c1ccccc1", "OCC", "C(O)C"])
+        assert len(result) == 4
+        assert result.unique == 2
+        assert result.texts[0] == result.texts[2] == result.texts[3]
+        assert result.keys == ["CCO", "c1ccccc1", "CCO", "CCO"]
+
+    def test_matches_single_rendering(self) -> None:
+        """Test that fanned-out text equals rendering each record alone."""
+        renderer = AsciiRenderer()
+        result = BatchRenderer(renderer, workers=1).render_smiles(["OCC", "CCN"])
+        for smiles, text in zip(["OCC", "CCN"], result.texts):
+            layout = compute_layout(Chem.MolFromSmiles(smiles))
+            assert text == renderer.render_layout(layout)
+
+    def test_salt_forms_merged(self) -> None:
+        """Test that salt forms dedup when the preprocessor strips salts."""
+        renderer = AsciiRenderer(preprocessor=Preprocessor(strip_salts=True))
+        result = BatchRenderer(renderer, workers=1).render_smiles(
+            ["CC(=O)O", "CC(=O)O.[Na+].[Cl-]"]
+        )
+        assert result.unique == 1
+        assert result.texts[0] == result.texts[1]
+
+    def test_invalid_smiles(self) -> None:
+        """Test that unparsable records give None in place."""
+        result = BatchRenderer(AsciiRenderer(), workers=1).render_smiles(
+            ["CCO", "not smiles", ""]
+        )
+        assert result.texts[0] is not None
+        assert result.texts[1:] == [None, None]
+        assert result.keys[1:] == [None, None]
+        assert result.unique == 1
+
+    def test_dedup_disabled(self) -> None:
+        """Test that key=None renders every record."""
+        batch = BatchRenderer(AsciiRenderer(), key=None, workers=1)
+        result = batch.render_smiles(["CCO", "OCC"])
+        assert result.unique == 2
+        assert result.keys == [None, None]
+        assert result.texts[0] == result.texts[1]
+
+    def test_inchikey_dedup(self) -> None:
+        """Test deduplication on InChIKeys."""
+        batch = BatchRenderer(AsciiRenderer(), key="inchikey", workers=1)
+        result = batch.render_smiles(["CCO", "OCC", "CCC"])
+        assert result.unique == 2
+        assert result.keys[0] == result.keys[1] != result.keys[2]
+
+    def test_inchikey_dummy_atoms(self) -> None:
+        """Test that structures with dummy atoms are not merged."""
+        batch = BatchRenderer(AsciiRenderer(), key="inchikey", workers=1)
+        result = batch.render_smiles(["*CC", "*c1ccccc1CCCCN", "CC*"])
+        assert result.unique == 2
+        assert result.texts[0] != result.texts[1]
+        assert result.keys[0] == result.keys[2]
+
+    def test_unknown_key(self) -> None:
+        """Test that an unknown key type raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown dedup key"):
+            BatchRenderer(key="name")  # type: ignore[arg-type]
+
+    def test_empty(self) -> None:
+        """Test that an empty batch gives an empty result."""
+        result = BatchRenderer(workers=1).render_smiles([])
+        assert len(result) == 0
+        assert result.unique == 0
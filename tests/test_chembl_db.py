@@ -0,0 +1,152 @@
+"""Tests for the local ChEMBL database backend."""
+
+from __future__ import annotations
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from chemscii.parsers.chembl import chembl_to_smiles
+from chemscii.parsers.chembl_db import (
+    CHEMBL_DB_ENV,
+    ChemblDatabase,
+    default_chembl_database,
+)
+
+# (molregno, chembl_id, canonical_smiles or None for no structure)
+_COMPOUNDS = [
+    (1, "CHEMBL1", "c1ccccc1"),
+    (2, "CHEMBL112", "CC(=O)Nc1ccc(O)cc1"),
+    (3, "CHEMBL3", None),
+] + [(10 + i, f"CHEMBL9{i:04d}", "C" * (1 + i % 7)) for i in range(1200)]
+
+# Standard InChIKeys of the fixture compounds that have one
+_INCHIKEYS = {
+    "CHEMBL1": "UHOVQNZJYSORNB-UHFFFAOYSA-N",
+    "CHEMBL112": "RZVAJINKPMORJF-UHFFFAOYSA-N",
+}
+
+
+@pytest.fixture  # type: ignore[misc]
+def db_path(tmp_path: Path) -> Path:
+    """Build a tiny database with the ChEMBL tables used for lookups."""
+    path = tmp_path / "chembl.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE molecule_dictionary (
+            molregno INTEGER PRIMARY KEY, chembl_id TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE compound_structures (
+            molregno INTEGER PRIMARY KEY,
+            canonical_smiles TEXT,
+            standard_inchi_key TEXT
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO molecule_dictionary VALUES (?, ?)",
+        [(molregno, chembl_id) for molregno, chembl_id, _ in _COMPOUNDS],
+    )
+    conn.executemany(
+        "INSERT INTO compound_structures VALUES (?, ?, ?)",
+        [
+            (molregno, smiles, _INCHIKEYS.get(chembl_id))
+            for molregno, chembl_id, smiles in _COMPOUNDS
+            if smiles
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestChemblDatabase:
+    """Tests for database lookups."""
+
+    def test_lookup(self, db_path: Path) -> None:
+        """Test looking up one compound, in any case."""
+        database = ChemblDatabase(db_path)
+        assert database.lookup("CHEMBL112") == "CC(=O)Nc1ccc(O)cc1"
+        assert database.lookup(" chembl112 ") == "CC(=O)Nc1ccc(O)cc1"
+
+    def test_lookup_missing(self, db_path: Path) -> None:
+        """Test unknown IDs and compounds without a structure."""
+        database = ChemblDatabase(db_path)
+        assert database.lookup("CHEMBL404") is None
+        assert database.lookup("CHEMBL3") is None
+
+    def test_lookup_many_spans_chunks(self, db_path: Path) -> None:
+        """Test a bulk lookup larger than one IN clause."""
+        database = ChemblDatabase(db_path)
+        ids = [chembl_id for _, chembl_id, _ in _COMPOUNDS] + ["CHEMBL404"]
+        found = database.lookup_many(ids)
+        assert len(found) == len(_COMPOUNDS) - 1
+        assert found["CHEMBL91199"] == "C" * (1 + 1199 % 7)
+        assert "CHEMBL3" not in found
+        assert database.lookup_many([]) == {}
+
+    def test_lookup_inchikeys(self, db_path: Path) -> None:
+        """Test a bulk InChIKey lookup, in any case."""
+        database = ChemblDatabase(db_path)
+        found = database.lookup_inchikeys(
+            ["rzvajinkpmorjf-uhfffaoysa-n", "UHOVQNZJYSORNB-UHFFFAOYSA-N", "X"]
+        )
+        assert found == {
+            "RZVAJINKPMORJF-UHFFFAOYSA-N": "CC(=O)Nc1ccc(O)cc1",
+            "UHOVQNZJYSORNB-UHFFFAOYSA-N": "c1ccccc1",
+        }
+
+    def test_read_only(self, db_path: Path) -> None:
+        """Test that connections cannot write to the database."""
+        database = ChemblDatabase(db_path)
+        with database._connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM molecule_dictionary")
+
+    def test_pool_reuses_connections(self, db_path: Path) -> None:
+        """Test that concurrent lookups share at most pool_size connections."""
+        database = ChemblDatabase(db_path, pool_size=2)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(database.lookup, ["CHEMBL112"] * 64))
+        assert set(results) == {"CC(=O)Nc1ccc(O)cc1"}
+        assert database._opened <= 2
+        database.close()
+        assert database._opened == 0
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing database misses instead of creating one."""
+        database = ChemblDatabase(tmp_path / "absent.db")
+        assert database.lookup("CHEMBL25") is None
+        assert database.lookup_inchikeys(["LFQSCWFLJHTTHZ-UHFFFAOYSA-N"]) == {}
+        assert not (tmp_path / "absent.db").exists()
+        assert database._opened == 0
+
+    def test_not_a_database(self, tmp_path: Path) -> None:
+        """Test that a file that is not SQLite misses."""
+        path = tmp_path / "chembl.db"
+        path.write_bytes(b"not a database" * 100)
+        assert ChemblDatabase(path).lookup("CHEMBL25") is None
+
+
+class TestChemblToSmilesDatabase:
+    """Tests for ChEMBL lookup through the configured database."""
+
+    def test_uses_configured_database(
+        self, db_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that IDs missing from the cache come from the database."""
+        monkeypatch.setenv(CHEMBL_DB_ENV, str(db_path))
+        assert chembl_to_smiles("CHEMBL112", use_api=False) == "CC(=O)Nc1ccc(O)cc1"
+        assert chembl_to_smiles("CHEMBL404", use_api=False) is None
+
+    def test_missing_database_configured(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a missing configured database warns and is ignored."""
+        monkeypatch.setenv(CHEMBL_DB_ENV, str(tmp_path / "absent.db"))
+        with pytest.warns(UserWarning, match=CHEMBL_DB_ENV):
+            assert default_chembl_database() is None
+        assert chembl_to_smiles("CHEMBL999999", use_api=False) is None
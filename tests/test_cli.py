@@ -1,10 +1,14 @@
 """Tests for chemscii.cli module."""
 
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
 from typer.testing import CliRunner
 
-from chemscii.cli import app, detect_input_type, parse_input
+from chemscii.cli import app, detect_input_type, parse_input, parse_range
+from chemscii.parsers.remote import set_offline
+from chemscii.parsers.resolver import RemoteBackend, ResolverChain
 
 runner = CliRunner()
 
@@ -30,6 +34,13 @@ class TestDetectInputType:
         assert input_type == "smiles"
         assert value == "CCO"
 
+    def test_detect_smiles_longer_than_file_names(self) -> None:
+        """Test that inputs too long to be file names are still classified."""
+        smiles = "C" * 300
+        assert detect_input_type(smiles) == ("smiles", smiles)
+        inchi = "InChI=1S/C300H602/c" + "1" * 300
+        assert detect_input_type(inchi) == ("inchi", inchi)
+
     def test_detect_chembl_uppercase(self) -> None:
         """Test detection of uppercase ChEMBL ID."""
         input_type, value = detect_input_type("CHEMBL25")
@@ -75,6 +86,45 @@ class TestDetectInputType:
         input_type, value = detect_input_type("/nonexistent/path/molecule.sdf")
         assert input_type == "name"
 
+    def test_detect_inchi(self) -> None:
+        """Test detection of an InChI string."""
+        inchi = "InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3"
+        assert detect_input_type(inchi) == ("inchi", inchi)
+
+    def test_detect_inchikey(self) -> None:
+        """Test detection of an InChIKey, normalized to uppercase."""
+        input_type, value = detect_input_type("lfqscwfljhtthz-uhfffaoysa-n")
+        assert input_type == "inchikey"
+        assert value == "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"
+
+    def test_detect_cid(self) -> None:
+        """Test detection of a PubChem CID, normalized to its number."""
+        assert detect_input_type("CID2244") == ("cid", "2244")
+        assert detect_input_type("cid:0702") == ("cid", "702")
+
+    def test_detect_cas(self) -> None:
+        """Test detection of a CAS registry number."""
+        assert detect_input_type("64-17-5") == ("cas", "64-17-5")
+
+    def test_detect_multiword_name(self) -> None:
+        """Test that names with spaces are never parsed as SMILES."""
+        with patch("chemscii.cli.Chem.MolFromSmiles") as parse:
+            input_type, _ = detect_input_type("acetic acid")
+        assert input_type == "name"
+        parse.assert_not_called()
+
+    def test_detect_lowercase_name_skips_rdkit(self) -> None:
+        """Test that lowercase words outside SMILES grammar skip RDKit."""
+        with patch("chemscii.cli.Chem.MolFromSmiles") as parse:
+            input_type, _ = detect_input_type("ethanol")
+        assert input_type == "name"
+        parse.assert_not_called()
+
+    def test_detect_invalid_smiles_as_name(self) -> None:
+        """Test that plausible but invalid SMILES falls back to name."""
+        input_type, _ = detect_input_type("C1CC")
+        assert input_type == "name"
+
 
 class TestParseInput:
     """Tests for input parsing."""
@@ -108,6 +158,13 @@ class TestParseInput:
         # May return None for unknown names
         assert result is None or isinstance(result, str)
 
+    def test_parse_inchi_offline(self) -> None:
+        """Test that InChI input is converted without the network."""
+        with patch("chemscii.parsers.remote.request.urlopen") as urlopen:
+            result = parse_input("inchi", "InChI=1S/C6H6/c1-2-4-6-5-3-1/h1-6H")
+        assert result == "c1ccccc1"
+        urlopen.assert_not_called()
+
     def test_parse_sdf_file(self, tmp_path: Path) -> None:
         """Test parsing SDF file."""
         sdf_content = """
@@ -133,6 +190,46 @@ M  END
         result = parse_input("file", str(smi_file))
         assert result == "CCO"
 
+    def test_parse_smi_record(self, tmp_path: Path) -> None:
+        """Test reading one record of a SMILES file."""
+        smi_file = tmp_path / "molecules.smi"
+        smi_file.write_text("CCO ethanol\nc1ccccc1 benzene\nCCN\n")
+        assert parse_input("file", str(smi_file), record=1) == "c1ccccc1"
+        assert parse_input("file", str(smi_file), record=-1) == "CCN"
+        assert parse_input("file", str(smi_file), record=3) is None
+
+    def test_parse_smi_save_index(self, tmp_path: Path) -> None:
+        """Test that the line-offset index can be saved next to the file."""
+        smi_file = tmp_path / "molecules.smi"
+        smi_file.write_text("CCO ethanol\n")
+        parse_input("file", str(smi_file), save_index=True)
+        assert (tmp_path / "molecules.smi.idx.npy").exists()
+
+    def test_parse_csv_file(self, tmp_path: Path) -> None:
+        """Test reading a row of a CSV table."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("id,smiles\na,CCO\nb,CCN\n")
+        assert parse_input("file", str(csv_file)) == "CCO"
+        assert parse_input("file", str(csv_file), record=1) == "CCN"
+        assert parse_input("file", str(csv_file), record=2) is None
+
+
+class TestParseRange:
+    """Tests for record range parsing."""
+
+    def test_bounds(self) -> None:
+        """Test that either bound can be omitted or negative."""
+        assert parse_range("10:20") == (10, 20)
+        assert parse_range(":5") == (None, 5)
+        assert parse_range("-3:") == (-3, None)
+
+    def test_invalid(self) -> None:
+        """Test that ranges without a colon or integers raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_range("10")
+        with pytest.raises(ValueError):
+            parse_range("a:b")
+
 
 class TestCliMain:
     """Tests for main CLI command."""
@@ -155,12 +252,36 @@ class TestCliMain:
         assert result.exit_code == 0
         assert len(result.stdout) > 0
 
+    def test_render_truecolor(self) -> None:
+        """Test ASCII rendering with the true-color theme."""
+        result = runner.invoke(app, ["CCO", "--ascii", "--color-mode", "truecolor"])
+        assert result.exit_code == 0
+        assert "\033[38;2;" in result.stdout
+
+    def test_invalid_color_mode_error(self) -> None:
+        """Test error for an unknown color mode."""
+        result = runner.invoke(app, ["CCO", "--ascii", "--color-mode", "cga"])
+        assert result.exit_code == 1
+        assert "Unknown color mode" in result.stdout
+
     def test_render_unicode_mode(self) -> None:
         """Test Unicode renderer mode."""
         result = runner.invoke(app, ["CCO", "--unicode"])
         assert result.exit_code == 0
         assert len(result.stdout) > 0
 
+    def test_render_braille_mode(self) -> None:
+        """Test rendering with braille renderer."""
+        result = runner.invoke(app, ["CCO", "--braille"])
+        assert result.exit_code == 0
+        assert "O" in result.stdout
+
+    def test_render_graphics_mode(self) -> None:
+        """Test rendering inline Kitty graphics."""
+        result = runner.invoke(app, ["CCO", "--graphics", "kitty"])
+        assert result.exit_code == 0
+        assert "\033_G" in result.stdout
+
     def test_render_magic_mode(self) -> None:
         """Test Magic renderer mode (default)."""
         result = runner.invoke(app, ["CCO", "--magic"])
@@ -185,6 +306,70 @@ class TestCliMain:
         )
         assert result.exit_code == 0
 
+    def test_scaffold(self) -> None:
+        """Test aligning the depiction to a scaffold."""
+        result = runner.invoke(
+            app, ["Nc1ccccc1", "--unicode", "--scaffold", "c1ccccc1"]
+        )
+        assert result.exit_code == 0
+        assert "N" in result.stdout
+
+    def test_strip_salts(self) -> None:
+        """Test stripping salts before rendering."""
+        result = runner.invoke(app, ["CCN.Cl", "--ascii", "--strip-salts"])
+        assert result.exit_code == 0
+        assert "Cl" not in result.stdout
+
+    def test_strip_salts_by_default(self) -> None:
+        """Test that salts are stripped unless kept, as in Preprocessor."""
+        result = runner.invoke(app, ["CCN.Cl", "--ascii"])
+        assert result.exit_code == 0
+        assert "Cl" not in result.stdout
+        result = runner.invoke(app, ["CCN.Cl", "--ascii", "--keep-salts"])
+        assert result.exit_code == 0
+        assert "Cl" in result.stdout
+
+    def test_abbreviate(self) -> None:
+        """Test abbreviating groups before rendering."""
+        result = runner.invoke(
+            app, ["CC(C)(C)OC(=O)NCCCCCCN", "--ascii", "--abbreviate"]
+        )
+        assert result.exit_code == 0
+        assert "Boc" in result.stdout
+
+    def test_invalid_scaffold_error(self) -> None:
+        """Test error for an invalid scaffold SMILES."""
+        result = runner.invoke(app, ["CCO", "--unicode", "--scaffold", "xyz"])
+        assert result.exit_code == 1
+        assert "scaffold" in result.stdout
+
+    def test_invalid_engine_error(self) -> None:
+        """Test error for an unknown depiction engine."""
+        result = runner.invoke(app, ["CCO", "--unicode", "--engine", "fast"])
+        assert result.exit_code == 1
+        assert "Unknown depiction engine" in result.stdout
+
+    def test_render_formats(self) -> None:
+        """Test rendering several formats from one layout."""
+        result = runner.invoke(app, ["CC#N", "--formats", "ascii,unicode"])
+        assert result.exit_code == 0
+        assert "#" in result.stdout
+        assert "≡" in result.stdout
+
+    def test_render_formats_color_mode(self) -> None:
+        """Test that --color-mode applies to ASCII output of --formats."""
+        result = runner.invoke(
+            app, ["CCO", "--formats", "ascii,unicode", "--color-mode", "truecolor"]
+        )
+        assert result.exit_code == 0
+        assert "\033[38;2;" in result.stdout
+
+    def test_invalid_format_error(self) -> None:
+        """Test error for an unknown render format."""
+        result = runner.invoke(app, ["CCO", "--formats", "ascii,braille"])
+        assert result.exit_code == 1
+        assert "Unknown render format" in result.stdout
+
     def test_multiple_renderers_error(self) -> None:
         """Test error when multiple renderers selected."""
         result = runner.invoke(app, ["CCO", "--ascii", "--unicode"])
@@ -228,3 +413,181 @@ M  END
         sdf_file.write_text(sdf_content)
         result = runner.invoke(app, [str(sdf_file), "--unicode"])
         assert result.exit_code == 0
+
+    def test_offline_unknown_name(self) -> None:
+        """Test that offline mode fails an unknown name without the network."""
+        try:
+            with patch("chemscii.parsers.remote.request.urlopen") as urlopen:
+                result = runner.invoke(app, ["notarealmolecule12345", "--offline"])
+            assert result.exit_code == 1
+            urlopen.assert_not_called()
+            result = runner.invoke(app, ["aspirin", "--offline", "--ascii"])
+            assert result.exit_code == 0
+        finally:
+            set_offline(False)
+
+    def test_render_record(self, tmp_path: Path) -> None:
+        """Test rendering one record of a SMILES file."""
+        smi_file = tmp_path / "library.smi"
+        smi_file.write_text("C methane\nBrCCBr dibromoethane\n")
+        result = runner.invoke(app, [str(smi_file), "--record", "1", "--ascii"])
+        assert result.exit_code == 0
+        assert "Br" in result.stdout
+
+    def test_render_range(self, tmp_path: Path) -> None:
+        """Test rendering a range of records under headers."""
+        smi_file = tmp_path / "library.smi"
+        smi_file.write_text("CCO ethanol\nOCC ethanol again\nnot-smiles\nCCN\n")
+        result = runner.invoke(
+            app, [str(smi_file), "--range", "0:3", "--ascii", "--width", "20"]
+        )
+        assert result.exit_code == 0
+        assert "[0] ethanol" in result.stdout
+        assert "[1] ethanol again" in result.stdout
+        assert "Failed to parse SMILES" in result.stdout
+        assert "[3]" not in result.stdout
+
+    def test_render_sample(self, tmp_path: Path) -> None:
+        """Test rendering a random sample of records."""
+        smi_file = tmp_path / "library.smi"
+        smi_file.write_text("".join(f"{'C' * (i + 1)} mol{i}\n" for i in range(20)))
+        args = [str(smi_file), "--sample", "3", "--seed", "1", "--unicode"]
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0
+        assert result.stdout.count(" mol") == 3
+        assert runner.invoke(app, args).stdout == result.stdout
+
+    def test_record_needs_smiles_file(self) -> None:
+        """Test that record selection is rejected for other inputs."""
+        result = runner.invoke(app, ["CCO", "--record", "1"])
+        assert result.exit_code == 1
+        assert "need a SMILES file" in result.stdout
+
+    def test_range_needs_character_renderer(self, tmp_path: Path) -> None:
+        """Test that ranges are rejected with the magic renderer."""
+        smi_file = tmp_path / "library.smi"
+        smi_file.write_text("CCO\n")
+        result = runner.invoke(app, [str(smi_file), "--range", "0:1", "--magic"])
+        assert result.exit_code == 1
+
+    def test_invalid_range(self, tmp_path: Path) -> None:
+        """Test error for a malformed record range."""
+        smi_file = tmp_path / "library.smi"
+        smi_file.write_text("CCO\n")
+        result = runner.invoke(app, [str(smi_file), "--range", "5"])
+        assert result.exit_code == 1
+        assert "Invalid record range" in result.stdout
+
+    def test_render_table(self, tmp_path: Path) -> None:
+        """Test rendering every row of a table under its ID."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("name,structure\nethanol,CCO\nammonia,N\n")
+        result = runner.invoke(
+            app,
+            [str(csv_file), "--smiles-column", "structure", "--ascii", "-w", "20"],
+        )
+        assert result.exit_code == 0
+        assert "[0] ethanol" in result.stdout
+        assert "[1] ammonia" in result.stdout
+
+    def test_render_table_range(self, tmp_path: Path) -> None:
+        """Test rendering a row range of a TSV table."""
+        tsv_file = tmp_path / "compounds.tsv"
+        tsv_file.write_text("smiles\tid\nC\tm0\nCC\tm1\nCCC\tm2\n")
+        result = runner.invoke(app, [str(tsv_file), "--range", "1:2", "--unicode"])
+        assert result.exit_code == 0
+        assert "[1] m1" in result.stdout
+        assert "m0" not in result.stdout and "m2" not in result.stdout
+
+    def test_table_missing_column(self, tmp_path: Path) -> None:
+        """Test error for a table without the SMILES column."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("id,mw\na,46.07\n")
+        result = runner.invoke(app, [str(csv_file)])
+        assert result.exit_code == 1
+        assert "No SMILES column" in result.stdout
+
+    def test_table_sample_error(self, tmp_path: Path) -> None:
+        """Test that sampling a streamed table is rejected."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("smiles\nCCO\n")
+        result = runner.invoke(app, [str(csv_file), "--sample", "1"])
+        assert result.exit_code == 1
+        assert "Use --range" in result.stdout
+
+    def test_render_table_identifiers(self, tmp_path: Path) -> None:
+        """Test rendering a table column of identifiers resolved in bulk."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("chembl_id,mw\nCHEMBL25,180.16\nCHEMBL0,0\n")
+        try:
+            result = runner.invoke(
+                app,
+                [
+                    str(csv_file),
+                    "--identifier-column",
+                    "chembl_id",
+                    "--offline",
+                    "--ascii",
+                ],
+            )
+        finally:
+            set_offline(False)
+        assert result.exit_code == 0
+        assert "[0] CHEMBL25" in result.stdout
+        assert "[1] CHEMBL0" in result.stdout
+        assert "Could not resolve identifier" in result.stdout
+
+    def test_render_table_cids(self, tmp_path: Path) -> None:
+        """Test that a column of bare CIDs is fetched in one batch."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("cid\n702\n280\n")
+        chain = ResolverChain([RemoteBackend()])
+        with (
+            patch("chemscii.cli.default_resolver", return_value=chain),
+            patch(
+                "chemscii.parsers.resolver.query_pubchem_cids",
+                return_value={702: "CCO", 280: "O=C=O"},
+            ) as query,
+        ):
+            result = runner.invoke(
+                app,
+                [
+                    str(csv_file),
+                    "--identifier-column",
+                    "cid",
+                    "--identifier-type",
+                    "cid",
+                    "--ascii",
+                ],
+            )
+        assert result.exit_code == 0
+        query.assert_called_once_with([702, 280])
+        assert "[0] 702" in result.stdout
+        assert "[1] 280" in result.stdout
+        assert "Could not resolve identifier" not in result.stdout
+
+    def test_unknown_identifier_type(self, tmp_path: Path) -> None:
+        """Test that an unknown identifier type is rejected."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("cid\n702\n")
+        result = runner.invoke(
+            app,
+            [str(csv_file), "--identifier-column", "cid", "--identifier-type", "x"],
+        )
+        assert result.exit_code == 1
+
+    def test_identifier_and_smiles_columns(self, tmp_path: Path) -> None:
+        """Test that only one structure column can be chosen."""
+        csv_file = tmp_path / "compounds.csv"
+        csv_file.write_text("smiles,chembl_id\nCCO,CHEMBL545\n")
+        result = runner.invoke(
+            app,
+            [
+                str(csv_file),
+                "--identifier-column",
+                "chembl_id",
+                "--smiles-column",
+                "smiles",
+            ],
+        )
+        assert result.exit_code == 1
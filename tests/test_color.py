@@ -0,0 +1,90 @@
+"""Tests for chemscii.renderers.color module."""
+
+import numpy as np
+import pytest
+
+from chemscii.parsers.molecule import parse_smiles
+from chemscii.renderers.ascii import AsciiRenderer
+from chemscii.renderers.color import ColorEngine, get_color_engine
+
+
+class TestColorEngine:
+    """Tests for run-length merged ANSI coloring."""
+
+    def test_merges_runs(self) -> None:
+        """Test that a multi-character label gets one escape sequence."""
+        engine = ColorEngine("ansi16")
+        attr = engine.attribute("Cl")
+        rows = [list("C-Cl  ")]
+        attributes = np.array([[0, 0, attr, attr, 0, 0]], dtype=np.uint8)
+        assert engine.render(rows, attributes) == "C-\033[96mCl\033[0m"
+
+    def test_adjacent_same_color_merged(self) -> None:
+        """Test that neighbouring labels with one color share an escape."""
+        engine = ColorEngine("ansi16")
+        attr = engine.attribute("O")
+        rows = [list("OO")]
+        attributes = np.array([[attr, attr]], dtype=np.uint8)
+        assert engine.render(rows, attributes) == "\033[91mOO\033[0m"
+
+    def test_default_color_uncolored(self) -> None:
+        """Test that carbon and unknown labels are written plainly."""
+        engine = ColorEngine("truecolor")
+        assert engine.attribute("C") == 0
+        assert engine.attribute("Boc") == 0
+        rows = [list("C"), list("   ")]
+        attributes = np.zeros((2, 3), dtype=np.uint8)
+        assert engine.render(rows, attributes) == "C"
+
+    def test_truecolor_theme(self) -> None:
+        """Test that true-color mode uses 24-bit CPK colors."""
+        engine = ColorEngine("truecolor")
+        rows = [list("N")]
+        attributes = np.array([[engine.attribute("N")]], dtype=np.uint8)
+        assert engine.render(rows, attributes) == "\033[38;2;48;80;248mN\033[0m"
+
+    def test_ansi256_theme(self) -> None:
+        """Test that 256-color mode maps CPK colors to the xterm cube."""
+        engine = ColorEngine("ansi256")
+        rows = [list("O")]
+        attributes = np.array([[engine.attribute("O")]], dtype=np.uint8)
+        assert engine.render(rows, attributes) == "\033[38;5;196mO\033[0m"
+
+    def test_unknown_mode(self) -> None:
+        """Test that an unknown color mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown color mode"):
+            ColorEngine("cga")  # type: ignore[arg-type]
+
+    def test_engine_cached(self) -> None:
+        """Test that color engines are shared per mode."""
+        assert get_color_engine("ansi256") is get_color_engine("ansi256")
+
+
+class TestColoredRendering:
+    """Tests for colored ASCII rendering."""
+
+    def test_superatom_label_single_escape(self) -> None:
+        """Test that a colored multi-character symbol is wrapped once."""
+        mol = parse_smiles("ClCCl")
+        assert mol is not None
+        result = AsciiRenderer(width=30, height=10).render_molecule(mol)
+        assert result.count("\033[96mCl\033[0m") == 2
+
+    def test_fewer_bytes_than_per_character(self) -> None:
+        """Test that each colored label costs one escape and one reset."""
+        mol = parse_smiles("BrC(Cl)(Cl)Br")
+        assert mol is not None
+        colored = AsciiRenderer(width=30, height=12).render_molecule(mol)
+        plain = AsciiRenderer(width=30, height=12, color=False).render_molecule(mol)
+        escapes = colored.count("\033[")
+        assert escapes == 8
+        for code in ("\033[96m", "\033[0m"):
+            colored = colored.replace(code, "")
+        assert colored == plain
+
+    def test_truecolor_renderer(self) -> None:
+        """Test rendering with the true-color CPK theme."""
+        mol = parse_smiles("CCO")
+        assert mol is not None
+        renderer = AsciiRenderer(width=30, height=10, color_mode="truecolor")
+        assert "\033[38;2;255;13;13mO\033[0m" in renderer.render_molecule(mol)
@@ -0,0 +1,79 @@
+"""Tests for compact text output."""
+
+from __future__ import annotations
+
+from rdkit import Chem
+
+from chemscii.layout import compute_layout
+from chemscii.parsers.molecule import parse_smiles
+from chemscii.renderers.ascii import AsciiRenderer
+from chemscii.renderers.compact import render_compact, strip_ansi, trim_margins
+from chemscii.renderers.unicode import UnicodeRenderer
+
+_ASPIRIN = "CC(=O)Oc1ccccc1C(=O)O"
+
+
+class TestStripAnsi:
+    """Tests for escape code removal."""
+
+    def test_removes_color_codes(self) -> None:
+        """Test that color and reset codes are removed."""
+        assert strip_ansi("\033[91mO\033[0m-C\033[38;2;1;2;3mN\033[0m") == "O-CN"
+
+    def test_plain_text_unchanged(self) -> None:
+        """Test that text without escape codes is returned as is."""
+        assert strip_ansi("C-C\n|") == "C-C\n|"
+
+
+class TestTrimMargins:
+    """Tests for blank margin removal."""
+
+    def test_trims_all_sides(self) -> None:
+        """Test that blank rows, indentation and trailing spaces go."""
+        assert trim_margins("\n\n    C-C  \n      |\n\n") == "C-C\n  |"
+
+    def test_blank_text(self) -> None:
+        """Test that blank text trims to an empty string."""
+        assert trim_margins("  \n \n") == ""
+
+
+class TestRenderCompact:
+    """Tests for budget-sized rendering."""
+
+    def test_no_escape_codes_or_margins(self) -> None:
+        """Test that compact output is plain and tightly cropped."""
+        layout = compute_layout(parse_smiles(_ASPIRIN))
+        txt = render_compact(layout, AsciiRenderer, 5000)
+        lines = txt.splitlines()
+        assert "\033" not in txt
+        assert lines[0].strip() and lines[-1].strip()
+        assert any(not line.startswith(" ") for line in lines)
+        assert all(line == line.rstrip() for line in lines)
+
+    def test_smallest_legible_scale(self) -> None:
+        """Test that a loose budget still gives a smaller drawing than auto."""
+        layout = compute_layout(parse_smiles(_ASPIRIN))
+        txt = render_compact(layout, UnicodeRenderer, 5000)
+        auto = trim_margins(strip_ansi(UnicodeRenderer().render_layout(layout)))
+        assert len(txt) < len(auto)
+        assert txt.count("O") == 4
+
+    def test_fits_budget(self) -> None:
+        """Test that a tight budget drops to the smallest scale."""
+        layout = compute_layout(parse_smiles(_ASPIRIN))
+        large = render_compact(layout, UnicodeRenderer, 5000)
+        small = render_compact(layout, UnicodeRenderer, 150)
+        assert len(small) <= 150 < len(large)
+        assert small.count("O") == large.count("O") == 4
+
+    def test_budget_too_small_keeps_smallest_legible(self) -> None:
+        """Test that an unreachable budget still returns a drawing."""
+        layout = compute_layout(parse_smiles(_ASPIRIN))
+        txt = render_compact(layout, UnicodeRenderer, 10)
+        assert len(txt) > 10
+        assert txt.count("O") == 4
+
+    def test_empty_layout(self) -> None:
+        """Test that an empty molecule renders as empty text."""
+        layout = compute_layout(Chem.Mol())
+        assert render_compact(layout, AsciiRenderer, 100) == ""
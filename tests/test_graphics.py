@@ -0,0 +1,91 @@
+"""Tests for chemscii.renderers.graphics module."""
+
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from chemscii.parsers.molecule import parse_smiles
+from chemscii.renderers.graphics import (
+    GraphicsProtocol,
+    GraphicsRenderer,
+    KittyEncoder,
+    SixelEncoder,
+    get_encoder,
+)
+from tests.fixtures.molecules import BENZENE
+
+GOLDEN_DIR = Path(__file__).parent / "fixtures" / "golden"
+
+
+def _synthetic_image() -> Image.Image:
+    """Build a small image with solid colors and an odd band height."""
+    pixels = np.zeros((8, 10, 3), dtype=np.uint8)
+    pixels[1:4, 1:5] = (255, 0, 0)
+    pixels[5, :] = (255, 255, 255)
+    pixels[7, 9] = (0, 0, 255)
+    return Image.fromarray(pixels)
+
+
+class TestSixelEncoder:
+    """Tests for Sixel encoding."""
+
+    def test_golden(self) -> None:
+        """Test encoding against the golden bytes."""
+        expected = (GOLDEN_DIR / "synthetic.sixel").read_bytes()
+        assert SixelEncoder().encode(_synthetic_image()).encode() == expected
+
+    def test_png_matches_image(self) -> None:
+        """Test that encoding PNG data matches encoding the decoded image."""
+        image = _synthetic_image()
+        data = io.BytesIO()
+        image.save(data, format="PNG")
+        encoder = SixelEncoder()
+        assert encoder.encode_png(data.getvalue()) == encoder.encode(image)
+
+    def test_blank_image(self) -> None:
+        """Test that a background-only image has no color registers."""
+        image = Image.new("RGB", (4, 6))
+        assert SixelEncoder().encode(image) == '\033P0;1;0q"1;1;4;6\033\\'
+
+
+class TestKittyEncoder:
+    """Tests for Kitty graphics protocol encoding."""
+
+    def test_golden(self) -> None:
+        """Test chunked encoding against the golden bytes."""
+        expected = (GOLDEN_DIR / "synthetic.kitty").read_bytes()
+        encoded = KittyEncoder().encode_png(bytes(range(256)) * 20)
+        assert encoded.encode() == expected
+
+    def test_single_chunk(self) -> None:
+        """Test that small images are sent in one escape sequence."""
+        encoded = KittyEncoder().encode_png(b"png")
+        assert encoded == "\033_Ga=T,f=100,m=0;cG5n\033\\"
+
+
+class TestGraphicsRenderer:
+    """Tests for inline terminal graphics rendering."""
+
+    @pytest.mark.parametrize("protocol", ["kitty", "sixel"])
+    def test_render_molecule(self, protocol: GraphicsProtocol) -> None:
+        """Test rendering a molecule with each protocol."""
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        renderer = GraphicsRenderer(protocol=protocol, size=(120, 120))
+        result = renderer.render_molecule(mol)
+        prefix = "\033_G" if protocol == "kitty" else "\033P"
+        assert result.startswith(prefix)
+        assert result.endswith("\033\\")
+
+    def test_encoder_cached(self) -> None:
+        """Test that renderers share one encoder per protocol."""
+        assert get_encoder("sixel") is get_encoder("sixel")
+        assert GraphicsRenderer("sixel")._encoder is get_encoder("sixel")
+
+    def test_unknown_protocol(self) -> None:
+        """Test that an unknown protocol is rejected."""
+        with pytest.raises(ValueError, match="Unknown graphics protocol"):
+            GraphicsRenderer(protocol="iterm")  # type: ignore[arg-type]
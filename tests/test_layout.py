@@ -1,9 +1,34 @@
 """Tests for chemscii.layout module."""
 
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+from rdkit import Chem
+from rdkit.Chem import AllChem, BondType
+
+from chemscii.layout import result
 from chemscii.layout.atoms import AtomLayout
 from chemscii.layout.bonds import BondLayout
-from chemscii.parsers.molecule import parse_smiles
-from tests.fixtures.molecules import BENZENE, ETHANOL, ETHENE, ETHYNE, METHANE
+from chemscii.layout.depiction import compute_2d_coords
+from chemscii.layout.preprocess import Preprocessor
+from chemscii.layout.result import LayoutResult, compute_layout, compute_layouts
+from chemscii.layout.templates import ScaffoldTemplates
+from chemscii.parsers.molecule import parse_sdf, parse_smiles
+from tests.fixtures.molecules import (
+    AMINE_SALT,
+    BENZENE,
+    BOC_PEPTIDE,
+    ETHANOL,
+    ETHENE,
+    ETHYNE,
+    METHANE,
+    MIXTURE,
+    SODIUM_ACETATE_HYDRATE,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
 class TestAtomLayout:
@@ -84,6 +109,211 @@ class TestAtomLayout:
         positions = layout.compute_positions()
         assert layout.positions == positions
 
+    def test_compute_coords(self) -> None:
+        """Test computing coordinates as an array."""
+        mol = parse_smiles(ETHANOL)
+        assert mol is not None
+        layout = AtomLayout(mol)
+        coords = layout.compute_coords()
+        assert coords.shape == (3, 2)
+        assert coords.dtype == np.float64
+        assert layout.get_symbols() == ["C", "C", "O"]
+
+    def test_records_engine(self) -> None:
+        """Test that the depiction engine and time are recorded."""
+        mol = parse_smiles(ETHANOL)
+        assert mol is not None
+        layout = AtomLayout(mol, engine="rdkit")
+        assert layout.engine == "rdkit"
+        assert layout.depiction_time >= 0.0
+
+    def test_input_unchanged(self) -> None:
+        """Test that the input molecule is not depicted or kekulized."""
+        mol = Chem.MolFromSmiles(BENZENE)
+        AtomLayout(mol).compute_coords()
+        assert mol.GetNumConformers() == 0
+        assert all(b.GetBondType() == Chem.BondType.AROMATIC for b in mol.GetBonds())
+
+
+class TestDepiction:
+    """Tests for depiction engine selection."""
+
+    # 26-membered macrocyclic peptide backbone
+    MACROCYCLE = "C1" + "C(=O)NCC" * 10 + "1"
+
+    def test_coordgen_default(self) -> None:
+        """Test that CoordGen is the default engine."""
+        mol = Chem.MolFromSmiles(BENZENE)
+        assert compute_2d_coords(mol) == "coordgen"
+        assert mol.GetNumConformers() == 1
+
+    def test_rdkit_engine(self) -> None:
+        """Test native RDKit depiction."""
+        mol = Chem.MolFromSmiles(ETHANOL)
+        assert compute_2d_coords(mol, "rdkit") == "rdkit"
+        assert mol.GetNumConformers() == 1
+
+    def test_projection_flattens_3d(self) -> None:
+        """Test projection of an existing 3D conformer onto the plane."""
+        mol = Chem.AddHs(Chem.MolFromSmiles(ETHANOL))
+        AllChem.EmbedMolecule(mol, randomSeed=42)
+        expected = [(p[0], p[1]) for p in mol.GetConformer().GetPositions()]
+        assert compute_2d_coords(mol, "projection") == "projection"
+        conformer = mol.GetConformer()
+        assert not conformer.Is3D()
+        positions = conformer.GetPositions()
+        assert [(p[0], p[1]) for p in positions] == expected
+        assert all(p[2] == 0.0 for p in positions)
+
+    def test_projection_without_conformer(self) -> None:
+        """Test projection falls back to RDKit when there is nothing to project."""
+        mol = Chem.MolFromSmiles(ETHANOL)
+        assert compute_2d_coords(mol, "projection") == "rdkit"
+        assert mol.GetNumConformers() == 1
+
+    def test_unknown_engine(self) -> None:
+        """Test that unknown engines are rejected."""
+        mol = Chem.MolFromSmiles(ETHANOL)
+        with pytest.raises(ValueError, match="Unknown depiction engine"):
+            compute_2d_coords(mol, "unknown")  # type: ignore[arg-type]
+
+    def test_budget_small_molecule_inline(self) -> None:
+        """Test that small molecules use CoordGen regardless of budget."""
+        mol = Chem.MolFromSmiles(BENZENE)
+        assert compute_2d_coords(mol, "coordgen", time_budget=0.0) == "coordgen"
+
+    def test_budget_exceeded_falls_back(self) -> None:
+        """Test fallback to RDKit when CoordGen exceeds its budget."""
+        mol = Chem.MolFromSmiles(self.MACROCYCLE)
+        assert compute_2d_coords(mol, "coordgen", time_budget=0.0) == "rdkit"
+        assert mol.GetNumConformers() == 1
+
+    def test_budget_within_limit(self) -> None:
+        """Test CoordGen result is kept when it finishes within budget."""
+        mol = Chem.MolFromSmiles(self.MACROCYCLE)
+        assert compute_2d_coords(mol, "coordgen", time_budget=60.0) == "coordgen"
+        assert mol.GetConformer().GetNumAtoms() == mol.GetNumAtoms()
+
+
+class TestScaffoldTemplates:
+    """Tests for scaffold template depiction."""
+
+    NAPHTHALENE = "c1ccc2ccccc2c1"
+    SERIES = [
+        "c1ccc2c(c1)cc(N)cc2CC",
+        "c1ccc2c(c1)cc(O)cc2CCl",
+        "Clc1ccc2c(c1)cc(N)cc2",
+    ]
+
+    def test_align_to_scaffold(self) -> None:
+        """Test analogs are laid out on the scaffold coordinates."""
+        templates = ScaffoldTemplates([self.NAPHTHALENE])
+        scaffold = Chem.MolFromSmiles(self.NAPHTHALENE)
+        core_positions = []
+        for smiles in self.SERIES:
+            mol = Chem.MolFromSmiles(smiles)
+            layout = AtomLayout(mol, templates=templates)
+            assert layout.engine == "template"
+            positions = layout.compute_positions()
+            match = mol.GetSubstructMatch(scaffold)
+            core_positions.append(sorted(positions[i] for i in match))
+        for positions in core_positions[1:]:
+            for (x1, y1), (x2, y2) in zip(positions, core_positions[0]):
+                assert x1 == pytest.approx(x2, abs=1e-3)
+                assert y1 == pytest.approx(y2, abs=1e-3)
+
+    def test_no_match_uses_engine(self) -> None:
+        """Test molecules without the scaffold use the depiction engine."""
+        templates = ScaffoldTemplates([self.NAPHTHALENE])
+        mol = parse_smiles(ETHANOL)
+        assert mol is not None
+        layout = AtomLayout(mol, engine="rdkit", templates=templates)
+        assert layout.engine == "rdkit"
+
+    def test_invalid_scaffold(self) -> None:
+        """Test that invalid scaffold SMILES are rejected."""
+        with pytest.raises(ValueError, match="Invalid scaffold"):
+            ScaffoldTemplates(["not a smiles"])
+
+    def test_duplicate_scaffold(self) -> None:
+        """Test that a scaffold is only depicted once."""
+        templates = ScaffoldTemplates([self.NAPHTHALENE, "C1=CC=C2C=CC=CC2=C1"])
+        assert len(templates) == 1
+
+    def test_from_series(self) -> None:
+        """Test detecting the common scaffold of a series."""
+        mols = [Chem.MolFromSmiles(smiles) for smiles in self.SERIES]
+        templates = ScaffoldTemplates.from_series(mols)
+        assert len(templates) == 1
+        for mol in mols:
+            assert AtomLayout(Chem.Mol(mol), templates=templates).engine == "template"
+
+    def test_from_series_single_molecule(self) -> None:
+        """Test that a single molecule gives no scaffold."""
+        mols = [Chem.MolFromSmiles(self.SERIES[0])]
+        assert len(ScaffoldTemplates.from_series(mols)) == 0
+
+
+class TestPreprocessor:
+    """Tests for pre-layout molecule slimming."""
+
+    def test_remove_hs(self) -> None:
+        """Test removing explicit hydrogens from an SDF record."""
+        mol = parse_sdf((FIXTURES_DIR / "ethanol.sdf").read_text())
+        assert mol is not None
+        assert mol.GetNumAtoms() == 9
+        result = Preprocessor().process(mol)
+        assert result.GetNumAtoms() == 3
+
+    def test_keep_hs(self) -> None:
+        """Test keeping explicit hydrogens when disabled."""
+        mol = parse_sdf((FIXTURES_DIR / "ethanol.sdf").read_text())
+        assert mol is not None
+        result = Preprocessor(remove_hs=False).process(mol)
+        assert result.GetNumAtoms() == 9
+
+    def test_strip_salts(self) -> None:
+        """Test removing counter-ions and water."""
+        preprocessor = Preprocessor()
+        result = preprocessor.process(Chem.MolFromSmiles(AMINE_SALT))
+        assert Chem.MolToSmiles(result) == "CCN"
+        result = preprocessor.process(Chem.MolFromSmiles(SODIUM_ACETATE_HYDRATE))
+        assert Chem.MolToSmiles(result) == "CC(=O)[O-]"
+
+    def test_strip_salts_keeps_salt_only_molecule(self) -> None:
+        """Test that a molecule made only of salt fragments is not emptied."""
+        result = Preprocessor().process(Chem.MolFromSmiles("[Na+].[Cl-]"))
+        assert result.GetNumAtoms() > 0
+
+    def test_largest_fragment(self) -> None:
+        """Test keeping only the largest fragment."""
+        mol = Chem.MolFromSmiles(MIXTURE)
+        result = Preprocessor(largest_fragment=True).process(mol)
+        assert Chem.MolToSmiles(result) == "c1ccccc1"
+
+    def test_abbreviate(self) -> None:
+        """Test collapsing residues, linkers and groups into superatoms."""
+        mol = Chem.MolFromSmiles(BOC_PEPTIDE)
+        result = Preprocessor(abbreviate=True).process(mol)
+        assert result.GetNumAtoms() < mol.GetNumAtoms() // 2
+        layout = AtomLayout(result)
+        layout.compute_positions()
+        symbols = layout.get_symbols()
+        for label in ("Boc", "Gly", "Ala", "Phe", "Ser", "PEG4"):
+            assert label in symbols
+
+    def test_abbreviate_small_molecule_unchanged(self) -> None:
+        """Test that groups covering most of a molecule are kept."""
+        mol = Chem.MolFromSmiles(ETHANOL)
+        result = Preprocessor(abbreviate=True).process(mol)
+        assert result.GetNumAtoms() == 3
+
+    def test_input_unchanged(self) -> None:
+        """Test that the input molecule is not modified."""
+        mol = Chem.MolFromSmiles(AMINE_SALT)
+        Preprocessor(largest_fragment=True).process(mol)
+        assert Chem.MolToSmiles(mol) == "CCN.Cl"
+
 
 class TestBondLayout:
     """Tests for bond positioning."""
@@ -181,6 +411,40 @@ class TestBondLayout:
         aromatic = bond_layout.get_aromatic_bonds()
         assert len(aromatic) == 0
 
+    def test_compute_bond_array(self) -> None:
+        """Test computing bond indices and orders as an array."""
+        mol = parse_smiles(ETHENE)
+        assert mol is not None
+        bonds = BondLayout(mol).compute_bond_array()
+        assert bonds.shape == (1, 3)
+        assert bonds.tolist() == [[0, 1, 2]]
+
+    def test_kekulized_once(self) -> None:
+        """Test that molecules from AtomLayout are used without a copy."""
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        atom_layout = AtomLayout(mol)
+        bond_layout = BondLayout(atom_layout.molecule)
+        assert bond_layout.molecule is atom_layout.molecule
+        orders = bond_layout.compute_bond_array()[:, 2].tolist()
+        assert sorted(orders) == [1, 1, 1, 2, 2, 2]
+        assert len(bond_layout.get_aromatic_bonds()) == 6
+
+    def test_aromatic_input_unchanged(self) -> None:
+        """Test that an aromatic input molecule is kekulized on a copy."""
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        bonds = BondLayout(mol).compute_bond_array()
+        assert sorted(bonds[:, 2].tolist()) == [1, 1, 1, 2, 2, 2]
+        assert all(b.GetBondType() == BondType.AROMATIC for b in mol.GetBonds())
+
+    def test_compute_bond_array_no_bonds(self) -> None:
+        """Test bond array for a molecule without bonds."""
+        mol = parse_smiles(METHANE)
+        assert mol is not None
+        bonds = BondLayout(mol).compute_bond_array()
+        assert bonds.shape == (0, 3)
+
     def test_empty_positions(self) -> None:
         """Test with empty positions list."""
         mol = parse_smiles(ETHANOL)
@@ -188,3 +452,103 @@ class TestBondLayout:
         bond_layout = BondLayout(mol, [])
         bonds = bond_layout.compute_bond_lines()
         assert len(bonds) == 0
+
+
+class TestLayoutResult:
+    """Tests for array-based layout results."""
+
+    def test_compute_layout(self) -> None:
+        """Test computing a layout result for benzene."""
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        layout = compute_layout(mol)
+        assert len(layout) == 6
+        assert layout.coords.shape == (6, 2)
+        assert layout.bonds.shape == (6, 3)
+        assert layout.symbols == ("C",) * 6
+        assert layout.engine == "coordgen"
+        assert sorted(layout.bonds[:, 2].tolist()) == [1, 1, 1, 2, 2, 2]
+
+    def test_compute_layout_shares_input(self) -> None:
+        """Test that one molecule can be laid out repeatedly without copies."""
+        mol = Chem.MolFromSmiles(BENZENE)
+        binary = mol.ToBinary()
+        first = compute_layout(mol, engine="rdkit")
+        second = compute_layout(mol, engine="rdkit")
+        assert mol.ToBinary() == binary
+        assert np.array_equal(first.coords, second.coords)
+
+    def test_segments_match_bond_lines(self) -> None:
+        """Test that segments match the tuple-based bond lines."""
+        mol = parse_smiles(ETHANOL)
+        assert mol is not None
+        layout = compute_layout(mol)
+        positions = [(x, y) for x, y in layout.coords.tolist()]
+        bond_lines = BondLayout(mol, positions).compute_bond_lines()
+        expected = [[*start, *end] for start, end, _ in bond_lines]
+        assert layout.segments().tolist() == expected
+
+    def test_bounds(self) -> None:
+        """Test bounding box of a layout result."""
+        coords = np.array([(0.0, 1.0), (2.0, -1.0)])
+        bonds = np.array([(0, 1, 1)], dtype=np.int32)
+        layout = LayoutResult(coords, bonds, ["C", "O"])
+        assert layout.get_bounds() == (0.0, -1.0, 2.0, 1.0)
+
+    def test_bounds_empty(self) -> None:
+        """Test bounding box of an empty layout result."""
+        layout = LayoutResult(np.empty((0, 2)), np.empty((0, 3), dtype=np.int32), [])
+        assert layout.get_bounds() == (0.0, 0.0, 0.0, 0.0)
+
+    def test_pickle_roundtrip(self) -> None:
+        """Test that layout results can be pickled."""
+        mol = parse_smiles(ETHANOL)
+        assert mol is not None
+        layout = compute_layout(mol)
+        restored = pickle.loads(pickle.dumps(layout))
+        assert np.array_equal(restored.coords, layout.coords)
+        assert np.array_equal(restored.bonds, layout.bonds)
+        assert restored.symbols == layout.symbols
+        assert restored.engine == layout.engine
+
+    def test_slots(self) -> None:
+        """Test that layout results do not carry an instance dict."""
+        layout = LayoutResult(np.empty((0, 2)), np.empty((0, 3), dtype=np.int32), [])
+        assert not hasattr(layout, "__dict__")
+
+
+class TestComputeLayouts:
+    """Tests for laying out many molecules."""
+
+    def test_small_batch_in_process(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a few molecules are laid out without worker processes."""
+
+        def no_pool(workers: int) -> None:
+            raise AssertionError("worker processes started for a small batch")
+
+        monkeypatch.setattr(result, "_process_pool", no_pool)
+        mols = [parse_smiles(ETHANOL), parse_smiles(BENZENE)]
+        layouts = compute_layouts(mols, workers=2)
+        assert [len(layout) for layout in layouts] == [3, 6]
+
+    def test_pool_reused(self) -> None:
+        """Test that batches share one pool of worker processes."""
+        mols = [parse_smiles(s) for s in (ETHANOL, BENZENE, ETHENE, METHANE)] * 5
+        first = compute_layouts(mols, workers=2)
+        pool = result._process_pool(2)
+        second = compute_layouts(mols, workers=2)
+        assert result._process_pool(2) is pool
+        assert [len(layout) for layout in first] == [3, 6, 2, 1] * 5
+        assert all(np.array_equal(a.coords, b.coords) for a, b in zip(first, second))
+
+    def test_depiction_worker_started_first(self) -> None:
+        """Test that pool workers do not inherit the CoordGen worker."""
+        macrocycle = Chem.MolFromSmiles(TestDepiction.MACROCYCLE)
+        assert compute_2d_coords(macrocycle, "coordgen", time_budget=30.0)
+        # Start a new pool now that the CoordGen worker is running
+        result._process_pool(2).shutdown()
+        result._process_pool.cache_clear()
+        mols = [macrocycle] + [parse_smiles(ETHANOL)] * 19
+        layouts = compute_layouts(mols, time_budget=30.0, workers=2)
+        sizes = [macrocycle.GetNumAtoms()] + [3] * 19
+        assert [len(layout) for layout in layouts] == sizes
@@ -0,0 +1,41 @@
+"""Tests for local data files named by environment variables."""
+
+from __future__ import annotations
+
+import warnings
+from pathlib import Path
+
+import pytest
+
+from chemscii.parsers.local_data import open_configured
+
+_ENV = "CHEMSCII_TEST_DATA"
+
+
+class TestOpenConfigured:
+    """Tests for opening configured files."""
+
+    def test_opened_once(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that every call shares one opened file."""
+        path = tmp_path / "data.txt"
+        path.write_text("")
+        monkeypatch.setenv(_ENV, str(path))
+        opened = open_configured(_ENV, Path)
+        assert opened == path
+        assert open_configured(_ENV, Path) is opened
+
+    def test_not_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that an unset variable gives None."""
+        monkeypatch.delenv(_ENV, raising=False)
+        assert open_configured(_ENV, Path) is None
+
+    def test_missing_file_warns_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a missing file is ignored with a single warning."""
+        monkeypatch.setenv(_ENV, str(tmp_path / "absent.txt"))
+        with pytest.warns(UserWarning, match=_ENV):
+            assert open_configured(_ENV, Path) is None
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert open_configured(_ENV, Path) is None
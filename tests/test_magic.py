@@ -1,8 +1,10 @@
 """Tests for chemscii.renderers.magic module."""
 
 from PIL import Image
+from rdkit import Chem
 
 from chemscii.parsers.molecule import parse_smiles
+from chemscii.renderers.drawing import draw_molecule_png
 from chemscii.renderers.magic import AsciiMagicRenderer
 from tests.fixtures.molecules import (
     BENZENE,
@@ -43,6 +45,13 @@ class TestAsciiMagicRenderer:
         result = renderer.render_molecule(mol)
         assert len(result) > 0
 
+    def test_render_leaves_input_unchanged(self) -> None:
+        """Test that rendering does not depict or kekulize the input."""
+        mol = Chem.MolFromSmiles(BENZENE)
+        binary = mol.ToBinary()
+        AsciiMagicRenderer(columns=40).render_molecule(mol)
+        assert mol.ToBinary() == binary
+
     def test_render_benzene(self) -> None:
         """Test rendering benzene ring."""
         mol = parse_smiles(BENZENE)
@@ -120,6 +129,15 @@ class TestAsciiMagicRenderer:
         img = renderer._mol_to_image(mol, mol_size=(400, 200))
         assert img.size == (400, 200)
 
+    def test_drawing_independent_of_previous_draws(self) -> None:
+        """Test that a drawing does not depend on earlier drawings."""
+        caffeine = parse_smiles(CAFFEINE)
+        ethanol = parse_smiles(ETHANOL)
+        assert caffeine is not None and ethanol is not None
+        first = draw_molecule_png(caffeine, (200, 200))
+        draw_molecule_png(ethanol, (200, 200))
+        assert draw_molecule_png(caffeine, (200, 200)) == first
+
     def test_different_column_widths_produce_different_output(self) -> None:
         """Test that different column widths produce different output lengths."""
         mol = parse_smiles(BENZENE)
@@ -178,3 +178,37 @@ M  END
         result = render_molecule(sdf_content)
         assert isinstance(result, str)
         assert "Error" not in result
+
+
+class TestCompactMode:
+    """Tests for compact output sized to a character budget."""
+
+    def test_compact_reports_character_count(self) -> None:
+        """Test that compact output ends with its character count."""
+        result = render_molecule("CCO", renderer="ascii", compact=True)
+        art, _, footer = result.rpartition("\n\n")
+        assert footer == f"({len(art)} characters)"
+
+    def test_compact_strips_escape_codes(self) -> None:
+        """Test that compact magic output has no terminal escape codes."""
+        result = render_molecule("CCO", renderer="magic", compact=True)
+        assert "Error" not in result
+        assert "\033" not in result
+
+    def test_compact_respects_budget(self) -> None:
+        """Test that compact output fits the character budget."""
+        for renderer in ("ascii", "unicode", "magic"):
+            result = render_molecule(
+                "CC(=O)Oc1ccccc1C(=O)O",
+                renderer=renderer,  # type: ignore[arg-type]
+                compact=True,
+                max_chars=400,
+            )
+            art = result.rpartition("\n\n")[0]
+            assert 0 < len(art) <= 400
+
+    def test_compact_smaller_than_default(self) -> None:
+        """Test that compact output is shorter than the default output."""
+        default = render_molecule("c1ccccc1", renderer="unicode")
+        compact = render_molecule("c1ccccc1", renderer="unicode", compact=True)
+        assert len(compact) < len(default)
@@ -0,0 +1,137 @@
+"""Tests for the offline name index."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from chemscii.parsers.name import name_to_smiles
+from chemscii.parsers.name_index import (
+    NAME_INDEX_ENV,
+    NameIndex,
+    build_name_index,
+    default_name_index,
+)
+
+_SYNONYMS = {
+    "Nicotine": "CN1CCC[C@H]1c1cccnc1",
+    "Paracetamol": "CC(=O)Nc1ccc(O)cc1",
+    "acetaminophen": "CC(=O)Nc1ccc(O)cc1",
+    "Morphine": "CN1CC[C@]23c4c5ccc(O)c4O[C@H]2[C@@H](O)C=C[C@H]3[C@H]1C5",
+    "2-propanol": "CC(C)O",
+    "β-alanine": "NCCC(=O)O",
+}
+
+
+@pytest.fixture  # type: ignore[misc]
+def index_path(tmp_path: Path) -> Path:
+    """Build an index from a small synonym table."""
+    source = tmp_path / "synonyms.tsv"
+    source.write_text(
+        "".join(f"{name}\t{smiles}\n" for name, smiles in _SYNONYMS.items()),
+        encoding="utf-8",
+    )
+    dest = tmp_path / "names.idx"
+    build_name_index(source, dest, chunk_lines=2)
+    return dest
+
+
+class TestBuildNameIndex:
+    """Tests for index building."""
+
+    def test_lines_sorted_and_normalized(self, index_path: Path) -> None:
+        """Test that the index holds lowercase names in byte order."""
+        lines = index_path.read_bytes().splitlines()
+        names = [line.split(b"\t")[0] for line in lines]
+        assert names == sorted(names)
+        assert b"nicotine" in names
+        assert len(lines) == len(_SYNONYMS)
+
+    def test_duplicates_keep_first(self, tmp_path: Path) -> None:
+        """Test that a repeated name keeps its first SMILES across chunks."""
+        source = tmp_path / "synonyms.tsv"
+        source.write_text("water\tO\nethanol\tCCO\nWater\t[OH2]\nx\n")
+        dest = tmp_path / "names.idx"
+        assert build_name_index(source, dest, chunk_lines=1) == 2
+        assert NameIndex(dest).lookup("water") == "O"
+
+    def test_larger_than_chunk(self, tmp_path: Path) -> None:
+        """Test that merged chunks give a complete, searchable index."""
+        rng = random.Random(0)
+        names = [f"compound-{i}" for i in range(500)]
+        rng.shuffle(names)
+        source = tmp_path / "synonyms.tsv"
+        source.write_text("".join(f"{n}\tC{'C' * (len(n) % 5)}\n" for n in names))
+        dest = tmp_path / "names.idx"
+        assert build_name_index(source, dest, chunk_lines=37) == 500
+        index = NameIndex(dest)
+        for name in names:
+            assert index.lookup(name) == f"C{'C' * (len(name) % 5)}"
+
+
+class TestNameIndex:
+    """Tests for index lookups."""
+
+    def test_lookup_every_name(self, index_path: Path) -> None:
+        """Test that every name is found, whatever its case."""
+        index = NameIndex(index_path)
+        for name, smiles in _SYNONYMS.items():
+            assert index.lookup(name) == smiles
+            assert index.lookup(f"  {name.upper()} ") == smiles
+
+    def test_lookup_missing(self, index_path: Path) -> None:
+        """Test names before, between and after the indexed names."""
+        index = NameIndex(index_path)
+        for name in ("0", "aspirin", "nicotin", "nicotinee", "zzz"):
+            assert index.lookup(name) is None
+
+    def test_opened_lazily(self, index_path: Path) -> None:
+        """Test that the file is only mapped by the first lookup."""
+        index = NameIndex(index_path)
+        assert index._map is None
+        index.lookup("nicotine")
+        assert index._map is not None
+        index.close()
+        assert index._map is None
+        assert index.lookup("morphine") is not None
+
+    def test_empty_index(self, tmp_path: Path) -> None:
+        """Test that an empty index finds nothing."""
+        dest = tmp_path / "empty.idx"
+        dest.write_bytes(b"")
+        assert NameIndex(dest).lookup("water") is None
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that an index file that cannot be read finds nothing."""
+        assert NameIndex(tmp_path / "missing.idx").lookup("water") is None
+
+
+class TestNameToSmilesIndex:
+    """Tests for name lookup through the configured index."""
+
+    def test_uses_configured_index(
+        self, index_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that names missing from the dictionary come from the index."""
+        monkeypatch.setenv(NAME_INDEX_ENV, str(index_path))
+        assert name_to_smiles("Paracetamol", use_pubchem=False) == (
+            "CC(=O)Nc1ccc(O)cc1"
+        )
+        assert name_to_smiles("unindexed", use_pubchem=False) is None
+
+    def test_no_index_configured(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that lookups work without an index."""
+        monkeypatch.delenv(NAME_INDEX_ENV, raising=False)
+        assert name_to_smiles("paracetamol", use_pubchem=False) is None
+        assert name_to_smiles("water", use_pubchem=False) == "O"
+
+    def test_missing_index_configured(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a missing configured index warns and is ignored."""
+        monkeypatch.setenv(NAME_INDEX_ENV, str(tmp_path / "missing.idx"))
+        with pytest.warns(UserWarning, match=NAME_INDEX_ENV):
+            assert default_name_index() is None
+        assert name_to_smiles("water", use_pubchem=False) == "O"
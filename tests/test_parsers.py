@@ -6,6 +6,12 @@ import pytest
 from rdkit.Chem import Mol
 
 from chemscii.parsers.chembl import chembl_to_smiles
+from chemscii.parsers.identifiers import (
+    classify_identifier,
+    looks_like_smiles,
+    parse_cid,
+)
+from chemscii.parsers.inchi import inchi_to_smiles
 from chemscii.parsers.molecule import parse_sdf, parse_smiles
 from chemscii.parsers.name import name_to_smiles
 from tests.fixtures.molecules import (
@@ -267,3 +273,107 @@ class TestChemblToSmiles:
         if smiles is not None:
             mol = parse_smiles(smiles)
             assert mol is not None
+
+
+class TestClassifyIdentifier:
+    """Tests for lexical identifier classification."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "value,expected",
+        [
+            ("CHEMBL25", ("chembl", "CHEMBL25")),
+            ("chembl113", ("chembl", "CHEMBL113")),
+            ("CID2244", ("cid", "2244")),
+            ("CID 2244", ("cid", "2244")),
+            ("InChI=1S/CH4/h1H4", ("inchi", "InChI=1S/CH4/h1H4")),
+            ("InChI=1/CH4/h1H4", ("inchi", "InChI=1/CH4/h1H4")),
+            (
+                "BSYNRYMUTXBXSQ-UHFFFAOYSA-N",
+                ("inchikey", "BSYNRYMUTXBXSQ-UHFFFAOYSA-N"),
+            ),
+            ("50-78-2", ("cas", "50-78-2")),
+            ("7732-18-5", ("cas", "7732-18-5")),
+        ],
+    )
+    def test_recognized(self, value: str, expected: tuple[str, str]) -> None:
+        """Test that identifiers are recognized and normalized."""
+        assert classify_identifier(value) == expected
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "value",
+        [
+            "50-78-3",
+            "CCO",
+            "aspirin",
+            "CHEMBL",
+            "CID0",
+            "2244",
+            "InChI=1S/",
+            "BSYNRYMUTXBXSQ-UHFF",
+        ],
+    )
+    def test_not_recognized(self, value: str) -> None:
+        """Test that other inputs and bad CAS check digits are rejected."""
+        assert classify_identifier(value) is None
+
+
+class TestParseCid:
+    """Tests for PubChem CID parsing."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "value,expected",
+        [
+            ("2244", 2244),
+            ("CID2244", 2244),
+            ("cid:2244", 2244),
+            (" CID 2244 ", 2244),
+            ("0", None),
+            ("CID", None),
+            ("aspirin", None),
+        ],
+    )
+    def test_parse(self, value: str, expected: int | None) -> None:
+        """Test that bare and prefixed CIDs are parsed."""
+        assert parse_cid(value) == expected
+
+
+class TestLooksLikeSmiles:
+    """Tests for the SMILES pre-check."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "value",
+        [
+            "CCO",
+            "c1ccccc1",
+            "CC(=O)Oc1ccccc1C(=O)O",
+            "[Na+].[Cl-]",
+            "C[C@@H](N)C(=O)O",
+            "ClC(Br)I",
+            "C%10CCCCC%10",
+            "F/C=C/F",
+        ],
+    )
+    def test_plausible(self, value: str) -> None:
+        """Test that SMILES strings pass."""
+        assert looks_like_smiles(value)
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "value",
+        ["aspirin", "acetic acid", "benzene", "Caffeine", "CC O", "C[NH3+"],
+    )
+    def test_ruled_out(self, value: str) -> None:
+        """Test that names and malformed strings are ruled out."""
+        assert not looks_like_smiles(value)
+
+
+class TestInchiToSmiles:
+    """Tests for local InChI conversion."""
+
+    def test_ethanol(self) -> None:
+        """Test converting a standard InChI."""
+        assert inchi_to_smiles("InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3") == "CCO"
+
+    def test_invalid(self) -> None:
+        """Test that unparsable InChI strings give None."""
+        assert inchi_to_smiles("InChI=1S/not-an-inchi") is None
+        assert inchi_to_smiles("") is None
@@ -0,0 +1,326 @@
+"""Tests for remote fetching, retries and circuit breaking."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, unquote
+
+import pytest
+
+from chemscii.parsers import chembl, pubchem
+from chemscii.parsers.remote import (
+    OFFLINE_ENV,
+    CircuitBreaker,
+    fetch,
+    get_breaker,
+    max_fetch_time,
+    reset_breakers,
+    set_offline,
+)
+
+
+class FakeServer(ThreadingHTTPServer):
+    """Local HTTP server replaying queued responses."""
+
+    def __init__(self) -> None:
+        """Start listening on a free local port."""
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.responses: list[tuple[int, bytes]] = []
+        self.paths: list[str] = []
+        self.bodies: list[bytes] = []
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers each request with the next queued response."""
+
+    server: FakeServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Send the next queued response, or 200 with an empty body."""
+        self.server.paths.append(self.path)
+        self._respond()
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Record the request body and send the next queued response."""
+        self.server.paths.append(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.bodies.append(self.rfile.read(length))
+        self._respond()
+
+    def _respond(self) -> None:
+        """Send the next queued response, or 200 with an empty body."""
+        status, body = (
+            self.server.responses.pop(0) if self.server.responses else (200, b"")
+        )
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Keep test output quiet."""
+
+
+@pytest.fixture  # type: ignore[misc]
+def server() -> Iterator[FakeServer]:
+    """Run a fake server for one test."""
+    fake = FakeServer()
+    thread = threading.Thread(
+        target=fake.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield fake
+    fake.shutdown()
+    fake.server_close()
+
+
+@pytest.fixture(autouse=True)  # type: ignore[misc]
+def fresh_state(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Start every test online with closed circuits."""
+    monkeypatch.delenv(OFFLINE_ENV, raising=False)
+    set_offline(False)
+    reset_breakers()
+    yield
+    set_offline(False)
+    reset_breakers()
+
+
+class TestFetch:
+    """Tests for fetching with retries."""
+
+    def test_success(self, server: FakeServer) -> None:
+        """Test that a successful response is returned."""
+        server.responses = [(200, b"CCO")]
+        assert fetch(f"{server.url}/a", backoff=0) == b"CCO"
+
+    def test_not_found_is_not_retried(self, server: FakeServer) -> None:
+        """Test that a 404 answer returns None after one request."""
+        server.responses = [(404, b"")]
+        assert fetch(f"{server.url}/a", backoff=0) is None
+        assert len(server.paths) == 1
+        assert get_breaker(server.url).failures == 0
+
+    def test_server_error_is_retried(self, server: FakeServer) -> None:
+        """Test that server errors are retried until one succeeds."""
+        server.responses = [(503, b""), (500, b""), (200, b"CCO")]
+        assert fetch(f"{server.url}/a", retries=2, backoff=0.001) == b"CCO"
+        assert len(server.paths) == 3
+
+    def test_retries_exhausted(self, server: FakeServer) -> None:
+        """Test that a fetch fails after its last retry."""
+        server.responses = [(500, b"")] * 3
+        assert fetch(f"{server.url}/a", retries=1, backoff=0) is None
+        assert len(server.paths) == 2
+        assert get_breaker(server.url).failures == 1
+
+    def test_truncated_response_is_retried(self) -> None:
+        """Test that a response cut short counts as a failed attempt."""
+        with patch(
+            "chemscii.parsers.remote.request.urlopen",
+            side_effect=http.client.IncompleteRead(b"CC"),
+        ) as urlopen:
+            assert fetch("http://example.invalid/a", backoff=0) is None
+        assert urlopen.call_count == 3
+        assert get_breaker("http://example.invalid/a").failures == 1
+
+    def test_offline_mode(self, server: FakeServer) -> None:
+        """Test that offline mode never touches the network."""
+        set_offline(True)
+        assert fetch(f"{server.url}/a") is None
+        assert server.paths == []
+
+    def test_offline_environment(
+        self, server: FakeServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the environment variable enables offline mode."""
+        monkeypatch.setenv(OFFLINE_ENV, "1")
+        assert fetch(f"{server.url}/a") is None
+        assert server.paths == []
+
+    def test_open_circuit_fails_fast(self) -> None:
+        """Test that an unreachable host stops being called."""
+        # Nothing listens on port 9 of localhost, so connections are refused
+        url = "http://127.0.0.1:9/a"
+        for _ in range(3):
+            assert fetch(url, retries=0, timeout=1) is None
+        assert get_breaker(url).is_open
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            assert fetch(url, retries=0, timeout=1) is None
+        assert time.perf_counter() - start < 0.5
+
+
+class TestCircuitBreaker:
+    """Tests for circuit breaker state changes."""
+
+    def test_opens_at_threshold(self) -> None:
+        """Test that the circuit opens after consecutive failures."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow()
+
+    def test_success_resets_count(self) -> None:
+        """Test that a success clears earlier failures."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert not breaker.is_open
+
+    def test_single_probe_after_timeout(self) -> None:
+        """Test that one probe is let through after the reset timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+        assert not breaker.is_open
+
+    def test_failed_probe_reopens(self) -> None:
+        """Test that a failed probe keeps the circuit open."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+
+    def test_probe_error_reopens(self) -> None:
+        """Test that a probe ending in an unexpected error is not stuck."""
+        url = "http://example.invalid/a"
+        breaker = get_breaker(url)
+        breaker.reset_timeout = 0.01
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        time.sleep(0.02)
+        with patch(
+            "chemscii.parsers.remote.request.urlopen",
+            side_effect=ValueError("bad response"),
+        ) as urlopen:
+            with pytest.raises(ValueError, match="bad response"):
+                fetch(url, backoff=0)
+            assert urlopen.call_count == 1
+            time.sleep(0.02)
+            urlopen.side_effect = http.client.RemoteDisconnected("closed")
+            assert fetch(url, backoff=0) is None
+            # The probe is a single attempt
+            assert urlopen.call_count == 2
+        assert breaker.is_open
+        time.sleep(0.02)
+        assert breaker.allow()
+
+    def test_probe_recovers_host(self, server: FakeServer) -> None:
+        """Test that a recovered host is called again after a probe."""
+        breaker = get_breaker(server.url)
+        breaker.reset_timeout = 0.01
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        assert fetch(f"{server.url}/a") is None
+        time.sleep(0.02)
+        server.responses = [(200, b"CCO")]
+        assert fetch(f"{server.url}/a") == b"CCO"
+        assert not breaker.is_open
+
+
+class TestQueryServices:
+    """Tests for the PubChem and ChEMBL queries against a fake server."""
+
+    def test_pubchem_query(
+        self, server: FakeServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a PubChem name query, keeping the first of several matches."""
+        monkeypatch.setattr(pubchem, "PUBCHEM_URL", server.url)
+        server.responses = [(200, b"CCO\nC(C)O\n")]
+        assert pubchem.query_pubchem("ethyl alcohol") == "CCO"
+        assert server.paths == [
+            "/compound/name/ethyl%20alcohol/property/CanonicalSMILES/TXT"
+        ]
+
+    def test_chembl_query(
+        self, server: FakeServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a ChEMBL molecule query."""
+        monkeypatch.setattr(chembl, "CHEMBL_URL", server.url)
+        server.responses = [
+            (200, b'{"molecule_structures": {"canonical_smiles": "CCO"}}'),
+            (200, b"not json"),
+        ]
+        assert chembl.query_chembl("CHEMBL545") == "CCO"
+        assert chembl.query_chembl("CHEMBL545") is None
+        assert server.paths[0] == "/molecule/CHEMBL545.json"
+
+    def test_chembl_inchikey_batches(
+        self, server: FakeServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that InChIKeys are looked up in batched ChEMBL queries."""
+        monkeypatch.setattr(chembl, "CHEMBL_URL", server.url)
+        keys = [f"{i:014d}".replace("0", "A") + "-UHFFFAOYSA-N" for i in range(120)]
+        molecule = (
+            b'{"molecules": [{"molecule_structures": {"canonical_smiles": "CCO",'
+            b' "standard_inchi_key": "%s"}}]}' % keys[0].encode()
+        )
+        server.responses = [(200, molecule), (200, b"{}"), (500, b"")] + [
+            (500, b"")
+        ] * 2
+        found = chembl.query_chembl_inchikeys(keys)
+        assert found == {keys[0]: "CCO"}
+        assert len(server.paths) == 5
+        assert "standard_inchi_key__in=" in server.paths[0]
+        assert keys[49] in unquote(server.paths[0])
+        assert keys[50] in unquote(server.paths[1])
+
+    def test_pubchem_cid_batches(
+        self, server: FakeServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that CIDs are fetched with batched property requests."""
+        monkeypatch.setattr(pubchem, "PUBCHEM_URL", server.url)
+        table = {
+            "PropertyTable": {
+                "Properties": [
+                    {"CID": 702, "SMILES": "CCO"},
+                    {"CID": 2244, "ConnectivitySMILES": "CC(=O)OC1=CC=CC=C1C(=O)O"},
+                    {"CID": 241, "CanonicalSMILES": "C1=CC=CC=C1"},
+                    {"CID": 5},
+                ]
+            }
+        }
+        server.responses = [(200, json.dumps(table).encode()), (404, b"")]
+        cids: list[int | str] = ["CID702", 2244, "cid:241", 702, "x"]
+        cids += list(range(1000, 1600))
+        found = pubchem.cids_to_smiles(cids)
+        assert found == {
+            702: "CCO",
+            2244: "CC(=O)OC1=CC=CC=C1C(=O)O",
+            241: "C1=CC=CC=C1",
+        }
+        assert server.paths == ["/compound/cid/property/SMILES/JSON"] * 2
+        first = parse_qs(server.bodies[0].decode())["cid"][0].split(",")
+        assert first[:3] == ["702", "2244", "241"]
+        assert len(first) == 500
+
+
+class TestMaxFetchTime:
+    """Tests for the worst-case fetch duration."""
+
+    def test_covers_retries_and_backoff(self) -> None:
+        """Test that every attempt and the delays between them are counted."""
+        assert max_fetch_time(10.0, 2, 0.25) == 30.75
+        assert max_fetch_time(5.0, 0, 1.0) == 5.0
@@ -1,13 +1,35 @@
 """Tests for chemscii.renderers module."""
 
 import math
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from rdkit.Chem import rdDepictor
 
 from chemscii.layout.atoms import AtomLayout
 from chemscii.layout.bonds import BondLayout
+from chemscii.layout.preprocess import Preprocessor
+from chemscii.layout.result import compute_layout
 from chemscii.parsers.molecule import parse_smiles
 from chemscii.renderers.ascii import AsciiRenderer
+from chemscii.renderers.braille import BrailleRenderer
+from chemscii.renderers.glyphs import DOUBLE_VERTICAL, LABEL, bond_glyphs
+from chemscii.renderers.grid import GridRenderer
+from chemscii.renderers.multi import MultiRenderer
 from chemscii.renderers.unicode import UnicodeRenderer
-from tests.fixtures.molecules import BENZENE, ETHANOL, ETHENE, ETHYNE, METHANE
+from tests.fixtures.molecules import (
+    AMINE_SALT,
+    BENZENE,
+    BOC_PEPTIDE,
+    ETHANOL,
+    ETHENE,
+    ETHYNE,
+    METHANE,
+)
 
 
 class TestAsciiRenderer:
@@ -173,6 +195,43 @@ class TestAsciiRenderer:
         for line in lines:
             assert len(line) <= width
 
+    def test_render_layout_matches_render(self) -> None:
+        """Test that rendering a layout result matches the list-based API."""
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        layout = compute_layout(mol)
+        atom_layout = AtomLayout(mol)
+        positions = atom_layout.compute_positions()
+        bonds = BondLayout(mol, positions).compute_bond_lines()
+        renderer = AsciiRenderer(width=40, height=20)
+        expected = renderer.render(positions, bonds, atom_layout.get_symbols())
+        assert renderer.render_layout(layout) == expected
+
+    def test_render_molecule_with_preprocessor(self) -> None:
+        """Test that the preprocessor removes salts before rendering."""
+        mol = parse_smiles(AMINE_SALT)
+        assert mol is not None
+        renderer = AsciiRenderer(
+            width=40, height=20, color=False, preprocessor=Preprocessor()
+        )
+        result = renderer.render_molecule(mol)
+        assert "N" in result
+        assert "Cl" not in result
+
+    def test_render_superatom_label(self) -> None:
+        """Test that multi-character superatom labels are drawn in full."""
+        mol = parse_smiles(BOC_PEPTIDE)
+        assert mol is not None
+        renderer = AsciiRenderer(
+            width=80,
+            height=20,
+            color=False,
+            preprocessor=Preprocessor(abbreviate=True),
+        )
+        result = renderer.render_molecule(mol)
+        assert "Boc" in result
+        assert "PEG4" in result
+
     def test_transform_single_point(self) -> None:
         """Test transformation of single point."""
         renderer = AsciiRenderer(width=40, height=20)
@@ -180,6 +239,96 @@ class TestAsciiRenderer:
         assert len(transform) == 4
 
 
+class TestAutoSize:
+    """Tests for geometry-based automatic canvas sizing."""
+
+    def test_auto_size_follows_geometry(self) -> None:
+        """Test that a long chain gets a wide, short canvas."""
+        mol = parse_smiles("C" * 30)
+        assert mol is not None
+        renderer = AsciiRenderer(color=False)
+        result = renderer.render_molecule(mol)
+        lines = result.split("\n")
+        assert len(lines) < 20
+        assert max(len(line) for line in lines) > 60
+
+    def test_auto_size_scales_with_bond_length(self) -> None:
+        """Test that canvas size does not depend on coordinate units."""
+        coords = np.array([(0.0, 0.0), (1.5, 0.0), (3.0, 0.0)])
+        segments = np.array([(0.0, 0.0, 1.5, 0.0), (1.5, 0.0, 3.0, 0.0)])
+        renderer = AsciiRenderer(color=False)
+        size = renderer._auto_size(coords, segments, ["C", "C", "C"])
+        scaled_size = renderer._auto_size(coords * 10, segments * 10, ["C"] * 3)
+        assert size == scaled_size
+
+    def test_auto_size_bond_cells(self) -> None:
+        """Test that fewer cells per bond give a smaller canvas."""
+        coords = np.array([(0.0, 0.0), (15.0, 0.0), (150.0, 150.0)])
+        segments = np.array([(0.0, 0.0, 15.0, 0.0), (15.0, 0.0, 30.0, 0.0)])
+        default = AsciiRenderer(color=False)._auto_size(coords, segments, ["C"] * 3)
+        small = AsciiRenderer(color=False, bond_cells=3)._auto_size(
+            coords, segments, ["C"] * 3
+        )
+        assert small[0] < default[0] and small[1] < default[1]
+
+    def test_auto_size_minimum(self) -> None:
+        """Test that a single atom gets the minimum canvas."""
+        renderer = AsciiRenderer()
+        coords = np.zeros((1, 2))
+        segments = np.empty((0, 4))
+        assert renderer._auto_size(coords, segments, ["C"]) == (10, 10)
+
+    def test_auto_size_capped_at_terminal_width(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the width is capped when writing to a terminal."""
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        monkeypatch.setattr(
+            shutil, "get_terminal_size", lambda: os.terminal_size((40, 24))
+        )
+        mol = parse_smiles("C" * 30)
+        assert mol is not None
+        renderer = AsciiRenderer(color=False)
+        result = renderer.render_molecule(mol)
+        assert all(len(line) <= 40 for line in result.split("\n"))
+
+    def test_auto_size_does_not_persist(self) -> None:
+        """Test that an auto-sized render leaves the renderer unchanged."""
+        long_chain = parse_smiles("C" * 30)
+        small = parse_smiles("CCO")
+        assert long_chain is not None and small is not None
+        renderer = AsciiRenderer(color=False)
+        fresh = AsciiRenderer(color=False).render_molecule(small)
+        renderer.render_molecule(long_chain)
+        assert renderer.width == -1
+        assert renderer.height == -1
+        assert renderer.render_molecule(small) == fresh
+
+
+class TestConcurrency:
+    """Tests for sharing renderer instances between threads."""
+
+    def test_shared_renderer_in_thread_pool(self) -> None:
+        """Test that one renderer gives the same results from many threads."""
+        smiles = ["CCO", "c1ccccc1", "C" * 20, "CC(=O)Oc1ccccc1C(=O)O"] * 4
+        mols = [parse_smiles(s) for s in smiles]
+        renderer = UnicodeRenderer()
+        expected = [UnicodeRenderer().render_layout(compute_layout(m)) for m in mols]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(
+                pool.map(lambda m: renderer.render_layout(compute_layout(m)), mols)
+            )
+        assert results == expected
+
+    def test_depiction_leaves_global_preference(self) -> None:
+        """Test that CoordGen depiction does not flip RDKit's global setting."""
+        before = rdDepictor.GetPreferCoordGen()
+        mol = parse_smiles("c1ccccc1O")
+        assert mol is not None
+        AsciiRenderer().render_molecule(mol)
+        assert rdDepictor.GetPreferCoordGen() == before
+
+
 class TestUnicodeRenderer:
     """Tests for Unicode rendering."""
 
@@ -350,3 +499,164 @@ class TestUnicodeRenderer:
         renderer = UnicodeRenderer(width=40, height=20)
         transform = renderer._compute_transform([(0.0, 0.0)])
         assert len(transform) == 4
+
+
+class TestMultiRenderer:
+    """Tests for rendering one layout to several formats."""
+
+    def test_matches_single_renderers(self) -> None:
+        """Test that each format matches its standalone renderer."""
+        mol = parse_smiles("CC(=O)Oc1ccccc1C(=O)O")
+        assert mol is not None
+        layout = compute_layout(mol)
+        results = MultiRenderer(width=40, height=20).render_layout(layout)
+        assert list(results) == ["ascii", "unicode"]
+        ascii_renderer = AsciiRenderer(width=40, height=20)
+        unicode_renderer = UnicodeRenderer(width=40, height=20)
+        assert results["ascii"] == ascii_renderer.render_layout(layout)
+        assert results["unicode"] == unicode_renderer.render_layout(layout)
+
+    def test_color_mode(self) -> None:
+        """Test that the color mode reaches the ASCII output."""
+        layout = compute_layout(parse_smiles(ETHANOL))
+        results = MultiRenderer(color_mode="truecolor").render_layout(layout)
+        assert "\033[38;2;" in results["ascii"]
+        assert "\033[38;2;" not in MultiRenderer().render_layout(layout)["ascii"]
+
+    def test_rasterizes_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the bonds are rasterized once for all formats."""
+        calls = []
+        original = AsciiRenderer._draw_bonds
+
+        def counting(self: AsciiRenderer, *args: object) -> None:
+            calls.append(1)
+            original(self, *args)  # type: ignore[arg-type]
+
+        monkeypatch.setattr(AsciiRenderer, "_draw_bonds", counting)
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        MultiRenderer(formats=["ascii", "unicode"]).render_molecule(mol)
+        assert len(calls) == 1
+
+    def test_unknown_format(self) -> None:
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError, match="Unknown render format"):
+            MultiRenderer(formats=["ascii", "sixel"])
+
+    def test_bond_glyphs(self) -> None:
+        """Test glyph classes for vertical double bonds and labels."""
+        glyphs = bond_glyphs(
+            np.array([math.pi / 2, 0.0]), np.array([2, 2], dtype=np.int32)
+        )
+        assert glyphs[0] == DOUBLE_VERTICAL
+        mol = parse_smiles(ETHANOL)
+        assert mol is not None
+        canvas = UnicodeRenderer(width=20, height=10).rasterize(compute_layout(mol))
+        assert (canvas.glyphs == LABEL).sum() == 3
+        assert [symbol for _, _, symbol in canvas.labels] == ["C", "C", "O"]
+
+
+class TestGridRenderer:
+    """Tests for rendering many molecules into one grid."""
+
+    def test_cells_match_single_renders(self) -> None:
+        """Test that each cell holds the molecule's standalone rendering."""
+        mols = [parse_smiles(s) for s in (ETHANOL, BENZENE, ETHYNE)]
+        layouts = [compute_layout(mol) for mol in mols]
+        cell = UnicodeRenderer(width=20, height=10)
+        result = GridRenderer(cell, mols_per_row=2).render_layouts(layouts)
+        lines = result.split("\n")
+        assert len(lines) <= 20
+        for i, layout in enumerate(layouts):
+            x, y = (i % 2) * 20, (i // 2) * 10
+            cell_lines = [line[x : x + 20].rstrip() for line in lines[y : y + 10]]
+            expected = cell.render_layout(layout).split("\n")
+            assert "\n".join(cell_lines).rstrip() == "\n".join(expected)
+
+    def test_legends(self) -> None:
+        """Test that legends are drawn under each cell."""
+        mols = [parse_smiles(ETHANOL), parse_smiles(BENZENE)]
+        renderer = GridRenderer(AsciiRenderer(width=20, height=8, color=False))
+        result = renderer.render_molecules(mols, legends=["ethanol", "benzene"])
+        legend_line = result.split("\n")[8]
+        assert "ethanol" in legend_line[:20]
+        assert "benzene" in legend_line[20:]
+
+    def test_parallel_layouts(self) -> None:
+        """Test that layouts computed in worker processes match in-process."""
+        mols = [parse_smiles(s) for s in (ETHANOL, BENZENE, ETHENE, METHANE)] * 5
+        serial = GridRenderer(workers=1).render_molecules(mols)
+        parallel = GridRenderer(workers=2).render_molecules(mols)
+        assert parallel == serial
+
+    def test_empty(self) -> None:
+        """Test that an empty grid renders as an empty string."""
+        assert GridRenderer().render_layouts([]) == ""
+
+    def test_requires_fixed_cell_size(self) -> None:
+        """Test that auto-sized cell renderers are rejected."""
+        with pytest.raises(ValueError, match="fixed"):
+            GridRenderer(UnicodeRenderer())
+
+    def test_rejects_braille(self) -> None:
+        """Test that braille cell renderers are rejected."""
+        with pytest.raises(TypeError, match="BrailleRenderer"):
+            GridRenderer(BrailleRenderer(width=20, height=6))
+
+
+def _braille_dots(text: str) -> int:
+    """Count the raised dots in braille text."""
+    return sum(
+        bin(ord(c) - 0x2800).count("1") for c in text if 0x2800 <= ord(c) < 0x2900
+    )
+
+
+class TestBrailleRenderer:
+    """Tests for braille subpixel rendering."""
+
+    def test_render_empty_positions(self) -> None:
+        """Test rendering with empty positions."""
+        assert BrailleRenderer().render([], [], []) == ""
+
+    def test_labels_heteroatoms_only(self) -> None:
+        """Test that heteroatoms are labeled and bonded carbons are not."""
+        mol = parse_smiles(ETHANOL)
+        assert mol is not None
+        result = BrailleRenderer().render_molecule(mol)
+        assert "O" in result
+        assert "C" not in result
+        assert _braille_dots(result) > 0
+
+    def test_single_atom_labeled(self) -> None:
+        """Test that an isolated carbon keeps its label."""
+        mol = parse_smiles(METHANE)
+        assert mol is not None
+        assert BrailleRenderer().render_molecule(mol).strip() == "C"
+
+    def test_double_bond_strokes(self) -> None:
+        """Test that a double bond raises more dots than a single bond."""
+        coords = [(0.0, 0.0), (1.5, 0.0)]
+        renderer = BrailleRenderer(width=20, height=6)
+        single = renderer.render(coords, [(coords[0], coords[1], 1)], ["C", "C"])
+        double = renderer.render(coords, [(coords[0], coords[1], 2)], ["C", "C"])
+        assert _braille_dots(double) > _braille_dots(single)
+
+    def test_output_fits_dimensions(self) -> None:
+        """Test that output fits within specified dimensions."""
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        result = BrailleRenderer(width=30, height=10).render_molecule(mol)
+        lines = result.split("\n")
+        assert len(lines) <= 10
+        assert all(len(line) <= 30 for line in lines)
+
+    def test_render_layout_matches_render(self) -> None:
+        """Test that rendering a layout result matches the list-based API."""
+        mol = parse_smiles(BENZENE)
+        assert mol is not None
+        layout = compute_layout(mol)
+        positions = [(x, y) for x, y in layout.coords.tolist()]
+        bonds = [(positions[b], positions[e], o) for b, e, o in layout.bonds.tolist()]
+        renderer = BrailleRenderer()
+        expected = renderer.render(positions, bonds, list(layout.symbols))
+        assert renderer.render_layout(layout) == expected
@@ -0,0 +1,365 @@
+"""Tests for the resolver chain."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from chemscii.parsers import resolver
+from chemscii.parsers.name_index import NameIndex
+from chemscii.parsers.remote import max_fetch_time
+from chemscii.parsers.resolver import (
+    DiskCacheBackend,
+    LocalDatabaseBackend,
+    MemoryBackend,
+    RemoteBackend,
+    ResolverBackend,
+    ResolverChain,
+    default_resolver,
+)
+
+
+class FakeBackend(ResolverBackend):
+    """Backend answering from a dict after an optional delay."""
+
+    def __init__(
+        self,
+        name: str,
+        answers: dict[str, str],
+        delays: list[float] | None = None,
+        timeout: float | None = None,
+        hedge_after: float | None = None,
+    ) -> None:
+        """Initialize the backend."""
+        super().__init__(timeout, hedge_after)
+        self.name = name
+        self.answers = answers
+        self.delays = list(delays or [])
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def resolve(self, input_type: str, value: str) -> str | None:
+        """Answer after the next configured delay."""
+        with self._lock:
+            self.calls += 1
+            delay = self.delays.pop(0) if self.delays else 0.0
+        time.sleep(delay)
+        return self.answers.get(value)
+
+
+class FailingBackend(ResolverBackend):
+    """Backend that always raises."""
+
+    name = "failing"
+
+    def resolve(self, input_type: str, value: str) -> str | None:
+        """Raise an error."""
+        raise OSError("unreachable")
+
+
+class TestResolverChain:
+    """Tests for chain ordering, timeouts and hedging."""
+
+    def test_first_answer_wins(self) -> None:
+        """Test that backends are tried in order and the answer is reported."""
+        fast = FakeBackend("fast", {"a": "C"})
+        slow = FakeBackend("slow", {"a": "CC", "b": "CCC"})
+        chain = ResolverChain([fast, slow])
+
+        resolution = chain.resolve("name", "a")
+        assert resolution is not None
+        assert (resolution.smiles, resolution.backend) == ("C", "fast")
+        assert resolution.elapsed >= 0
+        assert slow.calls == 0
+
+        resolution = chain.resolve("name", "b")
+        assert resolution is not None
+        assert (resolution.smiles, resolution.backend) == ("CCC", "slow")
+
+    def test_miss_everywhere(self) -> None:
+        """Test that an unknown identifier resolves to None."""
+        chain = ResolverChain([FakeBackend("only", {})])
+        assert chain.resolve("name", "missing") is None
+
+    def test_answers_stored_in_earlier_backends(self) -> None:
+        """Test that a later answer is cached by the memory backend."""
+        remote = FakeBackend("remote", {"Nicotine": "CN1CCCC1c1cccnc1"})
+        chain = ResolverChain([MemoryBackend(), remote])
+        first = chain.resolve("name", "Nicotine")
+        second = chain.resolve("name", "nicotine")
+        assert first is not None and second is not None
+        assert (first.backend, second.backend) == ("remote", "memory")
+        assert remote.calls == 1
+
+    def test_timeout_moves_to_next_backend(self) -> None:
+        """Test that a slow backend is abandoned after its timeout."""
+        slow = FakeBackend("slow", {"a": "C"}, delays=[2.0], timeout=0.05)
+        fallback = FakeBackend("fallback", {"a": "CC"})
+        start = time.perf_counter()
+        resolution = ResolverChain([slow, fallback]).resolve("name", "a")
+        assert resolution is not None
+        assert resolution.backend == "fallback"
+        assert time.perf_counter() - start < 1.0
+
+    def test_failing_backend_skipped(self) -> None:
+        """Test that errors in a timed backend count as misses."""
+        failing = FailingBackend(timeout=1.0)
+        chain = ResolverChain([failing, FakeBackend("ok", {"a": "C"})])
+        resolution = chain.resolve("name", "a")
+        assert resolution is not None
+        assert resolution.backend == "ok"
+
+    def test_failing_untimed_backend_skipped(self) -> None:
+        """Test that errors in a backend without a timeout count as misses."""
+        chain = ResolverChain([FailingBackend(), FakeBackend("ok", {"a": "C"})])
+        resolution = chain.resolve("name", "a")
+        assert resolution is not None
+        assert resolution.backend == "ok"
+
+    def test_hedged_request_wins(self) -> None:
+        """Test that a second request answers when the first is slow."""
+        backend = FakeBackend(
+            "remote", {"a": "C"}, delays=[2.0, 0.0], timeout=1.5, hedge_after=0.05
+        )
+        start = time.perf_counter()
+        resolution = ResolverChain([backend]).resolve("name", "a")
+        assert resolution is not None
+        assert resolution.smiles == "C"
+        assert backend.calls == 2
+        assert time.perf_counter() - start < 1.0
+
+    def test_no_hedge_when_fast(self) -> None:
+        """Test that a prompt miss does not trigger a hedged request."""
+        backend = FakeBackend("remote", {}, timeout=1.0, hedge_after=0.5)
+        assert ResolverChain([backend]).resolve("name", "a") is None
+        assert backend.calls == 1
+
+
+class BatchBackend(FakeBackend):
+    """Fake backend answering batches in one call."""
+
+    # Identifiers answered per call
+    size = 100
+
+    def resolve_many(self, input_type: str, values: Sequence[str]) -> dict[str, str]:
+        """Answer a whole batch at once, after the next configured delay."""
+        with self._lock:
+            self.calls += 1
+            delay = self.delays.pop(0) if self.delays else 0.0
+        time.sleep(delay)
+        return {v: self.answers[v] for v in values if v in self.answers}
+
+    def batch_size(self, input_type: str) -> int:
+        """Get the number of identifiers answered per call."""
+        return self.size
+
+
+class TestResolveMany:
+    """Tests for batch resolution."""
+
+    def test_each_backend_sees_only_misses(self) -> None:
+        """Test that later backends get only the unresolved identifiers."""
+        memory = MemoryBackend()
+        memory.store("inchikey", "K1", "C")
+        remote = BatchBackend("remote", {"K2": "CC", "K3": "CCC"})
+        chain = ResolverChain([memory, remote])
+
+        found = chain.resolve_many("inchikey", ["K1", "K2", "K3", "K4", "K2"])
+        assert {k: r.smiles for k, r in found.items()} == {
+            "K1": "C",
+            "K2": "CC",
+            "K3": "CCC",
+        }
+        assert found["K1"].backend == "memory"
+        assert found["K3"].backend == "remote"
+        assert remote.calls == 1
+
+        found = chain.resolve_many("inchikey", ["K2", "K3"])
+        assert {r.backend for r in found.values()} == {"memory"}
+        assert remote.calls == 1
+
+    def test_remote_cids_batched(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the remote backend fetches a CID list in one call."""
+        calls: list[list[int]] = []
+
+        def fake_query(cids: list[int]) -> dict[int, str]:
+            calls.append(list(cids))
+            return {cid: "C" * cid for cid in cids if cid < 4}
+
+        monkeypatch.setattr(resolver, "query_pubchem_cids", fake_query)
+        found = ResolverChain([RemoteBackend()]).resolve_many(
+            "cid", ["1", "2", "3", "9"]
+        )
+        assert {k: r.smiles for k, r in found.items()} == {
+            "1": "C",
+            "2": "CC",
+            "3": "CCC",
+        }
+        assert calls == [[1, 2, 3, 9]]
+
+    def test_remote_inchikeys_fall_back_to_pubchem(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that InChIKeys missing from ChEMBL are looked up in PubChem."""
+        chembl_calls: list[list[str]] = []
+        pubchem_calls: list[str] = []
+
+        def fake_chembl(keys: list[str]) -> dict[str, str]:
+            chembl_calls.append(list(keys))
+            return {"K1": "C"} if "K1" in keys else {}
+
+        def fake_pubchem(key: str) -> str | None:
+            pubchem_calls.append(key)
+            return "CC" if key == "K2" else None
+
+        monkeypatch.setattr(resolver, "query_chembl_inchikeys", fake_chembl)
+        monkeypatch.setattr(resolver, "query_pubchem", fake_pubchem)
+        backend = RemoteBackend()
+        assert backend.resolve_many("inchikey", ["k1", "K2", "K3"]) == {
+            "k1": "C",
+            "K2": "CC",
+        }
+        assert chembl_calls == [["K1", "K2", "K3"]]
+        assert pubchem_calls == ["K2", "K3"]
+        assert backend.resolve("inchikey", "K2") == "CC"
+
+    def test_batch_timeout(self) -> None:
+        """Test that a slow batch is abandoned after the backend timeout."""
+        slow = FakeBackend("slow", {"K1": "C"}, delays=[1.0], timeout=0.05)
+        chain = ResolverChain([slow, BatchBackend("fallback", {"K1": "CC"})])
+        found = chain.resolve_many("inchikey", ["K1"])
+        assert found["K1"].backend == "fallback"
+
+    def test_batch_deadline_scales_with_chunks(self) -> None:
+        """Test that each chunk of a timed batch gets the backend timeout."""
+        backend = BatchBackend(
+            "remote", {"K1": "C", "K3": "CCC"}, delays=[0.1, 0.1], timeout=0.15
+        )
+        backend.size = 2
+        found = ResolverChain([backend]).resolve_many("inchikey", ["K1", "K2", "K3"])
+        assert {k: r.smiles for k, r in found.items()} == {"K1": "C", "K3": "CCC"}
+        assert backend.calls == 2
+
+    def test_batch_keeps_chunks_found_in_time(self) -> None:
+        """Test that a slow chunk does not discard earlier answers."""
+        backend = BatchBackend(
+            "remote", {"K1": "C", "K3": "CCC"}, delays=[0.0, 2.0], timeout=0.05
+        )
+        backend.size = 2
+        start = time.perf_counter()
+        found = ResolverChain([backend]).resolve_many("inchikey", ["K1", "K2", "K3"])
+        assert {k: r.smiles for k, r in found.items()} == {"K1": "C"}
+        assert time.perf_counter() - start < 1.0
+
+    def test_failing_backend_skipped(self) -> None:
+        """Test that a batch still resolves past a failing backend."""
+        chain = ResolverChain([FailingBackend(), BatchBackend("ok", {"K1": "C"})])
+        found = chain.resolve_many("inchikey", ["K1", "K2"])
+        assert found["K1"].backend == "ok"
+        assert "K2" not in found
+
+
+class TestResolveIdentifiers:
+    """Tests for resolving lists of mixed identifiers."""
+
+    def test_grouped_by_type(self) -> None:
+        """Test that each identifier type is resolved as one batch."""
+        backend = BatchBackend(
+            "remote",
+            {"CHEMBL1": "C", "LFQSCWFLJHTTHZ-UHFFFAOYSA-N": "CCO", "water": "O"},
+        )
+        smiles = ResolverChain([backend]).resolve_identifiers(
+            [
+                "chembl1",
+                "LFQSCWFLJHTTHZ-UHFFFAOYSA-N",
+                "water",
+                "",
+                "CHEMBL2",
+                "CHEMBL1",
+            ]
+        )
+        assert smiles == ["C", "CCO", "O", None, None, "C"]
+        assert backend.calls == 3
+
+    def test_given_type(self) -> None:
+        """Test that a given type skips classification."""
+        backend = BatchBackend("remote", {"2244": "CC(=O)Oc1ccccc1C(=O)O"})
+        smiles = ResolverChain([backend]).resolve_identifiers(
+            ["2244", "1"], input_type="cid"
+        )
+        assert smiles == ["CC(=O)Oc1ccccc1C(=O)O", None]
+        assert backend.calls == 1
+
+
+class TestBackends:
+    """Tests for the standard backends."""
+
+    def test_remote_waits_for_retries(self) -> None:
+        """Test that the chain does not abandon a remote lookup mid-retry."""
+        assert RemoteBackend().timeout == max_fetch_time()
+
+    def test_memory_builtin_compounds(self) -> None:
+        """Test that common names and ChEMBL IDs resolve from memory."""
+        memory = MemoryBackend()
+        assert memory.resolve("name", "Ethanol") == "CCO"
+        assert memory.resolve("chembl", "chembl25") == "CC(=O)Oc1ccccc1C(=O)O"
+        assert memory.resolve("chembl", "ethanol") is None
+
+    def test_memory_evicts_oldest(self) -> None:
+        """Test that the memory cache keeps only the most recent answers."""
+        memory = MemoryBackend(size=2)
+        memory.store("name", "a", "C")
+        memory.store("name", "b", "CC")
+        memory.resolve("name", "a")
+        memory.store("name", "c", "CCC")
+        assert memory.resolve("name", "a") == "C"
+        assert memory.resolve("name", "b") is None
+        assert memory.resolve("name", "c") == "CCC"
+
+    def test_disk_cache_persists(self, tmp_path: Path) -> None:
+        """Test that the disk cache keeps answers between instances."""
+        path = tmp_path / "cache" / "resolved.sqlite"
+        DiskCacheBackend(path).store("inchikey", "abc-def-n", "CCO")
+        disk = DiskCacheBackend(path)
+        assert disk.resolve("inchikey", "ABC-DEF-N") == "CCO"
+        assert disk.resolve("name", "ABC-DEF-N") is None
+
+    def test_local_name_index(self, tmp_path: Path) -> None:
+        """Test that names and CAS numbers resolve from a name index."""
+        index_path = tmp_path / "names.idx"
+        index_path.write_text("64-17-5\tCCO\nethyl alcohol\tCCO\n")
+        local = LocalDatabaseBackend(name_index=NameIndex(index_path))
+        assert local.resolve("cas", "64-17-5") == "CCO"
+        assert local.resolve("name", "Ethyl Alcohol") == "CCO"
+        assert local.resolve("chembl", "CHEMBL545") is None
+
+    def test_local_inchi(self) -> None:
+        """Test that InChI strings are converted without any database."""
+        local = LocalDatabaseBackend()
+        assert local.resolve("inchi", "InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3") == "CCO"
+        assert local.resolve("inchi", "InChI=1S/garbage") is None
+
+    def test_local_inchikey_from_name_index(self, tmp_path: Path) -> None:
+        """Test that InChIKeys resolve from a name index in bulk."""
+        index_path = tmp_path / "names.idx"
+        index_path.write_text("lfqscwfljhtthz-uhfffaoysa-n\tCCO\n")
+        local = LocalDatabaseBackend(name_index=NameIndex(index_path))
+        found = local.resolve_many(
+            "inchikey", ["LFQSCWFLJHTTHZ-UHFFFAOYSA-N", "XXXXXXXXXXXXXX-UHFFFAOYSA-N"]
+        )
+        assert found == {"LFQSCWFLJHTTHZ-UHFFFAOYSA-N": "CCO"}
+
+    def test_default_resolver_disk_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the default chain includes the configured disk cache."""
+        monkeypatch.delenv("CHEMSCII_RESOLVER_CACHE", raising=False)
+        names = [b.name for b in default_resolver().backends]
+        assert names == ["memory", "local", "remote"]
+        monkeypatch.setenv("CHEMSCII_RESOLVER_CACHE", str(tmp_path / "c.sqlite"))
+        names = [b.name for b in default_resolver().backends]
+        assert names == ["memory", "disk", "local", "remote"]
@@ -0,0 +1,156 @@
+"""Tests for random access to SMILES files."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chemscii.parsers import smiles_file
+from chemscii.parsers.smiles_file import SmilesFile, default_index_path
+
+_RECORDS = [
+    ("CCO", "ethanol"),
+    ("c1ccccc1", "benzene ring"),
+    ("CC(=O)O", ""),
+    ("O", "water"),
+]
+
+
+@pytest.fixture  # type: ignore[misc]
+def smi_path(tmp_path: Path) -> Path:
+    """Write a SMILES file with blank lines and mixed line endings."""
+    path = tmp_path / "library.smi"
+    path.write_bytes(b"CCO ethanol\r\n\nc1ccccc1\tbenzene ring\nCC(=O)O\n\n\nO water")
+    return path
+
+
+class TestSmilesFile:
+    """Tests for the memory-mapped reader."""
+
+    def test_records(self, smi_path: Path) -> None:
+        """Test that every non-blank line is a record."""
+        reader = SmilesFile(smi_path)
+        assert len(reader) == len(_RECORDS)
+        assert [reader.record(i) for i in range(len(reader))] == _RECORDS
+        reader.close()
+
+    def test_negative_index(self, smi_path: Path) -> None:
+        """Test that negative positions count from the end."""
+        reader = SmilesFile(smi_path)
+        assert reader.record(-1) == ("O", "water")
+        assert reader.line(-4) == "CCO ethanol"
+
+    def test_out_of_range(self, smi_path: Path) -> None:
+        """Test that a missing record raises IndexError."""
+        reader = SmilesFile(smi_path)
+        with pytest.raises(IndexError):
+            reader.record(4)
+        with pytest.raises(IndexError):
+            reader.record(-5)
+
+    def test_range(self, smi_path: Path) -> None:
+        """Test that ranges follow slice semantics."""
+        reader = SmilesFile(smi_path)
+        assert list(reader.records(1, 3)) == _RECORDS[1:3]
+        assert list(reader.records(-2)) == _RECORDS[-2:]
+        assert list(reader.records(3, 100)) == _RECORDS[3:]
+
+    def test_sample(self, smi_path: Path) -> None:
+        """Test that samples are distinct, ordered and reproducible."""
+        reader = SmilesFile(smi_path)
+        chosen = reader.sample(3, seed=7)
+        assert chosen == sorted(set(chosen))
+        assert len(chosen) == 3
+        assert reader.sample(3, seed=7) == chosen
+        assert reader.sample(10) == [0, 1, 2, 3]
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test that an empty file has no records."""
+        path = tmp_path / "empty.smi"
+        path.write_bytes(b"")
+        reader = SmilesFile(path)
+        assert len(reader) == 0
+        assert reader.sample(5) == []
+        with pytest.raises(IndexError):
+            reader.record(0)
+
+    def test_chunked_scan(
+        self, smi_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that line breaks are found across scan chunk boundaries."""
+        monkeypatch.setattr(smiles_file, "_INDEX_CHUNK", 3)
+        reader = SmilesFile(smi_path)
+        assert list(reader.records()) == _RECORDS
+
+    def test_failed_scan_unmaps(
+        self, smi_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the file is not left mapped when indexing fails."""
+
+        def fail(data: object) -> None:
+            raise RuntimeError("scan failed")
+
+        monkeypatch.setattr(smiles_file, "_scan_offsets", fail)
+        reader = SmilesFile(smi_path)
+        with pytest.raises(RuntimeError, match="scan failed"):
+            len(reader)
+        assert reader._map is None
+
+    def test_reopen_after_close(self, smi_path: Path) -> None:
+        """Test that a closed reader maps the file again."""
+        reader = SmilesFile(smi_path)
+        assert reader.record(0) == _RECORDS[0]
+        reader.close()
+        assert reader.record(1) == _RECORDS[1]
+        reader.close()
+
+
+class TestSavedIndex:
+    """Tests for the sidecar line-offset index."""
+
+    def test_saved_and_reused(
+        self, smi_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the index is saved and loaded instead of rescanned."""
+        index_path = default_index_path(smi_path)
+        assert index_path.name == "library.smi.idx.npy"
+        assert len(SmilesFile(smi_path, index_path)) == len(_RECORDS)
+        saved = np.load(index_path)
+        assert saved[-1] == smi_path.stat().st_size
+        assert len(saved) == len(_RECORDS) + 1
+
+        # A reused index is never rescanned
+        monkeypatch.setattr(smiles_file, "_scan_offsets", None)
+        assert SmilesFile(smi_path, index_path).record(3) == _RECORDS[3]
+
+    def test_stale_index_rebuilt(self, smi_path: Path) -> None:
+        """Test that an index older than the file is rebuilt."""
+        index_path = default_index_path(smi_path)
+        assert len(SmilesFile(smi_path, index_path)) == len(_RECORDS)
+        smi_path.write_bytes(b"C methane\nCC ethane\n")
+        stat = index_path.stat()
+        os.utime(smi_path, (stat.st_atime, stat.st_mtime + 10))
+        reader = SmilesFile(smi_path, index_path)
+        assert list(reader.records()) == [("C", "methane"), ("CC", "ethane")]
+        assert len(np.load(index_path)) == 3
+
+    def test_unsaved_index_kept_in_memory(self, smi_path: Path) -> None:
+        """Test that an index that cannot be saved is used from memory."""
+        index_path = smi_path.parent / "missing" / "library.smi.idx.npy"
+        reader = SmilesFile(smi_path, index_path)
+        with pytest.warns(UserWarning, match="Could not save the SMILES index"):
+            assert len(reader) == len(_RECORDS)
+        assert reader.record(3) == _RECORDS[3]
+        assert not index_path.exists()
+
+    def test_damaged_index_rebuilt(self, smi_path: Path) -> None:
+        """Test that an unreadable index is rebuilt and saved over."""
+        index_path = default_index_path(smi_path)
+        index_path.write_bytes(b"not an index")
+        stat = smi_path.stat()
+        os.utime(index_path, (stat.st_atime, stat.st_mtime + 10))
+        assert list(SmilesFile(smi_path, index_path).records()) == _RECORDS
+        assert len(np.load(index_path)) == len(_RECORDS) + 1
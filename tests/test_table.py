@@ -0,0 +1,136 @@
+"""Tests for chunked table input."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from chemscii.parsers.table import is_table, read_table
+
+_ROWS = [
+    ("CCO", "mol-0"),
+    ("c1ccccc1", "mol-1"),
+    ("", "mol-2"),
+    ("CC(=O)O", "mol-3"),
+    ("CCN", "mol-4"),
+]
+
+
+def _records(path: Path, **kwargs: Any) -> list[tuple[int, str, str]]:
+    """Read every record of a table, flattening its chunks."""
+    return [record for chunk in read_table(path, **kwargs) for record in chunk]
+
+
+@pytest.fixture  # type: ignore[misc]
+def csv_path(tmp_path: Path) -> Path:
+    """Write a CSV table with extra columns and a quoted field."""
+    path = tmp_path / "compounds.csv"
+    lines = ["Compound_ID,weight,SMILES"]
+    lines += [f'{name},1.0,"{smiles}"' for smiles, name in _ROWS]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+class TestIsTable:
+    """Tests for table file detection."""
+
+    def test_suffixes(self) -> None:
+        """Test that table formats are recognized by suffix."""
+        assert is_table("a.csv") and is_table("a.TSV") and is_table("a.parquet")
+        assert not is_table("a.smi") and not is_table("a.sdf")
+
+
+class TestReadTable:
+    """Tests for streaming text tables."""
+
+    def test_detects_columns(self, csv_path: Path) -> None:
+        """Test that SMILES and ID columns are found ignoring case."""
+        records = _records(csv_path)
+        assert records == [(i, s, n) for i, (s, n) in enumerate(_ROWS)]
+
+    def test_named_columns(self, csv_path: Path) -> None:
+        """Test selecting columns by name."""
+        records = _records(csv_path, smiles_column="SMILES", id_column="weight")
+        assert records[0] == (0, "CCO", "1.0")
+
+    def test_chunks(self, csv_path: Path) -> None:
+        """Test that rows are read in chunks of the requested size."""
+        chunks = list(read_table(csv_path, chunk_rows=2))
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    def test_range(self, csv_path: Path) -> None:
+        """Test that a row range keeps the original row numbers."""
+        records = _records(csv_path, start=1, stop=3, chunk_rows=1)
+        assert records == [(1, "c1ccccc1", "mol-1"), (2, "", "mol-2")]
+
+    def test_negative_range(self, csv_path: Path) -> None:
+        """Test that negative bounds raise ValueError."""
+        with pytest.raises(ValueError, match="negative"):
+            read_table(csv_path, start=-2)
+
+    def test_tsv_without_id(self, tmp_path: Path) -> None:
+        """Test a TSV table with no ID column."""
+        path = tmp_path / "compounds.tsv"
+        path.write_text("canonical_smiles\tmw\nCCO\t46.07\nC\n")
+        assert _records(path) == [(0, "CCO", ""), (1, "C", "")]
+
+    def test_byte_order_mark(self, tmp_path: Path) -> None:
+        """Test that a UTF-8 byte order mark does not hide the first column."""
+        path = tmp_path / "export.csv"
+        path.write_text("smiles,id\nCCO,mol-0\n", encoding="utf-8-sig")
+        assert _records(path) == [(0, "CCO", "mol-0")]
+
+    def test_missing_column(self, csv_path: Path) -> None:
+        """Test that a missing SMILES or ID column raises ValueError."""
+        with pytest.raises(ValueError, match="No SMILES column"):
+            _records(csv_path, smiles_column="structure")
+        with pytest.raises(ValueError, match="No ID column"):
+            _records(csv_path, id_column="chembl")
+
+    def test_empty_table(self, tmp_path: Path) -> None:
+        """Test that an empty file has no records."""
+        path = tmp_path / "empty.csv"
+        path.write_text("")
+        assert _records(path) == []
+
+    def test_unknown_format(self, tmp_path: Path) -> None:
+        """Test that other files raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown table format"):
+            read_table(tmp_path / "library.smi")
+
+
+class TestReadParquet:
+    """Tests for streaming Parquet files."""
+
+    def test_missing_pyarrow(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that reading Parquet without pyarrow raises ImportError."""
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+        with pytest.raises(ImportError, match="requires pyarrow"):
+            _records(tmp_path / "compounds.parquet")
+
+    def test_batches_and_range(self, tmp_path: Path) -> None:
+        """Test reading selected columns and rows of a Parquet file."""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "compounds.parquet"
+        table = pa.table(
+            {
+                "id": [name for _, name in _ROWS],
+                "smiles": [smiles or None for smiles, _ in _ROWS],
+                "weight": [1.0] * len(_ROWS),
+            }
+        )
+        pq.write_table(table, path)
+        assert _records(path, chunk_rows=2) == [
+            (i, s, n) for i, (s, n) in enumerate(_ROWS)
+        ]
+        assert (
+            _records(path, start=1, stop=4, chunk_rows=2)
+            == [(i, s, n) for i, (s, n) in enumerate(_ROWS)][1:4]
+        )